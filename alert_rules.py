@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+声明式预警规则引擎
+每条规则 = 作用域 + 条件 + 级别 + 类别 + 消息模板，阈值统一来自 THRESHOLDS（可被配置文件覆盖）：
+  作用域   market（行情，1 行）/ xstocks / pools / rewards（每条激励一行，按到期时间排序）/ platform（与昨日对比，1 行）
+  条件     [(字段, 运算符, 阈值)]，全部满足才触发；阈值为字符串时取 THRESHOLDS，"-name" 表示取负
+  消息     str.format 模板，可引用作用域字段和阈值
+
+求值:
+  - 每个作用域只遍历一次原始行，把全部规则条件用到的字段一起抽成列并缓存（新增字段只是这一遍里多取一列，
+    不会再扫一遍池子）
+  - 再按行号遍历一次列，逐行判断该作用域的全部规则；消息字段只对命中行取值（条件里已有的列直接复用）
+  - 每条规则单独计时（条件判断 + 消息格式化），连同命中数一起返回在 stats 里
+  - 输出顺序与规则定义顺序一致；同一 group 的规则（如涨 / 跌）按行号交错，和逐行判断的顺序相同
+
+回测: backtest_alerts.py 对每个历史快照 prepare() 一次，之后每组阈值只重跑筛选
+
+配置: alert_rules.json（或 BYREAL_ALERT_CONFIG 指定的文件）中的 {"阈值名": 值} 覆盖默认阈值
+
+用法:
+  python3 alert_rules.py        # 对 data/latest 快照求值，打印每条规则的触发数和耗时
+"""
+
+import json
+import operator
+import os
+import string
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import incentives
+import paths
+
+BASE_DIR = Path(__file__).parent
+DATA_DIR = paths.data_dir()
+CONFIG_PATH = Path(os.environ.get("BYREAL_ALERT_CONFIG") or BASE_DIR / "alert_rules.json")
+
+THRESHOLDS = {
+    "sol_move_pct": 10,         # SOL 24h 涨跌幅（%）
+    "fng_fear": 20,             # Fear & Greed 低于此值 = 极度恐惧
+    "fng_greed": 80,            # 高于此值 = 极度贪婪
+    "xstock_move": 0.05,        # xStocks 24h 涨跌幅（比例）
+    "pool_apr": 5,              # 池子 APR（比例，5 = 500%）
+    "pool_apr_min_tvl": 1000,   # 高 APR 只看 TVL 超过此值的池子
+    "reward_days": 7,           # 激励剩余天数
+    "platform_tvl_drop": 0.05,  # 平台 TVL 日环比跌幅（比例）
+}
+
+# 运算符；大小比较遇到 None（字段缺失）直接判为不满足
+OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "==": operator.eq, "!=": operator.ne}
+ORDERED = {">", ">=", "<", "<="}
+
+
+class Rule:
+    __slots__ = ("name", "scope", "when", "lv", "cat", "msg", "group")
+
+    def __init__(self, name, scope, when, lv, cat, msg, group=None):
+        self.name = name
+        self.scope = scope
+        self.when = when
+        self.lv = lv
+        self.cat = cat
+        self.msg = msg
+        self.group = group or name
+
+
+RULES = [
+    Rule("sol_pump", "market", [("sol_chg", ">", "sol_move_pct")], "green", "market",
+         "SOL 24h 暴涨 {sol_chg:+.1f}%，准备相关营销内容", group="sol_move"),
+    Rule("sol_dump", "market", [("sol_chg", "<", "-sol_move_pct")], "orange", "market",
+         "SOL 24h 暴跌 {sol_chg:+.1f}%，准备相关营销内容", group="sol_move"),
+    Rule("fng_fear", "market", [("fng", "<", "fng_fear")], "green", "market",
+         "Fear & Greed = {fng}（极度恐惧），准备'逆市机会'内容", group="fng"),
+    Rule("fng_greed", "market", [("fng", ">", "fng_greed")], "orange", "market",
+         "Fear & Greed = {fng}（极度贪婪），提醒'注意风险'", group="fng"),
+    Rule("xstock_up", "xstocks", [("pc1d", ">", "xstock_move")], "green", "xstocks",
+         "{name} 24h 涨 {move_pct:.1f}%，建议发推关联相关新闻", group="xstock_move"),
+    Rule("xstock_down", "xstocks", [("pc1d", "<", "-xstock_move")], "orange", "xstocks",
+         "{name} 24h 跌 {move_pct:.1f}%，建议发推关联相关新闻", group="xstock_move"),
+    Rule("high_apr", "pools", [("apr", ">", "pool_apr"), ("tvl", ">", "pool_apr_min_tvl")], "orange", "pool",
+         "{name} APR {apr_pct:.0f}%，注意监控"),
+    Rule("reward_expiry", "rewards", [("reward_days", ">", 0), ("reward_days", "<", "reward_days")], "red", "reward",
+         "{name} 激励 {reward_days:.0f} 天后到期（{symbol}），提醒团队续期"),
+    Rule("tvl_drop", "platform", [("tvl_chg", "<", "-platform_tvl_drop")], "red", "platform",
+         "平台 TVL 日环比下降 {tvl_drop_pct:.1f}%，排查原因"),
+    Rule("new_pool", "pools", [("is_new", "==", True)], "green", "newpool",
+         "新池上线：{name}，准备介绍推文"),
+]
+
+
+# ==================== 字段 ====================
+# 每个字段是一个取值函数：(行, 上下文) → 值。条件字段在每个作用域一次遍历里一起抽成列（多条规则共用），
+# 消息模板里的其它字段只对命中的行取值
+
+def _col(key, default=0):
+    return lambda r, ctx: r.get(key, default) or default
+
+
+def _scaled(key, k, absolute=False):
+    if absolute:
+        return lambda r, ctx: abs(r.get(key, 0) or 0) * k
+    return lambda r, ctx: (r.get(key, 0) or 0) * k
+
+
+def _reward_days(r, ctx):
+    return (r["endTs"] - ctx["now_ms"]) / 86400000 if r.get("endTs") else None
+
+
+def _is_new(p, ctx):
+    new = ctx.get("new_addrs")
+    if new is not None:
+        return p.get("addr") in new
+    prev = ctx["prev_addrs"]
+    return prev is not None and bool(a := p.get("addr")) and a not in prev
+
+
+def _tvl_chg(r, ctx):
+    prev = (ctx["yesterday"] or {}).get("platform", {}).get("tvl", 0)
+    return (r.get("tvl", 0) - prev) / prev if prev else None
+
+
+FIELDS = {
+    "market": {
+        "sol_chg": lambda m, ctx: m.get("sol", {}).get("change24h", 0) or 0,
+        "fng": lambda m, ctx: m.get("fearGreed", {}).get("value", 50) or 50,
+    },
+    "xstocks": {
+        "name": _col("name", ""),
+        "pc1d": _col("pc1d"),
+        "move_pct": _scaled("pc1d", 100, absolute=True),
+    },
+    "pools": {
+        "name": _col("name", ""),
+        "apr": _col("apr"),
+        "apr_pct": _scaled("apr", 100),
+        "tvl": _col("tvl"),
+        "is_new": _is_new,
+    },
+    "rewards": {
+        "name": _col("name", ""),
+        "symbol": _col("symbol", ""),
+        "reward_days": _reward_days,
+    },
+    "platform": {
+        "tvl_chg": _tvl_chg,
+        "tvl_drop_pct": lambda r, ctx: abs(_tvl_chg(r, ctx) or 0) * 100,
+    },
+}
+
+
+def scope_rows(scope, summary, market, rewards=None):
+    if scope == "market":
+        return [market or {}]
+    if scope == "xstocks":
+        return summary.get("xStocks", [])
+    if scope == "pools":
+        return summary.get("pools", [])
+    if scope == "rewards":
+        # 调用方给了激励索引（incentives.IncentiveIndex.active）就直接用，否则从池子摊平
+        return rewards if rewards is not None else incentives.flatten(summary.get("pools", []))
+    if scope == "platform":
+        return [summary.get("platform", {})]
+    raise ValueError(f"未知作用域: {scope}")
+
+
+# ==================== 配置 ====================
+
+def load_thresholds(path=None, overrides=None):
+    th = dict(THRESHOLDS)
+    path = Path(path or CONFIG_PATH)
+    if path.exists():
+        try:
+            with open(path) as f:
+                th.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"  [WARN] 预警配置读取失败 {path}: {e}")
+    th.update(overrides or {})
+    return th
+
+
+def resolve(value, th):
+    if isinstance(value, str):
+        return -th[value[1:]] if value.startswith("-") else th[value]
+    return value
+
+
+# ==================== 求值 ====================
+
+def compile_template(msg, fields, th):
+    """命名模板 → (位置参数模板, 字段名列表)，阈值直接写进模板
+    "{name} APR {apr_pct:.0f}%" → ("{0} APR {1:.0f}%", ["name", "apr_pct"])；逐条格式化时不用再建关键字字典"""
+    out, names = [], []
+    for text, field, spec, conv in string.Formatter().parse(msg):
+        out.append(text.replace("{", "{{").replace("}", "}}"))
+        if field is None:
+            continue
+        tail = (f"!{conv}" if conv else "") + (f":{spec}" if spec else "") + "}"
+        if field in fields:
+            out.append("{" + str(len(names)) + tail)
+            names.append(field)
+        else:
+            out.append(("{0" + tail).format(th[field]).replace("{", "{{").replace("}", "}}"))
+    return "".join(out), names
+
+
+def columns(scope, rows, names, ctx):
+    """一次遍历作用域行，取出 names 里的全部字段 → {字段: 值列表}"""
+    getters = [FIELDS[scope][f] for f in names]
+    table = [[get(r, ctx) for get in getters] for r in rows]
+    return {f: [vals[k] for vals in table] for k, f in enumerate(names)}
+
+
+def scan(rules, cols, n, th):
+    """一个作用域的全部规则在列上一次遍历求值 → (每条规则命中的行号, 每条规则的耗时秒数)"""
+    compiled = [[(cols[f], OPS[op], resolve(v, th), op in ORDERED) for f, op, v in rule.when] for rule in rules]
+    hits = [[] for _ in rules]
+    spent = [0.0] * len(rules)
+    clock = time.perf_counter
+    for i in range(n):
+        for k, conds in enumerate(compiled):
+            t0 = clock()
+            for col, op, t, ordered in conds:
+                v = col[i]
+                if (ordered and v is None) or not op(v, t):
+                    break
+            else:
+                hits[k].append(i)
+            spent[k] += clock() - t0
+    return hits, spent
+
+
+def prepare(summary, market, yesterday=None, now_ms=None, prev_index=None, new_addrs=None, rewards=None):
+    """快照 → 求值状态（作用域行 + 列缓存 + 上下文）。与阈值无关：回测换阈值时一个快照只抽一次列
+    新池判断: new_addrs（池子注册表给出的今日新池）优先；否则与昨日地址比较，
+    prev_index 为调用方已建好的昨日 {addr: 池子} 索引，省略时从 yesterday 建地址集合
+    rewards: 激励行（通常是 incentives 索引里尚未到期的区间），省略时从池子摊平"""
+    if prev_index is None and yesterday:
+        prev_index = {p["addr"] for p in yesterday.get("pools", [])}
+    return {
+        "summary": summary,
+        "market": market,
+        "ctx": {
+            "now_ms": now_ms if now_ms is not None else int(datetime.now(timezone.utc).timestamp() * 1000),
+            "yesterday": yesterday,
+            "prev_addrs": prev_index,
+            "new_addrs": new_addrs,
+        },
+        "rewards": rewards,
+        "rows": {},
+        "cols": {},
+    }
+
+
+def evaluate(summary, market, yesterday=None, now_ms=None, thresholds=None, rules=RULES, state=None,
+             prev_index=None, new_addrs=None, rewards=None):
+    """返回 {"alerts": [...], "stats": [{rule, scope, fired, ms}]}
+    state 为 prepare() 的结果时复用其中的列（summary / market / yesterday / now_ms 以 state 为准）"""
+    th = thresholds or load_thresholds()
+    state = state or prepare(summary, market, yesterday, now_ms, prev_index, new_addrs, rewards)
+    ctx, rows, cols = state["ctx"], state["rows"], state["cols"]
+    by_scope = {}
+    for rule in rules:
+        by_scope.setdefault(rule.scope, []).append(rule)
+
+    group_pos = {g: i for i, g in enumerate(dict.fromkeys(r.group for r in rules))}
+    fired, stats = [], {}
+    for scope, scope_rules in by_scope.items():
+        if scope not in rows:
+            rows[scope] = scope_rows(scope, state["summary"], state["market"], state.get("rewards"))
+            cols[scope] = {}
+        srows, scols = rows[scope], cols[scope]
+        missing = list(dict.fromkeys(f for r in scope_rules for f, _, _ in r.when if f not in scols))
+        if missing:
+            scols.update(columns(scope, srows, missing, ctx))
+
+        hits, spent = scan(scope_rules, scols, len(srows), th)
+        for rule, idx, sec in zip(scope_rules, hits, spent):
+            t0 = time.perf_counter()
+            if idx:
+                fmt, names = compile_template(rule.msg, FIELDS[scope], th)
+                fmt = fmt.format
+                pos = group_pos[rule.group]
+                getters = [(scols.get(f), FIELDS[scope][f]) for f in names]
+                for i in idx:
+                    vals = [col[i] if col is not None else get(srows[i], ctx) for col, get in getters]
+                    fired.append((pos, i, {"lv": rule.lv, "cat": rule.cat, "msg": fmt(*vals)}))
+            stats[rule.name] = {"rule": rule.name, "scope": scope, "fired": len(idx),
+                                "ms": round((sec + time.perf_counter() - t0) * 1000, 3)}
+
+    fired.sort(key=lambda x: (x[0], x[1]))
+    return {"alerts": [a for _, _, a in fired], "stats": [stats[r.name] for r in rules]}
+
+
+def main():
+    try:
+        with open(DATA_DIR / "latest" / "summary.json") as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        print("✗ 无法读取 data/latest/summary.json")
+        return 1
+    t0 = time.perf_counter()
+    result = evaluate(summary, summary.get("market", {}))
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"🚨 {len(summary.get('pools', []))} 个池子 → {len(result['alerts'])} 条预警 ({ms:.1f} ms)\n")
+    for s in result["stats"]:
+        print(f"  {s['rule']:<16} {s['scope']:<9} {s['fired']:>5} 条  {s['ms']:>8.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+池子 / 平台指标异常检测（滚动均值 + 方差，z-score）
+固定阈值对 $50M 的平台和 $50K 的池子一视同仁；这里按每条序列自己的波动判断"异常"：
+  - 序列: 每个池子的 tvl / v24h / f24h / apr / px，平台的 tvl / vol24h / fee24h
+  - 金额和价格取对数（z 反映相对变化），APR 用原值
+  - 每次运行 O(1) 更新: 前 (SPAN+1)/2 次等权（即经典 Welford），之后按 2/(SPAN+1) 指数加权，
+    老数据逐渐淡出；状态只存 [n, 均值, 方差, 最近一次取值]，不回读历史快照
+  - z 用更新前的统计量计算；观测不足 MIN_OBS 次的序列、今天和均值都低于 MIN_VALUE 的小额序列不报
+  - 同一天重复运行时先撤销当天那次更新再重算，结果与只跑一次相同
+  - 状态存 data/anomaly_state.json；超过 STALE_DAYS 天没出现的池子丢弃
+
+用法:
+  python3 anomaly.py              # 对最新快照打分并列出最大偏离（不写状态）
+  python3 anomaly.py --rebuild    # 从 data/ 下全部历史快照重建状态（首次部署时用一次）
+"""
+
+import json
+import math
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+import paths
+import telemetry
+
+DATA_DIR = paths.data_dir()
+STATE_PATH = DATA_DIR / "anomaly_state.json"
+
+POOL_METRICS = ("tvl", "v24h", "f24h", "apr", "px")
+PLATFORM_METRICS = {"tvl": "tvl", "v24h": "vol24h", "f24h": "fee24h"}   # 序列名 → platform 字段
+LABELS = {"tvl": "TVL", "v24h": "24h 交易量", "f24h": "24h 手续费", "apr": "APR", "px": "价格"}
+
+SPAN = 30               # 指数加权的等效窗口（次）
+ALPHA = 2 / (SPAN + 1)
+MIN_OBS = 7             # 至少观测这么多次才报异常
+Z_ALERT = 3.0
+MIN_STD = {"apr": 0.01}  # 标准差下限（对数序列默认 0.02 ≈ 2%，避免平稳序列一点波动就报警）
+LOG_MIN_STD = 0.02
+MIN_TVL = 10_000        # TVL 低于此值的池子不报
+MIN_VALUE = {"v24h": 1_000, "f24h": 100}   # 今天和均值都低于此值时不报（$23 → $597 这类噪音）
+MAX_POOL_ALERTS = 10
+STALE_DAYS = 30
+STATE_VERSION = 1
+DATE_DIR = re.compile(r"\d{4}-\d{2}-\d{2}$")
+
+
+# ==================== 序列统计 ====================
+
+def transform(metric, x):
+    """原值 → 建模用的值；无效值返回 None（不更新、不打分）"""
+    if not isinstance(x, (int, float)) or x != x:
+        return None
+    if metric == "apr":
+        return float(x)
+    if metric == "px":
+        return math.log(x) if x > 0 else None
+    return math.log1p(x) if x >= 0 else None
+
+
+def inverse(metric, y):
+    if metric == "apr":
+        return y
+    return math.exp(y) if metric == "px" else math.expm1(y)
+
+
+def update(rec, y):
+    """rec = [n, 均值, 方差, 当天取值]；当天取值为 None 表示这条序列在实体最近出现的那天没有更新；返回新 rec"""
+    n, mean, var = (rec[0], rec[1], rec[2]) if rec else (0, 0.0, 0.0)
+    n += 1
+    a = max(ALPHA, 1 / n)
+    diff = y - mean
+    mean += a * diff
+    var = (1 - a) * (var + a * diff * diff)
+    return [n, mean, var, y]
+
+
+def undo(rec):
+    """撤销当天的 update（同一天重复运行时用，调用方保证 rec[3] 不为 None）；只有一次观测时返回 None"""
+    n, mean, var, y = rec
+    if n <= 1:
+        return None
+    a = max(ALPHA, 1 / n)
+    prev_mean = (mean - a * y) / (1 - a)
+    prev_var = var / (1 - a) - a * (y - prev_mean) ** 2
+    return [n - 1, prev_mean, max(prev_var, 0.0), None]
+
+
+def zscore(metric, rec, y):
+    if not rec or rec[0] < MIN_OBS:
+        return None
+    std = max(math.sqrt(rec[2]), MIN_STD.get(metric, LOG_MIN_STD))
+    return (y - rec[1]) / std
+
+
+# ==================== 状态 ====================
+
+def load_state():
+    try:
+        with open(STATE_PATH) as f:
+            state = json.load(f)
+        if state.get("version") == STATE_VERSION:
+            return state
+    except (OSError, ValueError):
+        pass
+    return {"version": STATE_VERSION, "platform": None, "pools": {}}
+
+
+def save_state(state):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(STATE_PATH, "w") as f:
+        json.dump(state, f, separators=(",", ":"))
+
+
+def step(entry, values, today):
+    """
+    一个实体（池子 / 平台）的一天：entry = [最近出现日期, {序列: rec}]，values = {序列: 原值}
+    返回 (新 entry, [(序列, 原值, z, 均值原值)])
+    """
+    seen, series = entry if entry else (None, {})
+    if seen == today:
+        # 只撤销当天更新过的序列（取值为空 / 非正没更新的序列保持原样）
+        series = {m: r for m, r in ((m, undo(r) if r[3] is not None else r) for m, r in series.items()) if r}
+    # 今天没更新的序列把当天取值记为 None，同一天重跑时不会被撤销
+    scores, updated = [], {m: r[:3] + [None] for m, r in series.items()}
+    for metric, x in values.items():
+        y = transform(metric, x)
+        if y is None:
+            continue
+        rec = series.get(metric)
+        z = zscore(metric, rec, y)
+        if z is not None:
+            mean = inverse(metric, rec[1])
+            if max(x, mean) >= MIN_VALUE.get(metric, 0):
+                scores.append((metric, x, z, mean))
+        updated[metric] = update(rec, y)
+    return [today, updated], scores
+
+
+# ==================== 检测 ====================
+
+def fmt_value(metric, v):
+    if metric == "apr":
+        return f"{v * 100:.1f}%"
+    if metric == "px":
+        return f"{v:.6g}"
+    if abs(v) >= 1e6:
+        return f"${v / 1e6:.2f}M"
+    if abs(v) >= 1e3:
+        return f"${v / 1e3:.1f}K"
+    return f"${v:.0f}"
+
+
+def detect(summary, today, state=None, save=True):
+    """
+    用今天的 summary 更新状态并打分，返回异常列表（|z| >= Z_ALERT，按 |z| 降序）：
+    [{"scope", "addr", "name", "metric", "value", "mean", "z"}]
+    """
+    t0 = time.perf_counter()
+    state = state or load_state()
+    found = []
+
+    platform = summary.get("platform", {})
+    state["platform"], scores = step(state.get("platform"),
+                                     {m: platform.get(k) for m, k in PLATFORM_METRICS.items()}, today)
+    for metric, x, z, mean in scores:
+        if abs(z) >= Z_ALERT:
+            found.append({"scope": "platform", "addr": "", "name": "平台", "metric": metric,
+                          "value": x, "mean": mean, "z": round(z, 2)})
+
+    pools = state["pools"]
+    for p in summary.get("pools", []):
+        addr = p.get("addr")
+        if not addr:
+            continue
+        pools[addr], scores = step(pools.get(addr), {m: p.get(m) for m in POOL_METRICS}, today)
+        if (p.get("tvl") or 0) < MIN_TVL:
+            continue
+        for metric, x, z, mean in scores:
+            if abs(z) >= Z_ALERT:
+                found.append({"scope": "pool", "addr": addr, "name": p.get("name", addr[:8]), "metric": metric,
+                              "value": x, "mean": mean, "z": round(z, 2)})
+
+    cutoff = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=STALE_DAYS)).strftime("%Y-%m-%d")
+    for addr in [a for a, e in pools.items() if e[0] < cutoff]:
+        del pools[addr]
+
+    if save:
+        try:
+            save_state(state)
+        except OSError as e:
+            print(f"  [WARN] 异常检测状态写入失败: {e}")
+    found.sort(key=lambda a: -abs(a["z"]))
+    telemetry.gauge("anomaly_series", len(pools))
+    telemetry.gauge("anomaly_ms", round((time.perf_counter() - t0) * 1000, 3))
+    return found
+
+
+def to_alerts(anomalies, max_pools=MAX_POOL_ALERTS):
+    """异常 → 预警条目（与 generate_alerts 同格式）；平台异常全部保留，池子只取偏离最大的若干个"""
+    alerts, pool_count = [], 0
+    for a in anomalies:
+        if a["scope"] == "pool":
+            if pool_count >= max_pools:
+                continue
+            pool_count += 1
+        drop = a["z"] < 0
+        lv = "red" if a["scope"] == "platform" and drop else "orange"
+        direction = "低于" if drop else "高于"
+        alerts.append({
+            "lv": lv,
+            "cat": "anomaly",
+            "msg": f"{a['name']} {LABELS[a['metric']]} {fmt_value(a['metric'], a['value'])}，"
+                   f"{direction}近期均值 {fmt_value(a['metric'], a['mean'])}（{a['z']:+.1f}σ）",
+        })
+    return alerts
+
+
+# ==================== 命令行 ====================
+
+def rebuild():
+    """按日期顺序重放 data/ 下全部快照，生成初始状态"""
+    state = {"version": STATE_VERSION, "platform": None, "pools": {}}
+    days = sorted(d for d in DATA_DIR.iterdir() if DATE_DIR.match(d.name)) if DATA_DIR.exists() else []
+    count = 0
+    for d in days:
+        try:
+            with open(d / "summary.json") as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            continue
+        detect(summary, d.name, state, save=False)
+        count += 1
+    save_state(state)
+    print(f"✓ 重放 {count} 个快照 → {len(state['pools'])} 个池子的序列 → {STATE_PATH}")
+
+
+def main():
+    if "--rebuild" in sys.argv:
+        rebuild()
+        return 0
+    try:
+        with open(DATA_DIR / "latest" / "summary.json") as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        print("✗ 无法读取 data/latest/summary.json")
+        return 1
+    state = load_state()
+    t0 = time.perf_counter()
+    found = detect(summary, summary.get("date") or datetime.now().strftime("%Y-%m-%d"), state, save=False)
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"📈 {len(state['pools'])} 个池子的序列，{len(found)} 个异常 ({ms:.1f} ms)\n")
+    for a in to_alerts(found):
+        print(f"  [{a['lv']}] {a['msg']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
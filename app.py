@@ -9,6 +9,8 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+import paths
+
 # ============================================================
 # 配置
 # ============================================================
@@ -19,7 +21,7 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-DATA_DIR = Path(__file__).parent / "data"
+DATA_DIR = paths.data_dir()
 
 
 # ============================================================
@@ -50,7 +52,11 @@ def auto_collect():
         if result.returncode != 0:
             st.error(f"采集失败: {result.stderr}")
 
-auto_collect()
+# 运维页（?page=ops）不触发采集
+OPS_PAGE = st.query_params.get("page") == "ops"
+
+if not OPS_PAGE:
+    auto_collect()
 
 
 # ============================================================
@@ -135,6 +141,12 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+if OPS_PAGE:
+    import ops_page
+    ops_page.render(DATA_DIR)
+    st.stop()
+
+
 # ============================================================
 # 数据加载
 # ============================================================
@@ -147,6 +159,20 @@ def load_data():
         return json.load(f)
 
 
+@st.cache_data(ttl=300)
+def load_tweets(db_path, hours, types, entities=()):
+    """从推文库按时间窗 / 类型 / 关联实体读取推文（按互动分降序）"""
+    if not Path(db_path).exists():
+        return None
+    import tweet_store
+    conn = tweet_store.connect(db_path)
+    try:
+        return tweet_store.window(conn, hours=hours, type=list(types) or None,
+                                  entity=list(entities) or None, limit=50)
+    finally:
+        conn.close()
+
+
 def fmt_usd(val):
     if val >= 1_000_000_000:
         return f"${val/1e9:.2f}B"
@@ -192,11 +218,14 @@ st.markdown(f"""
 # ━━━━ AI 总结 ━━━━
 ai_insight = data.get("aiInsight", "")
 ai_public = data.get("aiPublic", "")
+ai_stale = data.get("aiStale") or {}
 
 if ai_insight or ai_public:
     ai_cols = st.columns(2)
     with ai_cols[0]:
         st.markdown('<div class="section-title">🧠 运营洞察</div>', unsafe_allow_html=True)
+        if ai_stale.get("insight"):
+            st.caption(f"⚠️ 本次生成失败，沿用 {ai_stale['insight']} 的内容")
         if ai_insight:
             st.markdown(f"""
             <div style="background:#111827; border:1px solid #22d3ee30; border-radius:12px; padding:1.2rem; line-height:1.8; font-size:0.95rem;">
@@ -208,6 +237,8 @@ if ai_insight or ai_public:
     
     with ai_cols[1]:
         st.markdown('<div class="section-title">📰 平台快报</div>', unsafe_allow_html=True)
+        if ai_stale.get("public"):
+            st.caption(f"⚠️ 本次生成失败，沿用 {ai_stale['public']} 的内容")
         if ai_public:
             st.markdown(f"""
             <div style="background:#111827; border:1px solid #10b98130; border-radius:12px; padding:1.2rem; line-height:1.8; font-size:0.95rem;">
@@ -262,9 +293,9 @@ if red_alerts or orange_alerts or green_alerts:
                 # 从 msg 提取天数和池名
                 msg = a["msg"]
                 import re
-                m = re.match(r"(.+?) 激励 (\d+) 天后到期", msg)
-                if m:
-                    names_by_days[m.group(2)].append(m.group(1))
+                mt = re.match(r"(.+?) 激励 (\d+) 天后到期", msg)
+                if mt:
+                    names_by_days[mt.group(2)].append(mt.group(1))
                 else:
                     names_by_days["?"].append(msg)
             summary_parts = []
@@ -417,10 +448,63 @@ if comp_rows:
     comp_html += '</table>'
     st.markdown(comp_html, unsafe_allow_html=True)
 
+# ━━━━ 社媒话题 ━━━━
+social_topics = data.get("topics", [])
+if social_topics:
+    st.markdown('<div class="section-title">🧩 今日社媒话题</div>', unsafe_allow_html=True)
+    topic_cols = st.columns(2)
+    for idx, topic in enumerate(social_topics):
+        src = " / ".join(f"{'𝕏' if k == 'x' else 'Reddit'} {v}" for k, v in topic.get("sources", {}).items())
+        items_html = "".join(
+            f'<div style="color:#94a3b8; font-size:0.85rem; margin-top:0.3rem;">'
+            f'{"𝕏" if it["source"] == "x" else "r/"} {it["author"]}: {it["text"][:90]}</div>'
+            for it in topic.get("items", []))
+        with topic_cols[idx % 2]:
+            st.markdown(f"""
+            <div style="background:#111827; border:1px solid #1e293b; border-radius:8px; padding:0.8rem 1rem; margin:0.4rem 0;">
+                <div style="display:flex; justify-content:space-between;">
+                    <span style="color:#22d3ee; font-weight:600;">{topic['label']}</span>
+                    <span style="color:#64748b; font-size:0.85rem;">{topic['size']} 条 · 互动 {topic['engagement']:,} · {src}</span>
+                </div>
+                {items_html}
+            </div>
+            """, unsafe_allow_html=True)
+
 # ━━━━ X/Twitter 热点 ━━━━
 st.markdown('<div class="section-title">𝕏 Twitter 热点</div>', unsafe_allow_html=True)
 
-x_trends = data.get("xTrends", [])
+TWEET_WINDOWS = {"24h": 24, "48h": 48, "72h": 72, "7 天": 168, "30 天": 720}
+TWEET_TYPES = {"byreal": "Byreal", "partner": "合作伙伴", "competitor": "竞品", "ecosystem": "生态",
+               "kol": "KOL", "kol_cn": "中文 KOL", "hot_topic": "热点", "competitor_buzz": "竞品舆情"}
+# 关联实体（relevance 标签）：竞品 + TVL 前 30 池子的 base ticker
+import relevance
+entity_options = [f"competitor:{c}" for c in relevance.COMPETITOR_NAMES]
+for p in sorted(data.get("pools", []), key=lambda p: -p.get("tvl", 0))[:30]:
+    if p.get("baseSym") and f"ticker:{p['baseSym']}" not in entity_options:
+        entity_options.append(f"ticker:{p['baseSym']}")
+
+
+def fmt_entity(e):
+    kind, _, name = e.partition(":")
+    return f"竞品 · {name.capitalize()}" if kind == "competitor" else f"${name}"
+
+
+tw_col1, tw_col2, tw_col3 = st.columns([1, 2, 2])
+with tw_col1:
+    tweet_window = st.selectbox("时间窗", list(TWEET_WINDOWS), index=2, key="tweet_window")
+with tw_col2:
+    tweet_types = st.multiselect("类型", list(TWEET_TYPES), format_func=TWEET_TYPES.get, key="tweet_types")
+with tw_col3:
+    social_entities = st.multiselect("关联竞品 / 池子", entity_options, format_func=fmt_entity, key="social_entities")
+x_trends = load_tweets(str(DATA_DIR / "social.db"), TWEET_WINDOWS[tweet_window], tuple(tweet_types),
+                       tuple(social_entities))
+if x_trends is None:
+    # 没有推文库时回退到 summary.json 快照
+    x_trends = [t for t in data.get("xTrends", [])
+                if (not tweet_types or t.get("type") in tweet_types)
+                and (not social_entities or set(social_entities) & set(t.get("entities", [])))]
+# 中文翻译只在当天快照里（translate.py），按 tweet id 关联
+content_cn = {t.get("id"): t.get("content_cn") for t in data.get("xTrends", []) if t.get("content_cn")}
 with st.expander(f"📱 X/Twitter 动态 ({len(x_trends)} 条)", expanded=True):
     if x_trends:
         for tweet in x_trends[:10]:
@@ -442,10 +526,12 @@ with st.expander(f"📱 X/Twitter 动态 ({len(x_trends)} 条)", expanded=True):
                 <div style="color:#e2e8f0; margin:0.5rem 0; line-height:1.6;">
                     {tweet.get('content', '')[:200]}{'...' if len(tweet.get('content', '')) > 200 else ''}
                 </div>
+                {f'<div style="color:#94a3b8; font-size:0.9rem; margin:0.3rem 0;">🈯 {content_cn[tweet["id"]][:200]}</div>' if content_cn.get(tweet.get("id")) else ""}
                 <div style="display:flex; gap:1.5rem; color:#64748b; font-size:0.85rem;">
                     <span>❤️ {tweet.get('likes', 0):,}</span>
                     <span>🔁 {tweet.get('retweets', 0):,}</span>
                     <span>💬 {tweet.get('replies', 0):,}</span>
+                    {f"<span>🧬 +{tweet['dup_count']} 条相似</span>" if tweet.get('dup_count') else ""}
                 </div>
             </div>
             """, unsafe_allow_html=True)
@@ -455,7 +541,8 @@ with st.expander(f"📱 X/Twitter 动态 ({len(x_trends)} 条)", expanded=True):
 # ━━━━ Reddit 热点 ━━━━
 st.markdown('<div class="section-title">🔥 Reddit 热帖</div>', unsafe_allow_html=True)
 
-reddit_hot = data.get("redditHot", [])
+reddit_hot = [p for p in data.get("redditHot", [])
+              if not social_entities or set(social_entities) & set(p.get("entities", []))]
 with st.expander(f"💬 Reddit 热门讨论 ({len(reddit_hot)} 条)", expanded=True):
     if reddit_hot:
         for post in reddit_hot[:10]:
@@ -472,6 +559,8 @@ with st.expander(f"💬 Reddit 热门讨论 ({len(reddit_hot)} 条)", expanded=T
                 <div style="color:#e2e8f0; font-weight:500; margin:0.5rem 0;">
                     {relevant_mark}{post.get('title', '')}
                 </div>
+                {f'<div style="color:#94a3b8; font-size:0.9rem; margin:0.3rem 0;">🈯 {post["title_cn"]}</div>' if post.get("title_cn") and post["title_cn"] != post.get("title") else ""}
+                {f'<div style="color:#94a3b8; font-size:0.85rem; margin:0.3rem 0;">📝 {post["summary_cn"]}</div>' if post.get("summary_cn") else ""}
                 <div style="display:flex; gap:1.5rem; color:#64748b; font-size:0.85rem;">
                     <span>⬆️ {post.get('score', 0):,} ({post.get('upvoteRatio', 0)*100:.0f}%)</span>
                     <span>💬 {post.get('numComments', 0):,} comments</span>
@@ -483,6 +572,52 @@ with st.expander(f"💬 Reddit 热门讨论 ({len(reddit_hot)} 条)", expanded=T
     else:
         st.info("📊 暂无 Reddit 数据")
 
+# ━━━━ 社媒检索 ━━━━
+st.markdown('<div class="section-title">🔎 社媒检索</div>', unsafe_allow_html=True)
+
+SEARCH_RANGES = {"7 天": 7, "30 天": 30, "90 天": 90, "全部": None}
+SEARCH_SOURCES = {"全部": None, "X": "x", "Reddit": "reddit"}
+sq_col1, sq_col2, sq_col3, sq_col4 = st.columns([3, 1, 1, 1])
+with sq_col1:
+    search_q = st.text_input("关键词", placeholder="如 xStocks、Raydium、流动性（空格分隔 = 同时包含，词尾 * = 前缀）",
+                             key="social_q", label_visibility="collapsed")
+with sq_col2:
+    search_range = st.selectbox("时间", list(SEARCH_RANGES), key="social_range", label_visibility="collapsed")
+with sq_col3:
+    search_source = st.selectbox("来源", list(SEARCH_SOURCES), key="social_source", label_visibility="collapsed")
+with sq_col4:
+    search_order = st.selectbox("排序", ["相关度", "互动", "最新"], key="social_order", label_visibility="collapsed")
+
+if search_q.strip():
+    social_db = DATA_DIR / "social.db"
+    if social_db.exists():
+        import html
+        import time as _time
+        import social_search
+        days = SEARCH_RANGES[search_range]
+        conn = social_search.connect(social_db)
+        t0 = _time.perf_counter()
+        hits = social_search.search(
+            conn, search_q, source=SEARCH_SOURCES[search_source],
+            since=_time.time() - days * 86400 if days else None, limit=50,
+            order={"相关度": "rank", "互动": "engagement", "最新": "recent"}[search_order])
+        search_ms = (_time.perf_counter() - t0) * 1000
+        conn.close()
+        st.caption(f"{len(hits)} 条结果 · {search_ms:.0f} ms")
+        if hits:
+            rows_html = "".join(
+                f'<tr><td>{"𝕏" if h["source"] == "x" else "r/" + html.escape(h["channel"])}</td>'
+                f'<td>{datetime.fromtimestamp(h["created_at"]).strftime("%m-%d %H:%M")}</td>'
+                f'<td>{html.escape(h["author"])}</td>'
+                f'<td style="text-align:left;">{html.escape((h["title"] or h["text"])[:160])}</td>'
+                f'<td>{h["engagement"]:,}</td>'
+                f'<td><a href="{html.escape(h["url"])}" target="_blank" style="color:#22d3ee;">🔗</a></td></tr>'
+                for h in hits)
+            st.markdown('<table class="pool-table"><tr><th>来源</th><th>时间</th><th>作者</th><th>内容</th>'
+                        f'<th>互动</th><th></th></tr>{rows_html}</table>', unsafe_allow_html=True)
+    else:
+        st.info("📊 暂无检索索引，X / Reddit 采集后会生成 data/social.db")
+
 # ━━━━ Byreal 账号分析 ━━━━
 st.markdown('<div class="section-title">📊 @byreal_io 账号分析</div>', unsafe_allow_html=True)
 
@@ -623,6 +758,89 @@ if top_vol:
     vol_html += '</table>'
     st.markdown(vol_html, unsafe_allow_html=True)
 
+# ━━━━ 池子日环比 ━━━━
+pool_movers = data.get("movers")
+if pool_movers and (pool_movers.get("gainers") or pool_movers.get("losers") or pool_movers.get("removed")):
+    st.markdown('<div class="section-title">🔀 池子日环比 (TVL 涨跌)</div>', unsafe_allow_html=True)
+
+    def fmt_delta(val):
+        return ("+" if val >= 0 else "-") + fmt_usd(abs(val))
+
+    mv_cols = st.columns(2)
+    for col, (title, key, color) in zip(mv_cols, (("TVL 增加", "gainers", "#22c55e"),
+                                                  ("TVL 减少", "losers", "#ef4444"))):
+        rows = pool_movers.get(key, [])
+        with col:
+            st.markdown(f"**{title}**")
+            if not rows:
+                st.caption("—")
+                continue
+            mv_html = '<table class="pool-table"><tr><th>交易对</th><th>TVL</th><th>ΔTVL</th><th>Δ24h Vol</th><th>ΔAPR</th></tr>'
+            for r in rows:
+                pct = f" ({fmt_pct(r['tvlPct'])})" if r.get("tvlPct") is not None else ""
+                mv_html += (f'<tr><td>{r["name"]}</td><td>{fmt_usd(r["tvl"])}</td>'
+                            f'<td style="color:{color} !important;">{fmt_delta(r["dTvl"])}{pct}</td>'
+                            f'<td>{fmt_delta(r["dV24h"])}</td><td>{r["dApr"]*100:+.1f}pp</td></tr>')
+            mv_html += '</table>'
+            st.markdown(mv_html, unsafe_allow_html=True)
+
+    removed = pool_movers.get("removed", [])
+    if removed:
+        names = ", ".join(f"{r['name']} ({fmt_usd(r['tvl'])})" for r in removed)
+        more = pool_movers.get("removedTotal", len(removed)) - len(removed)
+        st.caption(f"昨日有、今日消失的池子: {names}" + (f" 等 {len(removed) + more} 个" if more > 0 else ""))
+
+# ━━━━ 新池 cohort ━━━━
+pool_cohorts = data.get("cohorts") or []
+if pool_cohorts:
+    st.markdown('<div class="section-title">🆕 新池 cohort（按上线周，上线后第 N 天合计）</div>', unsafe_allow_html=True)
+    checkpoints = ["0", "7", "14", "30"]
+    co_html = '<table class="pool-table"><tr><th>上线周</th><th>池子</th><th>业务线</th>'
+    co_html += "".join(f'<th>D{d} TVL</th><th>D{d} Vol</th>' for d in checkpoints) + '</tr>'
+    for c in pool_cohorts:
+        biz_str = ", ".join(f"{k} {v}" for k, v in sorted(c.get("biz", {}).items(), key=lambda kv: -kv[1]))
+        co_html += f'<tr><td>{c["week"]}</td><td>{c["pools"]}</td><td>{biz_str}</td>'
+        for d in checkpoints:
+            if d in c.get("tvl", {}):
+                co_html += f'<td>{fmt_usd(c["tvl"][d])}</td><td>{fmt_usd(c["vol"][d])}</td>'
+            else:
+                co_html += '<td>—</td><td>—</td>'
+        co_html += '</tr>'
+    co_html += '</table>'
+    st.markdown(co_html, unsafe_allow_html=True)
+
+# ━━━━ 激励 ━━━━
+incentive_data = data.get("incentives") or {}
+if incentive_data.get("active") or incentive_data.get("calendar"):
+    st.markdown(f'<div class="section-title">🎁 激励（生效中 {incentive_data.get("active", 0)} 条 / '
+                f'{incentive_data.get("pools", 0)} 个池子，每日约 {fmt_usd(incentive_data.get("dailyUsd", 0))}）</div>',
+                unsafe_allow_html=True)
+    inc_col1, inc_col2 = st.columns([3, 2])
+    with inc_col1:
+        st.markdown("**到期日历（未来 30 天）**")
+        calendar = incentive_data.get("calendar", [])
+        if calendar:
+            cal_html = '<table class="pool-table"><tr><th>到期日</th><th>池子 (代币)</th><th>每日发放</th></tr>'
+            for day in calendar:
+                names = ", ".join(f"{i['name']} ({i['symbol']})" for i in day["items"])
+                cal_html += f'<tr><td>{day["date"]}</td><td>{names}</td><td>{fmt_usd(day["dailyUsd"])}</td></tr>'
+            cal_html += '</table>'
+            st.markdown(cal_html, unsafe_allow_html=True)
+        else:
+            st.caption("未来 30 天没有到期的激励")
+    with inc_col2:
+        st.markdown("**按代币的每日花费**")
+        by_token = incentive_data.get("byToken", [])
+        if by_token:
+            tok_html = '<table class="pool-table"><tr><th>代币</th><th>池子</th><th>每日数量</th><th>每日 USD</th></tr>'
+            for t in by_token:
+                tok_html += (f'<tr><td>{t["symbol"]}</td><td>{t["pools"]}</td><td>{t["dailyAmount"]:,.2f}</td>'
+                             f'<td>{fmt_usd(t["dailyUsd"])}</td></tr>')
+            tok_html += '</table>'
+            st.markdown(tok_html, unsafe_allow_html=True)
+        else:
+            st.caption("暂无生效中的激励")
+
 # ━━━━ 历史趋势 ━━━━
 st.markdown('<div class="section-title">📈 历史趋势</div>', unsafe_allow_html=True)
 
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+预警规则回测
+把 alert_rules.RULES 在 data/ 下全部历史快照上重放，统计每条规则每天会触发多少条、哪些天预警过多：
+  - 每个日期目录都参与：优先 summary.json，没有时用 pools_raw.json + market.json 现场处理
+    （pool_registry.load_snapshot，与注册表重建同一套逻辑），不漏掉采集中途失败的日子
+  - 昨日快照与 collect.py 一致：取日历上的前一天，缺失时为空（不判断 TVL 下跌）
+  - 新池与 collect.py 一致：按日期顺序重放池子注册表，当天首次出现的地址算新池（第一个快照是基线）；
+    --since 之前的快照也参与重放，只是不输出
+  - "当前时间" 取快照的 ts（没有 ts 时取当天 0 点），激励剩余天数按当时计算
+  - 快照只保留规则用到的字段，按来源文件的 (mtime, size) 缓存在 data/alert_history.json，
+    不再反复解析带 K 线的大文件
+  - 每个快照只 prepare() 一次（抽列），之后每组阈值只重跑筛选；调一个阈值是一条命令、几秒内完成
+
+用法:
+  python3 backtest_alerts.py                              # 当前阈值（含 alert_rules.json）逐日回测
+  python3 backtest_alerts.py --set pool_apr=3 --set reward_days=14
+  python3 backtest_alerts.py --sweep pool_apr=2,3,5,8     # 同一阈值的多个取值对比
+  python3 backtest_alerts.py --since 2026-02-20 --noisy 8 # 只看某天以后；单日超过 8 条算噪音日
+"""
+
+import json
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+import alert_rules
+import paths
+import pool_registry
+
+DATA_DIR = paths.data_dir()
+CACHE_PATH = DATA_DIR / "alert_history.json"
+
+# 规则用到的字段（alert_rules.FIELDS 读取的键）；规则引用新字段时在这里补上并改 CACHE_VERSION
+KEEP = {
+    "pools": ("addr", "name", "apr", "tvl", "reward", "rewards"),
+    "xStocks": ("name", "pc1d"),
+}
+CACHE_VERSION = 3
+NOISY = 5       # 单日预警超过此数视为噪音日
+DATE_DIR = re.compile(r"\d{4}-\d{2}-\d{2}$")
+
+
+# ==================== 历史快照 ====================
+
+def compact(summary):
+    out = {k: summary.get(k) for k in ("date", "ts", "platform", "market")}
+    for key, fields in KEEP.items():
+        out[key] = [{f: row.get(f) for f in fields} for row in summary.get(key, [])]
+    return out
+
+
+def source_key(day):
+    """快照来源文件的 [mtime, size]：有 summary.json 用它，否则用 pools_raw.json + market.json；都没有返回 None"""
+    for names in (("summary.json",), ("pools_raw.json", "market.json")):
+        key = []
+        for name in names:
+            try:
+                st = (day / name).stat()
+            except OSError:
+                if name == names[0]:
+                    break
+                continue
+            key += [name, st.st_mtime_ns, st.st_size]
+        if key:
+            return key
+    return None
+
+
+def load_history():
+    """data/ 下全部日期目录 → [(日期, 精简 summary)]，按日期升序；来源文件没变的直接用缓存"""
+    try:
+        with open(CACHE_PATH) as f:
+            cache = json.load(f)
+        if cache.get("version") != CACHE_VERSION:
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+    entries = cache.get("days", {})
+
+    days, from_raw, skipped, dirty = [], [], [], False
+    for d in sorted(DATA_DIR.iterdir()) if DATA_DIR.exists() else []:
+        if not DATE_DIR.match(d.name):
+            continue
+        key = source_key(d)
+        entry = entries.get(d.name)
+        if key and (not entry or entry["key"] != key):
+            summary, source = pool_registry.load_snapshot(d.name)
+            entry = {"key": key, "source": source, "summary": compact(summary)} if summary is not None else None
+            entries[d.name] = entry
+            dirty = True
+        if not key or not entry:
+            skipped.append(d.name)
+            continue
+        if entry["source"] == "raw":
+            from_raw.append(d.name)
+        days.append((d.name, entry["summary"]))
+
+    if from_raw:
+        print(f"  {len(from_raw)} 天没有 summary.json，改用 pools_raw.json")
+    if skipped:
+        print(f"  [WARN] {len(skipped)} 天没有可读的快照，已跳过: {', '.join(skipped)}")
+    if dirty:
+        try:
+            with open(CACHE_PATH, "w") as f:
+                json.dump({"version": CACHE_VERSION, "days": entries}, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"  [WARN] 回测缓存写入失败: {e}")
+    return days
+
+
+def snapshot_ms(date, summary):
+    try:
+        return int(datetime.fromisoformat(summary["ts"]).timestamp() * 1000)
+    except (KeyError, TypeError, ValueError):
+        return int(datetime.strptime(date, "%Y-%m-%d").timestamp() * 1000)
+
+
+def prepare_all(days, since=None):
+    """每个快照的求值状态（列缓存），与阈值无关
+    新池按日期顺序重放注册表得出；since 之前的快照只参与重放"""
+    by_date = dict(days)
+    reg = pool_registry.empty()
+    states = []
+    for i, (date, summary) in enumerate(days):
+        new = pool_registry.update(reg, summary.get("pools", []), date, baseline=i == 0)
+        if since and date < since:
+            continue
+        yd = (datetime.strptime(date, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
+        states.append((date, alert_rules.prepare(summary, summary.get("market", {}), by_date.get(yd),
+                                                 now_ms=snapshot_ms(date, summary), new_addrs=new)))
+    return states
+
+
+# ==================== 回测 ====================
+
+def run(states, thresholds):
+    """→ [(日期, {规则: 触发数}, 预警列表)]"""
+    out = []
+    for date, state in states:
+        result = alert_rules.evaluate(None, None, thresholds=thresholds, state=state)
+        out.append((date, {s["rule"]: s["fired"] for s in result["stats"]}, result["alerts"]))
+    return out
+
+
+def rules_using(name):
+    return [r.name for r in alert_rules.RULES
+            if any(isinstance(v, str) and v.lstrip("-") == name for _, _, v in r.when)]
+
+
+def parse_value(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_assign(arg):
+    name, _, value = arg.partition("=")
+    if name not in alert_rules.THRESHOLDS or not value:
+        raise ValueError(f"未知阈值或缺少取值: {arg}（可选: {', '.join(alert_rules.THRESHOLDS)}）")
+    return name, value
+
+
+# ==================== 输出 ====================
+
+def print_days(results, noisy):
+    names = [r.name for r in alert_rules.RULES]
+    print(f"  {'日期':<8} {'合计':>3}  " + " ".join(f"{n:>{len(n)}}" for n in names))
+    for date, counts, alerts in results:
+        flag = "  ⚠️" if len(alerts) > noisy else ""
+        print(f"  {date:<10} {len(alerts):>5}  " + " ".join(f"{counts.get(n, 0):>{len(n)}}" for n in names) + flag)
+
+    days = len(results) or 1
+    print(f"\n  {'规则':<14} {'总数':>4} {'触发天数':>4} {'日均':>4}")
+    for n in names:
+        total = sum(c.get(n, 0) for _, c, _ in results)
+        active = sum(1 for _, c, _ in results if c.get(n, 0))
+        print(f"  {n:<16} {total:>6} {active:>8} {total / days:>6.1f}")
+
+    loud = [(d, c, a) for d, c, a in results if len(a) > noisy]
+    print(f"\n  噪音日（单日 > {noisy} 条）: {len(loud)} / {len(results)} 天")
+    for date, counts, alerts in loud:
+        top = sorted(((v, k) for k, v in counts.items() if v), reverse=True)[:3]
+        print(f"    {date}: {len(alerts)} 条，主要来自 " + "、".join(f"{k} {v}" for v, k in top))
+
+
+def print_sweep(states, thresholds, name, values, noisy):
+    watched = rules_using(name)
+    print(f"  {name:<12} {'合计':>4} {'日均':>4} {'噪音日':>3}  " + " ".join(f"{n:>{len(n)}}" for n in watched))
+    for v in values:
+        results = run(states, {**thresholds, name: v})
+        total = sum(len(a) for _, _, a in results)
+        loud = sum(1 for _, _, a in results if len(a) > noisy)
+        per_rule = " ".join(f"{sum(c.get(n, 0) for _, c, _ in results):>{len(n)}}" for n in watched)
+        print(f"  {v:<12g} {total:>6} {total / (len(results) or 1):>6.1f} {loud:>6}  {per_rule}")
+
+
+def main():
+    args = sys.argv[1:]
+    overrides, sweep, since, noisy = {}, None, None, NOISY
+    try:
+        for i, arg in enumerate(args):
+            value = args[i + 1] if i + 1 < len(args) else ""
+            if arg == "--set":
+                name, v = parse_assign(value)
+                overrides[name] = parse_value(v)
+            elif arg == "--sweep":
+                name, v = parse_assign(value)
+                sweep = (name, [parse_value(x) for x in v.split(",") if x])
+            elif arg == "--since":
+                since = value
+            elif arg == "--noisy":
+                noisy = int(value)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 1
+
+    t0 = time.perf_counter()
+    days = load_history()
+    states = prepare_all(days, since)
+    if not states:
+        print(f"✗ {DATA_DIR} 下没有历史快照")
+        return 1
+    load_s = time.perf_counter() - t0
+    thresholds = alert_rules.load_thresholds(overrides=overrides)
+
+    print(f"🔁 回测 {len(states)} 个快照（{states[0][0]} ~ {states[-1][0]}，读取 {load_s:.2f}s）")
+    if overrides:
+        print("   覆盖阈值: " + ", ".join(f"{k}={v}" for k, v in overrides.items()))
+    print()
+    t0 = time.perf_counter()
+    if sweep:
+        print_sweep(states, thresholds, *sweep, noisy)
+    else:
+        print_days(run(states, thresholds), noisy)
+    print(f"\n  求值 {(time.perf_counter() - t0) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
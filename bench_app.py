@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Byreal Dashboard — Streamlit 看板渲染基准 + 回归门禁
+用 streamlit.testing 的 AppTest 无头运行 app.py，测量整页脚本执行耗时和峰值内存：
+  - real: data/latest/summary.json + 历史快照
+  - 10k:  合成 10k 池子快照（含推文 / Reddit 卡片）
+
+用法:
+  python3 bench_app.py                # 记录到 data/bench/app.jsonl 并检查回归
+  python3 bench_app.py --tol 0.2      # rerun 比最近 5 次中位数慢 20% 即失败
+  python3 bench_app.py --max-ms 1500  # 额外的绝对上限
+  python3 bench_app.py --update-baseline  # 超出门限也写入基线（确认是预期变化时）
+只有通过门限的运行才写入基线
+依赖: pip install -r requirements.txt
+"""
+
+import gc
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import bench_history
+import collect
+import mock_data
+from bench_collect import MOCK_COMPS, MOCK_MARKET
+from collect_x_api import parse_tweet
+
+SUITE = "app"
+APP_PATH = Path(__file__).parent / "app.py"
+RERUNS = 5
+
+
+# ============================================================
+# 快照准备（写入临时 BYREAL_DATA_DIR）
+# ============================================================
+def copy_history(dst):
+    """复制真实历史 summary.json，让趋势图走真实数据量"""
+    for d in sorted(collect.DATA_DIR.iterdir()):
+        if d.is_dir() and d.name != "latest" and (d / "summary.json").exists():
+            (dst / d.name).mkdir(parents=True, exist_ok=True)
+            shutil.copy(d / "summary.json", dst / d.name / "summary.json")
+
+
+def write_latest(dst, summary):
+    # date 设为今天，避免 app.py 触发 auto_collect
+    summary = {**summary, "date": datetime.now().strftime("%Y-%m-%d")}
+    (dst / "latest").mkdir(parents=True, exist_ok=True)
+    with open(dst / "latest" / "summary.json", "w") as f:
+        json.dump(summary, f, ensure_ascii=False)
+
+
+def prepare_real(dst):
+    src = collect.DATA_DIR / "latest" / "summary.json"
+    if not src.exists():
+        return False
+    with open(src) as f:
+        summary = json.load(f)
+    copy_history(dst)
+    write_latest(dst, summary)
+    return True
+
+
+def prepare_synthetic(dst, n):
+    raw = mock_data.pools_response(mock_data.gen_pools(n, seed=n), page=1, page_size=n)
+    summary = collect.process_pools(raw)
+    alerts = collect.generate_alerts(summary, MOCK_MARKET, None)
+    tweets = [parse_tweet(t, source_type="hot_topic", tag="bench") for t in mock_data.gen_tweets(200, seed=n)]
+    reddit = []
+    for sub in ("solana", "defi", "cryptocurrency"):
+        for c in mock_data.gen_reddit_posts(sub, 50, seed=n):
+            p = c["data"]
+            reddit.append({
+                "subreddit": sub, "title": p["title"], "author": p["author"], "score": p["score"],
+                "upvoteRatio": p["upvote_ratio"], "numComments": p["num_comments"],
+                "url": f"https://reddit.com{p['permalink']}", "created": p["created_utc"],
+                "isRelevant": True, "flair": p["link_flair_text"],
+            })
+    final = {
+        "date": "", "ts": datetime.now().isoformat(), **summary,
+        "market": MOCK_MARKET, "competitors": MOCK_COMPS, "alerts": alerts,
+        "aiInsight": "bench " * 80, "aiPublic": "bench " * 80, "dailyReport": "bench\n" * 40,
+        "xTrends": tweets, "redditHot": reddit, "byrealAccount": {},
+    }
+    copy_history(dst)
+    write_latest(dst, final)
+    return True
+
+
+# ============================================================
+# 测量
+# ============================================================
+def run_app(timeout):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    t0 = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(f"app.py 运行异常: {at.exception[0].value}")
+    return at, first
+
+
+def bench_dataset(name, data_dir, timeout):
+    import streamlit as st
+    os.environ["BYREAL_DATA_DIR"] = str(data_dir)
+    # load_data / load_history 无参数，缓存键与数据目录无关，切换数据集前必须清空
+    st.cache_data.clear()
+
+    at, first = run_app(timeout)
+    reruns = []
+    for _ in range(RERUNS):
+        gc.collect()
+        t0 = time.perf_counter()
+        at.run()
+        reruns.append(time.perf_counter() - t0)
+
+    # 峰值内存单独测一次冷启动（缓存清空）
+    st.cache_data.clear()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run_app(timeout)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    results = [
+        {"dataset": name, "bench": "first_run", "median_s": round(first, 4)},
+        {"dataset": name, "bench": "rerun", "runs": len(reruns),
+         "median_s": round(statistics.median(reruns), 4), "min_s": round(min(reruns), 4),
+         "peak_kb": round(peak / 1024, 1)},
+    ]
+    r = results[1]
+    print(f"  {name:>5} first {first*1000:>9.1f} ms | rerun {r['median_s']*1000:>9.1f} ms "
+          f"(min {r['min_s']*1000:.1f}, n={r['runs']}) | peak {r['peak_kb']:>10.1f} KB")
+    return results
+
+
+def main():
+    args = sys.argv[1:]
+    tol = 0.3
+    max_ms = None
+    size = 10000
+    for i, arg in enumerate(args):
+        if arg == "--tol" and i + 1 < len(args):
+            tol = float(args[i + 1])
+        elif arg == "--max-ms" and i + 1 < len(args):
+            max_ms = float(args[i + 1])
+        elif arg == "--pools" and i + 1 < len(args):
+            size = int(args[i + 1])
+    record = "--no-record" not in args
+
+    try:
+        import streamlit  # noqa: F401
+    except ImportError:
+        print("❌ 未安装 streamlit: pip install -r requirements.txt")
+        sys.exit(2)
+
+    print(f"{'='*50}")
+    print("  Dashboard render benchmarks (AppTest)")
+    print(f"{'='*50}\n")
+
+    results = []
+    saved_env = os.environ.get("BYREAL_DATA_DIR")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            real_dir = Path(tmp) / "real"
+            if prepare_real(real_dir):
+                results += bench_dataset("real", real_dir, timeout=60)
+            else:
+                print("  ✗ 无真实快照 (data/latest/summary.json)，跳过")
+
+            syn_dir = Path(tmp) / "synthetic"
+            print(f"  生成 {size} 个合成池子...")
+            prepare_synthetic(syn_dir, size)
+            results += bench_dataset(f"{size // 1000}k", syn_dir, timeout=300)
+    finally:
+        if saved_env is None:
+            os.environ.pop("BYREAL_DATA_DIR", None)
+        else:
+            os.environ["BYREAL_DATA_DIR"] = saved_env
+
+    failures = [(d, b, f, base, now) for d, b, f, base, now
+                in bench_history.regressions(SUITE, results, time_tol=tol) if b == "rerun"]
+    if max_ms:
+        failures += [(r["dataset"], r["bench"], "median_s", max_ms / 1000, r["median_s"])
+                     for r in results if r["bench"] == "rerun" and r["median_s"] * 1000 > max_ms]
+
+    if record:
+        bench_history.record(SUITE, results, passed=not failures, update_baseline="--update-baseline" in args)
+
+    if failures:
+        print(f"\n❌ {len(failures)} 项超出门限:")
+        for dataset, bench, field, base, now in failures:
+            print(f"   {dataset}/{bench} {field}: {base:g} → {now:g} ({(now/base-1)*100:+.0f}%)")
+        sys.exit(1)
+    print("\n✅ 渲染耗时在门限内")
+
+
+if __name__ == "__main__":
+    main()
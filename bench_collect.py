@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Byreal Dashboard — 采集器计算热点基准测试
+覆盖: process_pools / classify_pool / generate_alerts / AI data brief /
+      push_lark.build_message / summary.json 写入 / 社媒话题聚类
+数据: data/latest 真实快照 + 1k / 10k / 100k 合成池子
+
+用法:
+  python3 bench_collect.py                      # 全部规模，记录历史并检查回归
+  python3 bench_collect.py --sizes 1k,10k       # 指定合成规模
+  python3 bench_collect.py --no-record          # 只看结果，不写历史
+  python3 bench_collect.py --update-baseline    # 有回归也写入基线（确认是预期变化时）
+结果历史: data/bench/collect.jsonl（时间中位数 + tracemalloc 峰值），只记录通过门限的运行
+回归（比最近 5 次中位数慢/大 30% 以上）时退出码为 1
+"""
+
+import gc
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import bench_history
+import collect
+import mock_data
+import push_lark
+import topics
+from collect_x_api import parse_tweet
+
+SUITE = "collect"
+DEFAULT_SIZES = ["1k", "10k", "100k"]
+
+MOCK_MARKET = {
+    "sol": {"price": 84.2, "change24h": -11.3, "mcap": 4.7e10},
+    "btc": {"price": 68750.0, "change24h": -1.2},
+    "eth": {"price": 1985.5, "change24h": 0.8},
+    "fearGreed": {"value": 14, "label": "Extreme Fear"},
+}
+MOCK_COMPS = {
+    "raydium": {"name": "Raydium", "tvl": 1.2e9, "vol24h": 6.1e8, "vol7d": 4.0e9},
+    "meteora": {"name": "Meteora", "tvl": 7.5e8, "vol24h": 3.2e8, "vol7d": 2.1e9},
+    "orca": {"name": "Orca", "tvl": 3.1e8, "vol24h": 1.9e8, "vol7d": 1.3e9},
+}
+
+
+# ============================================================
+# 数据集
+# ============================================================
+def parse_size(s):
+    s = s.strip().lower()
+    if s.endswith("k"):
+        return int(float(s[:-1]) * 1000)
+    return int(s)
+
+
+def load_real():
+    """data/latest 快照 + 前一个有 summary 的日期作为 yesterday"""
+    latest = collect.DATA_DIR / "latest"
+    raw_path = latest / "pools_raw.json"
+    if not raw_path.exists():
+        return None
+    with open(raw_path) as f:
+        raw = json.load(f)
+    market, comps = MOCK_MARKET, MOCK_COMPS
+    if (latest / "market.json").exists():
+        with open(latest / "market.json") as f:
+            market = json.load(f)
+    if (latest / "competitors.json").exists():
+        with open(latest / "competitors.json") as f:
+            comps = json.load(f)
+
+    yesterday = None
+    date = None
+    if (latest / "summary.json").exists():
+        with open(latest / "summary.json") as f:
+            date = json.load(f).get("date")
+    days = sorted(d for d in collect.DATA_DIR.iterdir()
+                  if d.is_dir() and d.name != "latest" and (d / "summary.json").exists() and d.name != date)
+    prev = [d for d in days if not date or d.name < date]
+    if prev:
+        with open(prev[-1] / "summary.json") as f:
+            yesterday = json.load(f)
+
+    return {"raw": raw, "market": market, "comps": comps, "yesterday": yesterday}
+
+
+def load_synthetic(n):
+    raw = mock_data.pools_response(mock_data.gen_pools(n, seed=n), page=1, page_size=max(n, 1))
+    # 昨天 = 今天去掉 5% 的池子，模拟新池上线
+    yesterday = collect.process_pools(raw)
+    yesterday["pools"] = yesterday["pools"][: int(len(yesterday["pools"]) * 0.95)]
+    yesterday["platform"]["tvl"] *= 1.08
+    return {"raw": raw, "market": MOCK_MARKET, "comps": MOCK_COMPS, "yesterday": yesterday}
+
+
+# ============================================================
+# 测量
+# ============================================================
+def measure(fn, min_time=0.5, min_runs=3, max_runs=50):
+    """重复运行直到累计 min_time 秒，返回每次耗时列表"""
+    times = []
+    start = time.perf_counter()
+    while len(times) < min_runs or (time.perf_counter() - start < min_time and len(times) < max_runs):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def peak_memory(fn):
+    """单独跑一次统计 tracemalloc 峰值（KB），不与计时混在一起"""
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round((peak - base) / 1024, 1)
+
+
+def make_benches(ctx, tmp_dir):
+    raw, market, comps, yesterday = ctx["raw"], ctx["market"], ctx["comps"], ctx["yesterday"]
+    records = raw["result"]["data"]["records"]
+    summary = collect.process_pools(raw)
+    alerts = collect.generate_alerts(summary, market, yesterday)
+    final = {
+        "date": "bench",
+        "ts": "bench",
+        **summary,
+        "market": market,
+        "competitors": comps,
+        "alerts": alerts,
+        "aiInsight": "",
+        "aiPublic": "",
+        "dailyReport": "",
+        "xTrends": [],
+        "redditHot": [],
+    }
+    out_path = Path(tmp_dir) / "summary.json"
+    # 社媒条目数随规模增长，上限 5000（单日实际量级）
+    tweets = [parse_tweet(t) for t in mock_data.gen_tweets(min(max(len(records), 100), 5000), seed=len(records))]
+
+    def write_summary():
+        with open(out_path, "w") as f:
+            json.dump(final, f, ensure_ascii=False, indent=2)
+
+    return {
+        "process_pools": lambda: collect.process_pools(raw),
+        "classify_pool": lambda: [collect.classify_pool(p) for p in records],
+        "generate_alerts": lambda: collect.generate_alerts(summary, market, yesterday),
+        "data_brief": lambda: collect.build_data_brief(summary, market, comps, alerts),
+        "build_message": lambda: push_lark.build_message(final),
+        "write_summary": write_summary,
+        "topics": lambda: topics.build_topics(tweets, []),
+    }, len(records)
+
+
+def run_dataset(name, ctx):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        benches, n = make_benches(ctx, tmp)
+        for bench, fn in benches.items():
+            times = measure(fn)
+            results.append({
+                "dataset": name,
+                "bench": bench,
+                "pools": n,
+                "runs": len(times),
+                "median_s": round(statistics.median(times), 6),
+                "min_s": round(min(times), 6),
+                "peak_kb": peak_memory(fn),
+            })
+            r = results[-1]
+            print(f"  {name:>8} {bench:<16} {r['median_s']*1000:>10.2f} ms  (min {r['min_s']*1000:.2f}, "
+                  f"n={r['runs']})  peak {r['peak_kb']:>10.1f} KB")
+    return results
+
+
+def main():
+    args = sys.argv[1:]
+    sizes = DEFAULT_SIZES
+    for i, arg in enumerate(args):
+        if arg == "--sizes" and i + 1 < len(args):
+            sizes = [s for s in args[i + 1].split(",") if s]
+    record = "--no-record" not in args
+
+    print(f"{'='*50}")
+    print("  Collector benchmarks")
+    print(f"{'='*50}\n")
+
+    results = []
+    if "--no-real" not in args:
+        ctx = load_real()
+        if ctx:
+            results += run_dataset("real", ctx)
+        else:
+            print("  ✗ 无真实快照 (data/latest/pools_raw.json)，跳过")
+
+    for s in sizes:
+        n = parse_size(s)
+        print(f"  生成 {n} 个合成池子...")
+        results += run_dataset(s, load_synthetic(n))
+
+    regs = bench_history.regressions(SUITE, results)
+    if record:
+        bench_history.record(SUITE, results, passed=not regs, update_baseline="--update-baseline" in args)
+
+    if regs:
+        print(f"\n❌ {len(regs)} 项回归:")
+        for dataset, bench, field, base, now in regs:
+            print(f"   {dataset}/{bench} {field}: {base:g} → {now:g} ({(now/base-1)*100:+.0f}%)")
+        sys.exit(1)
+    print("\n✅ 无回归")
+
+
+if __name__ == "__main__":
+    main()
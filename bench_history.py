@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+基准测试结果历史（JSON Lines）
+每条记录一个 (suite, dataset, bench) 的一次测量；新结果与最近几次的中位数比较，
+超过阈值即视为回归。只有通过门限的结果才写入基线（慢的结果不会逐渐把基线拖慢），
+确认是预期内的变慢时用 --update-baseline 强制写入。bench_collect.py / bench_app.py 共用。
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+import paths
+
+BASE_DIR = Path(__file__).parent
+HISTORY_DIR = paths.data_dir() / "bench"
+
+# 与最近 N 次同项结果的中位数比较
+BASELINE_RUNS = 5
+
+
+def git_rev():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def history_path(suite):
+    return HISTORY_DIR / f"{suite}.jsonl"
+
+
+def load(suite):
+    path = history_path(suite)
+    if not path.exists():
+        return []
+    rows = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue
+    return rows
+
+
+def append(suite, results):
+    """追加一批结果，附带时间 / git 版本 / 机器信息"""
+    path = history_path(suite)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": git_rev(),
+        "python": platform.python_version(),
+        "host": platform.node(),
+    }
+    with open(path, "a") as f:
+        for r in results:
+            f.write(json.dumps({**meta, **r}, ensure_ascii=False) + "\n")
+
+
+def record(suite, results, passed, update_baseline=False):
+    """通过门限（或显式 --update-baseline）时写入基线，返回是否写入"""
+    if not (passed or update_baseline):
+        print("\n  ⚠️ 未通过门限，结果不写入基线（确认是预期变化后用 --update-baseline 写入）")
+        return False
+    append(suite, results)
+    print(f"\n  💾 {len(results)} 条结果 → {history_path(suite)}")
+    return True
+
+
+def regressions(suite, results, time_tol=0.3, mem_tol=0.3, fields=("median_s", "peak_kb")):
+    """
+    对比历史基线，返回回归列表 [(dataset, bench, field, base, now)]
+    只与同一台机器上的历史比较，避免不同硬件互相干扰
+    """
+    history = load(suite)
+    host = platform.node()
+    out = []
+    for r in results:
+        prev = [h for h in history
+                if h.get("dataset") == r["dataset"] and h.get("bench") == r["bench"] and h.get("host") == host]
+        prev = prev[-BASELINE_RUNS:]
+        if not prev:
+            continue
+        for field in fields:
+            vals = [h[field] for h in prev if h.get(field)]
+            if not vals or not r.get(field):
+                continue
+            base = statistics.median(vals)
+            tol = time_tol if field.endswith("_s") else mem_tol
+            if r[field] > base * (1 + tol):
+                out.append((r["dataset"], r["bench"], field, base, r[field]))
+    return out
@@ -11,9 +11,23 @@ import sys
 import time
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import alert_rules
+import anomaly
+import incentives
+import llm
+import movers
+import paths
+import pool_classifier
+import pool_registry
+import relevance
+import telemetry
+import topics
+import translate
+
 # 导入新增的采集模块
 try:
     from collect_x_trends import fetch_x_trends
@@ -27,20 +41,17 @@ except ImportError:
 # 配置
 # ============================================================
 BASE_DIR = Path(__file__).parent
-DATA_DIR = BASE_DIR / "data"
+DATA_DIR = paths.data_dir()
 
-BYREAL_API = "https://api2.byreal.io/byreal/api/dex/v2/pools/info/list?page=1&pageSize=500"
-COINGECKO_API = "https://api.coingecko.com/api/v3/simple/price?ids=solana,bitcoin,ethereum&vs_currencies=usd&include_24hr_change=true&include_24hr_vol=true&include_market_cap=true"
-FNG_API = "https://api.alternative.me/fng/?limit=1"
-DEFILLAMA_BASE = "https://api.llama.fi"
+# 压测 / 离线调试：BYREAL_MOCK_API=http://127.0.0.1:8765 指向 mock_server.py
+MOCK_API = os.environ.get("BYREAL_MOCK_API", "").rstrip("/")
 
-COMPETITORS = ["raydium", "meteora", "orca", "pumpswap"]
+BYREAL_API = f"{MOCK_API or 'https://api2.byreal.io'}/byreal/api/dex/v2/pools/info/list?page={{page}}&pageSize=500"
+COINGECKO_API = f"{MOCK_API or 'https://api.coingecko.com'}/api/v3/simple/price?ids=solana,bitcoin,ethereum&vs_currencies=usd&include_24hr_change=true&include_24hr_vol=true&include_market_cap=true"
+FNG_API = f"{MOCK_API or 'https://api.alternative.me'}/fng/?limit=1"
+DEFILLAMA_BASE = MOCK_API or "https://api.llama.fi"
 
-# 分类规则
-XSTOCK_CATEGORY = 32
-GOLD_KEYWORDS = ["XAUt"]
-MAJOR_SYMBOLS = {"SOL", "WETH", "WBTC", "BTC", "ETH", "Wrapped SOL", "Wrapped Ether"}
-STABLE_SYMBOLS = {"USDC", "USDT", "USD1", "DAI"}
+COMPETITORS = ["raydium", "meteora", "orca", "pumpswap"]
 
 
 # ============================================================
@@ -54,8 +65,10 @@ def fetch_json(url, timeout=30, retries=2):
                 "User-Agent": "Byreal-Dashboard/1.0",
                 "Accept": "application/json",
             })
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return json.loads(resp.read().decode("utf-8"))
+            with telemetry.http(url) as h, urllib.request.urlopen(req, timeout=timeout) as resp:
+                body = resp.read()
+                h.bytes = len(body)
+            return json.loads(body.decode("utf-8"))
         except Exception as e:
             if attempt < retries:
                 print(f"    重试 {attempt+1}/{retries}: {e}")
@@ -65,6 +78,33 @@ def fetch_json(url, timeout=30, retries=2):
                 return None
 
 
+def fetch_pools(timeout=60):
+    """分页拉取 Byreal 全部池子，合并成第一页的响应格式"""
+    raw = fetch_json(BYREAL_API.format(page=1), timeout=timeout)
+    if not raw or raw.get("retCode") != 0:
+        return raw
+    data = raw.get("result", {}).get("data", {})
+    records = data.setdefault("records", [])
+    total = int(data.get("total") or 0)
+    seen = {r.get("poolAddress") for r in records}
+
+    # 注意：线上 pages/pageSize 字段不可靠，以 total 和空页为准
+    page = 1
+    while len(records) < total:
+        page += 1
+        more = fetch_json(BYREAL_API.format(page=page), timeout=timeout)
+        if not more or more.get("retCode") != 0:
+            print(f"  [WARN] 第 {page} 页拉取失败，仅保留 {len(records)}/{total} 个池子")
+            break
+        batch = [r for r in more.get("result", {}).get("data", {}).get("records", [])
+                 if r.get("poolAddress") not in seen]
+        if not batch:
+            break
+        seen.update(r.get("poolAddress") for r in batch)
+        records.extend(batch)
+    return raw
+
+
 def fmt_usd(val):
     """格式化美元"""
     if val >= 1_000_000_000:
@@ -79,32 +119,19 @@ def fmt_usd(val):
 # ============================================================
 # 池子分类
 # ============================================================
-def classify_pool(pool):
-    base_sym = pool.get("baseMint", {}).get("mintInfo", {}).get("symbol", "")
-    quote_sym = pool.get("quoteMint", {}).get("mintInfo", {}).get("symbol", "")
-    category = pool.get("category", 0)
-
-    # xStocks
-    if category == XSTOCK_CATEGORY:
-        return "xStocks"
-    for sym in (base_sym, quote_sym):
-        if sym.endswith("x") and len(sym) >= 3 and sym[:-1].isupper():
-            return "xStocks"
+# 规则见 pool_classifier.RULES / pool_rules.json；每次运行只加载一次，按地址缓存
+_classifier = None
 
-    # Gold / RWA
-    for kw in GOLD_KEYWORDS:
-        if kw in base_sym or kw in quote_sym:
-            return "Gold_RWA"
 
-    # Stablecoin pair
-    if base_sym in STABLE_SYMBOLS and quote_sym in STABLE_SYMBOLS:
-        return "Stablecoin"
+def classifier():
+    global _classifier
+    if _classifier is None:
+        _classifier = pool_classifier.load()
+    return _classifier
 
-    # Major pair
-    if base_sym in MAJOR_SYMBOLS or quote_sym in MAJOR_SYMBOLS:
-        return "Major"
 
-    return "Other"
+def classify_pool(pool):
+    return classifier().classify_raw(pool)
 
 
 # ============================================================
@@ -148,7 +175,8 @@ def process_pools(raw):
         quote_info = p.get("quoteMint", {}).get("mintInfo", {})
         name = f"{base_info.get('symbol', '?')}-{quote_info.get('symbol', '?')}"
 
-        # 激励信息
+        # 激励信息：全部记录（rewards，数值已解析）；reward 保留第一条的原始格式供旧代码 / 旧快照兼容
+        rewards = incentives.parse_rewards(p.get("rewards"))
         reward = None
         for r in p.get("rewards", []):
             token_info = r.get("token", {}).get("mintInfo", {})
@@ -183,6 +211,7 @@ def process_pools(raw):
             "pc7d": float(p.get("priceChange7d") or 0),
             "bonus": float(p.get("totalBonus") or 0),
             "reward": reward,
+            "rewards": rewards,
             "kline7d": [float(x) for x in p.get("kline7d", [])],
             "kline1d": [float(x) for x in p.get("kline1d", [])],
         })
@@ -219,120 +248,77 @@ def process_pools(raw):
 # ============================================================
 # 预警引擎
 # ============================================================
-def generate_alerts(summary, market, yesterday):
-    alerts = []
-
-    # SOL 大幅波动
-    sol_chg = market.get("sol", {}).get("change24h", 0) or 0
-    if abs(sol_chg) > 10:
-        d = "暴涨" if sol_chg > 0 else "暴跌"
-        alerts.append({"lv": "green" if sol_chg > 0 else "orange", "cat": "market",
-                        "msg": f"SOL 24h {d} {sol_chg:+.1f}%，准备相关营销内容"})
-
-    # Fear & Greed
-    fng = market.get("fearGreed", {}).get("value", 50) or 50
-    if fng < 20:
-        alerts.append({"lv": "green", "cat": "market", "msg": f"Fear & Greed = {fng}（极度恐惧），准备'逆市机会'内容"})
-    elif fng > 80:
-        alerts.append({"lv": "orange", "cat": "market", "msg": f"Fear & Greed = {fng}（极度贪婪），提醒'注意风险'"})
-
-    # xStocks 大幅波动
-    for p in summary.get("xStocks", []):
-        chg = p.get("pc1d", 0)
-        if abs(chg) > 0.05:
-            d = "涨" if chg > 0 else "跌"
-            alerts.append({"lv": "green" if chg > 0 else "orange", "cat": "xstocks",
-                            "msg": f"{p['name']} 24h {d} {abs(chg)*100:.1f}%，建议发推关联相关新闻"})
-
-    # 高 APR
-    for p in summary.get("pools", []):
-        if p.get("apr", 0) > 5 and p.get("tvl", 0) > 1000:
-            alerts.append({"lv": "orange", "cat": "pool",
-                            "msg": f"{p['name']} APR {p['apr']*100:.0f}%，注意监控"})
-
-    # 激励到期
-    now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
-    for p in summary.get("pools", []):
-        r = p.get("reward")
-        if r and r.get("endTs"):
-            days = (r["endTs"] - now_ms) / 86400000
-            if 0 < days < 7:
-                alerts.append({"lv": "red", "cat": "reward",
-                                "msg": f"{p['name']} 激励 {days:.0f} 天后到期，提醒团队续期"})
-
-    # 与昨天对比
-    if yesterday:
-        prev_tvl = yesterday.get("platform", {}).get("tvl", 0)
-        curr_tvl = summary.get("platform", {}).get("tvl", 0)
-        if prev_tvl > 0:
-            chg = (curr_tvl - prev_tvl) / prev_tvl
-            summary["platform"]["tvlChange"] = chg
-            if chg < -0.05:
-                alerts.append({"lv": "red", "cat": "platform",
-                                "msg": f"平台 TVL 日环比下降 {abs(chg)*100:.1f}%，排查原因"})
-
-        prev_vol = yesterday.get("platform", {}).get("vol24h", 0)
-        curr_vol = summary.get("platform", {}).get("vol24h", 0)
-        if prev_vol > 0:
-            summary["platform"]["volChange"] = (curr_vol - prev_vol) / prev_vol
-            summary["platform"]["vol24h_prev"] = prev_vol
-
-        # 新池检测
-        prev_addrs = {p["addr"] for p in yesterday.get("pools", [])}
-        for p in summary.get("pools", []):
-            if p["addr"] not in prev_addrs and p["addr"]:
-                alerts.append({"lv": "green", "cat": "newpool",
-                                "msg": f"新池上线：{p['name']}，准备介绍推文"})
-
-    return alerts
+MAX_ANOMALIES = 50      # summary.json 里保留的异常条数（按 |z| 降序）
+
+
+def compare_yesterday(summary, yesterday):
+    """平台 TVL / Vol 日环比写入 summary["platform"]"""
+    if not yesterday:
+        return
+    prev_tvl = yesterday.get("platform", {}).get("tvl", 0)
+    curr_tvl = summary.get("platform", {}).get("tvl", 0)
+    if prev_tvl > 0:
+        summary["platform"]["tvlChange"] = (curr_tvl - prev_tvl) / prev_tvl
+
+    prev_vol = yesterday.get("platform", {}).get("vol24h", 0)
+    curr_vol = summary.get("platform", {}).get("vol24h", 0)
+    if prev_vol > 0:
+        summary["platform"]["volChange"] = (curr_vol - prev_vol) / prev_vol
+        summary["platform"]["vol24h_prev"] = prev_vol
+
+
+def generate_alerts(summary, market, yesterday, now_ms=None, prev_index=None, new_addrs=None, rewards=None):
+    """按 alert_rules.RULES 求值（阈值见 alert_rules.THRESHOLDS / alert_rules.json）
+    new_addrs: 池子注册表给出的今日新池；为 None 时退回与昨日比较（prev_index 为 movers 阶段建好的昨日索引）
+    rewards: 激励索引里尚未到期的激励；为 None 时从池子摊平"""
+    compare_yesterday(summary, yesterday)
+    result = alert_rules.evaluate(summary, market, yesterday, now_ms=now_ms,
+                                  prev_index=prev_index, new_addrs=new_addrs, rewards=rewards)
+    telemetry.gauge("alert_rules_ms", round(sum(s["ms"] for s in result["stats"]), 3))
+    for s in result["stats"]:
+        telemetry.gauge("alert_rule_ms", s["ms"], label=("rule", s["rule"]))
+        telemetry.gauge("alert_rule_fired", s["fired"], label=("rule", s["rule"]))
+    return result["alerts"]
 
 
 # ============================================================
 # AI 总结
 # ============================================================
-ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
-
-# 尝试从 byreal-daily 的 .env 读取
-if not ANTHROPIC_API_KEY:
-    env_path = BASE_DIR.parent / "byreal-daily" / ".env"
-    if env_path.exists():
-        for line in env_path.read_text().splitlines():
-            if line.startswith("ANTHROPIC_API_KEY="):
-                ANTHROPIC_API_KEY = line.split("=", 1)[1].strip()
-                break
-
-
-def call_claude(prompt, max_tokens=1000):
-    """调用 Claude API"""
-    if not ANTHROPIC_API_KEY:
-        return ""
+AI_CACHE_PATH = DATA_DIR / "ai_cache.json"
+AI_BUDGET_S = float(os.environ.get("AI_BUDGET_S", "30"))   # AI 总结阶段的时间预算
+AI_CACHE_DAYS = 7
+
+
+def call_claude(prompt, max_tokens=1000, deadline=None):
+    """调用 LLM（后端由 LLM_BACKEND 选择，见 llm.py）；失败 / 超时返回空串"""
+    return llm.complete(prompt, max_tokens, deadline)
+
+
+def ai_cache_key(prompt, model=None):
+    return llm.prompt_key(prompt, model or llm.model())
+
+
+def load_ai_cache():
     try:
-        payload = json.dumps({
-            "model": "claude-sonnet-4-20250514",
-            "max_tokens": max_tokens,
-            "messages": [{"role": "user", "content": prompt}],
-        }).encode("utf-8")
-
-        req = urllib.request.Request(
-            "https://api.anthropic.com/v1/messages",
-            data=payload,
-            headers={
-                "Content-Type": "application/json",
-                "x-api-key": ANTHROPIC_API_KEY,
-                "anthropic-version": "2023-06-01",
-            },
-            method="POST",
-        )
-        with urllib.request.urlopen(req, timeout=60) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
-            return result.get("content", [{}])[0].get("text", "")
-    except Exception as e:
-        print(f"  [WARN] Claude API 失败: {e}")
-        return ""
+        with open(AI_CACHE_PATH) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    cache.setdefault("responses", {})
+    cache.setdefault("last", {})
+    return cache
+
 
+def save_ai_cache(cache):
+    cutoff = time.time() - AI_CACHE_DAYS * 86400
+    cache["responses"] = {k: v for k, v in cache["responses"].items() if v.get("ts", 0) >= cutoff}
+    AI_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(AI_CACHE_PATH, "w") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
 
-def generate_ai_summary(summary, market, comps, alerts):
-    """生成两段 AI 总结"""
+
+def build_data_brief(summary, market, comps, alerts):
+    """构建喂给 AI 的数据摘要文本"""
     p = summary["platform"]
     sol = market.get("sol", {})
     fng = market.get("fearGreed", {})
@@ -371,6 +357,14 @@ def generate_ai_summary(summary, market, comps, alerts):
             chg = s.get("pc1d", 0)
             data_brief += f"  {s['name']}: ${s['px']:.2f} ({chg*100:+.1f}%) TVL ${s['tvl']/1e6:.2f}M\n"
 
+    return data_brief
+
+
+def generate_ai_summary(summary, market, comps, alerts, today=None):
+    """生成两段 AI 总结 → {"insight", "public", "stale": {段: 沿用文本的生成日期}}"""
+    today = today or datetime.now().strftime("%Y-%m-%d")
+    data_brief = build_data_brief(summary, market, comps, alerts)
+
     # --- 内部运营洞察 ---
     insight_prompt = f"""{data_brief}
 
@@ -391,15 +385,55 @@ def generate_ai_summary(summary, market, comps, alerts):
 
 要求：积极专业、突出亮点、吸引用户参与。不要提风险预警。中文回答。"""
 
-    insight = call_claude(insight_prompt)
-    public = call_claude(public_prompt)
+    # 同一 prompt + 模型直接用缓存；未命中的两段并发生成，共用一个时间预算
+    prompts = {"insight": insight_prompt, "public": public_prompt}
+    cache = load_ai_cache()
+    out, pending = {}, {}
+    for k, prompt in prompts.items():
+        hit = cache["responses"].get(ai_cache_key(prompt))
+        if hit:
+            out[k] = hit["text"]
+        else:
+            pending[k] = prompt
+    telemetry.gauge("ai_cache_hits", len(prompts) - len(pending))
+
+    attempted = set()
+    if pending and llm.available():
+        attempted = set(pending)
+        deadline = time.monotonic() + AI_BUDGET_S
+        with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+            futures = {pool.submit(call_claude, prompt, 1000, deadline): k for k, prompt in pending.items()}
+            for fut in as_completed(futures):
+                k = futures[fut]
+                text = fut.result()
+                if text:
+                    out[k] = text
+                    cache["responses"][ai_cache_key(pending[k])] = {"text": text, "ts": int(time.time())}
+
+    # 只有调用了模型但失败 / 超出预算时才沿用上一次的文本，并记下它的生成日期；没有可用后端时不沿用
+    stale = {}
+    for k in prompts:
+        last = cache["last"].get(k)
+        if isinstance(last, str):   # 旧缓存只存了文本
+            last = {"text": last, "date": ""}
+        if out.get(k):
+            cache["last"][k] = {"text": out[k], "date": today}
+        elif k in attempted and last and last.get("text"):
+            out[k] = last["text"]
+            stale[k] = last.get("date") or "未知日期"
+            print(f"  ⚠️ {k} 生成失败，沿用 {stale[k]} 的文本")
+    try:
+        save_ai_cache(cache)
+    except OSError as e:
+        print(f"  [WARN] AI 缓存写入失败: {e}")
 
+    insight, public = out.get("insight", ""), out.get("public", "")
     if insight:
         print(f"  ✓ 运营洞察: {insight[:50]}...")
     if public:
         print(f"  ✓ 平台快报: {public[:50]}...")
 
-    return {"insight": insight, "public": public}
+    return {"insight": insight, "public": public, "stale": stale}
 
 
 # ============================================================
@@ -415,8 +449,9 @@ def main():
     print(f"{'='*50}\n")
 
     # --- 1. Byreal API ---
+    telemetry.stage("byreal")
     print("[1/3] Byreal pool data...")
-    raw = fetch_json(BYREAL_API, timeout=60)
+    raw = fetch_pools(timeout=60)
     if not raw or raw.get("retCode") != 0:
         print("  ✗ Byreal API 请求失败，终止采集")
         sys.exit(1)
@@ -425,8 +460,15 @@ def main():
     summary = process_pools(raw)
     p = summary["platform"]
     print(f"  ✓ {p['total']} pools | TVL {fmt_usd(p['tvl'])} | Vol24h {fmt_usd(p['vol24h'])}")
+    clf = classifier()
+    telemetry.gauge("classify_cache_hits", clf.hits)
+    try:
+        clf.save()
+    except OSError as e:
+        print(f"  [WARN] 池子分类缓存写入失败: {e}")
 
     # --- 2. Market data ---
+    telemetry.stage("market")
     print("[2/3] Market data...")
     prices = fetch_json(COINGECKO_API) or {}
     fng = fetch_json(FNG_API)
@@ -454,6 +496,7 @@ def main():
     print(f"  ✓ SOL ${market['sol']['price']} | BTC ${market['btc']['price']} | F&G {market['fearGreed']['value']}")
 
     # --- 3. Competitors ---
+    telemetry.stage("competitors")
     print("[3/3] Competitor data...")
     comps = {}
     for slug in COMPETITORS:
@@ -486,6 +529,7 @@ def main():
     print(f"  ✓ {len(comps)} protocols")
 
     # --- 4. 生成预警 ---
+    telemetry.stage("alerts")
     yesterday_summary = None
     try:
         yd = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
@@ -496,31 +540,75 @@ def main():
     except Exception:
         pass
 
-    alerts = generate_alerts(summary, market, yesterday_summary)
+    # 池子日环比：昨日池子按 addr 建一次索引，涨跌榜和新池预警共用
+    yesterday_index = movers.index_pools(yesterday_summary.get("pools")) if yesterday_summary else None
+    pool_movers = movers.compute(summary["pools"], yesterday_index)
+    if pool_movers:
+        print(f"  ✓ 池子日环比: 匹配 {pool_movers['matched']} / 新增 {pool_movers['added']}"
+              f" / 消失 {pool_movers['removedTotal']}")
+
+    # 池子注册表：首次出现日期决定新池（不受 data/ 缺天影响）
+    registry, new_addrs = pool_registry.record(summary["pools"], today)
+    pool_cohorts = pool_registry.cohorts(registry, today, pool_registry.COHORT_WEEKS)
+    print(f"  ✓ 池子注册表: 今日新池 {len(new_addrs)} 个")
+
+    # 激励：全部激励按到期时间建索引，到期预警 / 激励日历 / 代币花费都是区间查询
+    now_ms = int(time.time() * 1000)
+    incentive_index = incentives.build(summary["pools"])
+    incentive_summary = incentive_index.summary(now_ms)
+    print(f"  ✓ 激励: 生效中 {incentive_summary['active']} 条 / {incentive_summary['pools']} 个池子，"
+          f"每日约 {fmt_usd(incentive_summary['dailyUsd'])}")
+
+    alerts = generate_alerts(summary, market, yesterday_summary, now_ms=now_ms, prev_index=yesterday_index,
+                             new_addrs=new_addrs, rewards=incentive_index.active(now_ms))
+
+    # 滚动统计异常：每条池子 / 平台序列按自身波动打分（状态增量更新，不回读历史）
+    anomalies = anomaly.detect(summary, today)
+    alerts += anomaly.to_alerts(anomalies)
+    print(f"  ✓ 异常检测: {len(anomalies)} 个指标偏离近期均值 {anomaly.Z_ALERT:g}σ 以上")
+
+    # 社媒实体标签用今天的池子（ticker 以最新快照为准）
+    engine = relevance.build(summary["pools"])
 
     # --- 5. X/Twitter 热点 ---
+    telemetry.stage("x_trends")
     print("[4/7] X/Twitter 热点...")
     x_trends = []
     if fetch_x_trends:
         try:
-            x_trends = fetch_x_trends()
+            x_trends = relevance.tag_items(fetch_x_trends(), engine)
         except Exception as e:
             print(f"  [WARN] X 采集失败: {e}")
     else:
         print("  ✗ 跳过（模块未加载）")
 
     # --- 6. Reddit 热点 ---
+    telemetry.stage("reddit")
     print("[5/7] Reddit 热帖...")
     reddit_hot = []
     if fetch_reddit_hot:
         try:
-            reddit_hot = fetch_reddit_hot()
+            reddit_hot = fetch_reddit_hot(engine)
         except Exception as e:
             print(f"  [WARN] Reddit 采集失败: {e}")
     else:
         print("  ✗ 跳过（模块未加载）")
 
+    # --- 6.1 中文翻译 / 摘要（按内容哈希缓存，只翻译新内容）---
+    telemetry.stage("translate")
+    try:
+        tr = translate.annotate(reddit_hot, x_trends, call_claude if llm.available() else None)
+        print(f"  ✓ 翻译 {tr['items']} 条: 缓存 {tr['cached']} / 新翻译 {tr['translated']} / LLM 请求 {tr['calls']}")
+    except Exception as e:
+        print(f"  [WARN] 翻译失败，保留原文: {e}")
+
+    # --- 6.2 社媒话题聚类 ---
+    telemetry.stage("topics")
+    social_topics = topics.build_topics(x_trends, reddit_hot)
+    print(f"  ✓ {len(x_trends) + len(reddit_hot)} 条社媒内容 → {len(social_topics)} 个话题")
+
     # --- 7. 读取本地运营日报 ---
+    telemetry.stage("daily_report")
     print("[6.5/7] 读取运营日报...")
     daily_report = ""
     daily_paths = [
@@ -536,8 +624,9 @@ def main():
         print("  ✗ 未找到今日日报")
 
     # --- 7. AI 总结 ---
+    telemetry.stage("ai_summary")
     print("[7/7] AI 总结...")
-    ai_summary = generate_ai_summary(summary, market, comps, alerts)
+    ai_summary = generate_ai_summary(summary, market, comps, alerts, today)
 
     # --- 8. Byreal 账号分析 (mock data) ---
     print("[8/8] Byreal 账号分析 (mock)...")
@@ -551,6 +640,7 @@ def main():
     }
 
     # --- 9. 合并输出 ---
+    telemetry.stage("write")
     final = {
         "date": today,
         "ts": datetime.now(timezone.utc).isoformat(),
@@ -558,11 +648,17 @@ def main():
         "market": market,
         "competitors": comps,
         "alerts": alerts,
+        "anomalies": anomalies[:MAX_ANOMALIES],
+        "movers": pool_movers,
+        "cohorts": pool_cohorts,
+        "incentives": incentive_summary,
         "aiInsight": ai_summary.get("insight", ""),
         "aiPublic": ai_summary.get("public", ""),
+        "aiStale": ai_summary.get("stale", {}),
         "dailyReport": daily_report,
         "xTrends": x_trends,
         "redditHot": reddit_hot,
+        "topics": social_topics,
         "byrealAccount": byreal_account,
     }
 
@@ -579,6 +675,11 @@ def main():
             shutil.rmtree(latest)
     shutil.copytree(today_dir, latest)
 
+    telemetry.gauge("pools", len(summary["pools"]))
+    telemetry.gauge("alerts", len(alerts))
+    for name in ("pools_raw.json", "summary.json"):
+        telemetry.gauge(f"{name.split('.')[0]}_bytes", (today_dir / name).stat().st_size)
+
     print(f"\n✅ 数据已保存: {today_dir}/")
     print(f"📋 {len(alerts)} 条预警:")
     for a in alerts:
@@ -589,4 +690,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    telemetry.start_run("collect")
+    ok = False
+    try:
+        main()
+        ok = True
+    finally:
+        telemetry.finish_run(ok=ok)
@@ -2,73 +2,268 @@
 """
 Reddit 热点采集
 使用 Reddit JSON API (无需认证)
+  - 多个 subreddit 并发拉取，共用一个令牌桶限速（REDDIT_RPS / REDDIT_BURST）
+  - listing 按 after 游标翻页，每个 subreddit 读到 REDDIT_DEPTH 条
+  - 帖子按 id 缓存在 data/reddit_cache.json：
+      listing 在 REDDIT_LISTING_TTL 秒内不重新翻页，直接用缓存的帖子顺序
+      缓存帖子的 score / 评论数超过 REDDIT_POST_TTL 秒后通过 /by_id 批量刷新（100 条一次请求）
+      旧版缓存（帖子列表）读取时自动迁移，已有的 title_cn / summary_cn 按标题保留给 translate.py
+  - 输出每个 subreddit 热榜前 HOT_PER_SUB 条 + 更深位置中与 Byreal 相关的帖子（最多 RELEVANT_PER_SUB 条）
 """
 
 import json
-import urllib.request
-import urllib.error
+import os
+import re
 import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import paths
+import ratelimit
+import relevance
+import social_search
+import telemetry
 
+DATA_DIR = paths.data_dir()
+CACHE_PATH = DATA_DIR / "reddit_cache.json"
+
+REDDIT_BASE = os.environ.get("BYREAL_MOCK_API", "").rstrip("/") or "https://www.reddit.com"
 SUBREDDITS = ["solana", "defi", "cryptocurrency"]
-BYREAL_KEYWORDS = ["byreal", "solana", "dex"]
+USER_AGENT = "ByealBot/1.0"
+
+REDDIT_RPS = float(os.environ.get("REDDIT_RPS", "1"))
+if REDDIT_RPS <= 0:
+    # translate.py 在 collect.py 进程里导入本模块，配置错误不能让整次采集失败
+    print(f"[WARN] REDDIT_RPS={REDDIT_RPS} 无效，改用 1")
+    REDDIT_RPS = 1.0
+REDDIT_BURST = int(os.environ.get("REDDIT_BURST", "3"))
+REDDIT_CONCURRENCY = int(os.environ.get("REDDIT_CONCURRENCY", "4"))
+REDDIT_DEPTH = int(os.environ.get("REDDIT_DEPTH", "50"))
+REDDIT_LISTING_TTL = int(os.environ.get("REDDIT_LISTING_TTL", "1800"))
+REDDIT_POST_TTL = int(os.environ.get("REDDIT_POST_TTL", "600"))
+PAGE_SIZE = 25
+BY_ID_BATCH = 100
+HOT_PER_SUB = 5
+RELEVANT_PER_SUB = 10
+CACHE_DAYS = 3
+RETRIES_429 = 2
+SELFTEXT_CHARS = 4000
+LEGACY_ID = re.compile(r"/comments/([a-z0-9]+)")
+_bucket = ratelimit.TokenBucket(REDDIT_RPS, REDDIT_BURST)
+
+
+# ==================== API 调用 ====================
+
+def reddit_get(path):
+    """GET Reddit JSON（经共享令牌桶限速，429 时按 Retry-After 退避重试，见 ratelimit.fetch）；其它错误抛出"""
+    req = urllib.request.Request(f"{REDDIT_BASE}{path}", headers={"User-Agent": USER_AGENT})
+    return json.loads(ratelimit.fetch(_bucket, req, retries=RETRIES_429, timeout=10).decode("utf-8"))
+
+
+def fetch_listing(sub, depth=REDDIT_DEPTH):
+    """按 after 游标翻页读取热榜，返回原始帖子（热榜顺序）"""
+    posts, after = [], None
+    while len(posts) < depth:
+        limit = min(PAGE_SIZE, depth - len(posts))
+        path = f"/r/{sub}/hot.json?limit={limit}" + (f"&after={after}" if after else "")
+        data = (reddit_get(path) or {}).get("data", {})
+        posts.extend(c.get("data", {}) for c in data.get("children", []))
+        after = data.get("after")
+        if not after:
+            break
+    return posts
+
+
+def fetch_by_id(names):
+    """/by_id/t3_a,t3_b.json 批量读取帖子当前数据"""
+    data = (reddit_get(f"/by_id/{','.join(names)}.json") or {}).get("data", {})
+    return [c.get("data", {}) for c in data.get("children", [])]
+
+
+# ==================== 缓存 ====================
+
+def migrate_legacy(rows):
+    """旧版缓存（帖子列表，带 title_cn / summary_cn）→ 新格式；翻译按标题留在 legacyCn，供 translate.py 复用"""
+    posts, legacy_cn = {}, {}
+    for r in rows:
+        if not isinstance(r, dict) or not r.get("title"):
+            continue
+        if r.get("title_cn"):
+            legacy_cn[r["title"]] = {"title_cn": r["title_cn"], "summary_cn": r.get("summary_cn") or ""}
+        m = LEGACY_ID.search(r.get("url") or "")
+        if not m:
+            continue
+        try:
+            created = int(datetime.strptime(r.get("date") or "", "%Y-%m-%d").timestamp())
+        except ValueError:
+            created = 0
+        posts[m.group(1)] = {
+            "id": m.group(1), "subreddit": r.get("subreddit", ""), "title": r["title"], "author": "",
+            "score": r.get("score", 0), "upvoteRatio": 0, "numComments": r.get("comments", 0),
+            "url": f"https://reddit.com/r/{r.get('subreddit', '')}/comments/{m.group(1)}/",
+            "created": created, "flair": "", "selftext": "", "fetchedAt": 0,
+        }
+    return {"posts": posts, "subs": {}, "legacyCn": legacy_cn}
+
+
+def load_cache():
+    try:
+        with open(CACHE_PATH) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    if isinstance(cache, list):
+        cache = migrate_legacy(cache)
+        print(f"  ✓ Reddit 旧版缓存迁移: {len(cache['posts'])} 条帖子，{len(cache['legacyCn'])} 条已有翻译")
+    elif not isinstance(cache, dict):
+        cache = {}
+    cache.setdefault("posts", {})
+    cache.setdefault("subs", {})
+    return cache
+
 
+def save_cache(cache):
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_PATH, "w") as f:
+        json.dump(cache, f, ensure_ascii=False, sort_keys=True)
 
-def fetch_reddit_hot():
+
+def cache_entry(p, sub, now):
+    return {
+        "id": p.get("id", ""),
+        "subreddit": p.get("subreddit") or sub,
+        "title": p.get("title", ""),
+        "author": p.get("author", ""),
+        "score": p.get("score", 0),
+        "upvoteRatio": p.get("upvote_ratio", 0),
+        "numComments": p.get("num_comments", 0),
+        "url": f"https://reddit.com{p.get('permalink', '')}",
+        "created": p.get("created_utc", 0),
+        "flair": p.get("link_flair_text", ""),
+        "selftext": (p.get("selftext") or "")[:SELFTEXT_CHARS],
+        "fetchedAt": now,
+    }
+
+
+def refresh_metrics(entry, p, now):
+    entry.update({
+        "score": p.get("score", entry["score"]),
+        "upvoteRatio": p.get("upvote_ratio", entry["upvoteRatio"]),
+        "numComments": p.get("num_comments", entry["numComments"]),
+        "fetchedAt": now,
+    })
+
+
+def evict(cache, now):
+    """丢弃超过 CACHE_DAYS 且已不在任何热榜里的帖子"""
+    listed = {pid for s in cache["subs"].values() for pid in s.get("ids", [])}
+    cutoff = now - CACHE_DAYS * 86400
+    stale = [pid for pid, e in cache["posts"].items() if pid not in listed and (e.get("created") or 0) < cutoff]
+    for pid in stale:
+        del cache["posts"][pid]
+    return len(stale)
+
+
+# ==================== 采集 ====================
+
+def to_post(entry, engine):
+    # 一次扫描标题 + 正文：Byreal 关键词 / 竞品 / 池子 ticker（池子列表每天变化，不缓存结果）
+    entities = engine.tag(entry["title"], entry["selftext"])
+    return {
+        "id": entry["id"],
+        "subreddit": entry["subreddit"],
+        "title": entry["title"],
+        "author": entry["author"],
+        "score": entry["score"],
+        "upvoteRatio": entry["upvoteRatio"],
+        "numComments": entry["numComments"],
+        "url": entry["url"],
+        "created": entry["created"],
+        "isRelevant": relevance.is_relevant(entities),
+        "entities": entities,
+        "flair": entry["flair"],
+    }
+
+
+def fetch_reddit_hot(engine=None, subreddits=None, now=None):
     """
     采集 Reddit 热帖
-    使用 Reddit 公开 JSON API
+    使用 Reddit 公开 JSON API；engine 为 relevance.build() 的自动机，省略时按最新快照构建
     """
     print("  采集 Reddit 热帖...")
-    
+    engine = engine or relevance.build()
+    subreddits = subreddits or SUBREDDITS
+    now = int(now or time.time())
+    cache = load_cache()
+    posts, subs = cache["posts"], cache["subs"]
+
+    due = [s for s in subreddits if now - subs.get(s, {}).get("fetchedAt", 0) >= REDDIT_LISTING_TTL]
+    fresh = [s for s in subreddits if s not in due]
+    stale = [pid for s in fresh for pid in subs[s].get("ids", [])
+             if pid in posts and now - posts[pid].get("fetchedAt", 0) >= REDDIT_POST_TTL]
+    batches = [stale[i:i + BY_ID_BATCH] for i in range(0, len(stale), BY_ID_BATCH)]
+
+    with ThreadPoolExecutor(max_workers=REDDIT_CONCURRENCY) as pool:
+        futures = {pool.submit(fetch_listing, s): ("listing", s) for s in due}
+        futures.update({pool.submit(fetch_by_id, [f"t3_{pid}" for pid in b]): ("by_id", i)
+                        for i, b in enumerate(batches)})
+        for fut in as_completed(futures):
+            kind, key = futures[fut]
+            try:
+                raw = fut.result()
+            except Exception as e:
+                label = f"r/{key}" if kind == "listing" else f"by_id 第 {key + 1} 批"
+                print(f"  [WARN] Reddit {label} 采集失败: {e}")
+                continue
+            if kind == "listing":
+                for p in raw:
+                    if p.get("id"):
+                        posts[p["id"]] = cache_entry(p, key, now)
+                subs[key] = {"fetchedAt": now, "ids": [p["id"] for p in raw if p.get("id")]}
+            else:
+                for p in raw:
+                    if p.get("id") in posts:
+                        refresh_metrics(posts[p["id"]], p, now)
+
+    updated = [e for e in posts.values() if e.get("fetchedAt") == now]
+    telemetry.gauge("reddit_listings_cached", len(fresh))
+    telemetry.gauge("reddit_posts_refreshed", len(updated))
+
     all_posts = []
-    
-    for sub in SUBREDDITS:
-        try:
-            url = f"https://www.reddit.com/r/{sub}/hot.json?limit=5"
-            req = urllib.request.Request(url, headers={
-                "User-Agent": "ByealBot/1.0"
-            })
-            
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
-                posts = data.get("data", {}).get("children", [])
-                
-                for post in posts:
-                    p = post.get("data", {})
-                    
-                    # 检查是否与 Byreal/Solana 相关
-                    title = p.get("title", "").lower()
-                    selftext = p.get("selftext", "").lower()
-                    is_relevant = any(kw in title or kw in selftext for kw in BYREAL_KEYWORDS)
-                    
-                    all_posts.append({
-                        "subreddit": sub,
-                        "title": p.get("title", ""),
-                        "author": p.get("author", ""),
-                        "score": p.get("score", 0),
-                        "upvoteRatio": p.get("upvote_ratio", 0),
-                        "numComments": p.get("num_comments", 0),
-                        "url": f"https://reddit.com{p.get('permalink', '')}",
-                        "created": p.get("created_utc", 0),
-                        "isRelevant": is_relevant,
-                        "flair": p.get("link_flair_text", ""),
-                    })
-            
-            # 礼貌等待，避免被限速
-            time.sleep(1)
-            
-        except Exception as e:
-            print(f"  [WARN] Reddit r/{sub} 采集失败: {e}")
-            continue
-    
+    for s in subreddits:
+        extra = 0
+        for rank, pid in enumerate(subs.get(s, {}).get("ids", [])):
+            if pid not in posts:
+                continue
+            post = to_post(posts[pid], engine)
+            if rank < HOT_PER_SUB:
+                all_posts.append(post)
+            elif post["isRelevant"] and extra < RELEVANT_PER_SUB:
+                all_posts.append(post)
+                extra += 1
+
     # 按 score 排序
     all_posts.sort(key=lambda x: x["score"], reverse=True)
-    
-    print(f"  ✓ 采集到 {len(all_posts)} 条 Reddit 帖子")
+
+    # 写入全文索引（标题 + 正文；只写本轮新拉取 / 刷新过的帖子）
+    try:
+        social_search.index_reddit(updated, {e["url"]: e["selftext"] for e in updated})
+    except Exception as e:
+        print(f"  [WARN] Reddit 索引写入失败: {e}")
+
+    evict(cache, now)
+    try:
+        save_cache(cache)
+    except OSError as e:
+        print(f"  [WARN] Reddit 缓存写入失败: {e}")
+
+    print(f"  ✓ 采集到 {len(all_posts)} 条 Reddit 帖子"
+          f"（翻页 {len(due)} 个版块，缓存 {len(fresh)} 个，刷新 {len(stale)} 条）")
     relevant_count = sum(1 for p in all_posts if p["isRelevant"])
     if relevant_count > 0:
         print(f"  → {relevant_count} 条与 Byreal/Solana 相关")
-    
+
     return all_posts
 
 
@@ -5,10 +5,13 @@ Byreal Dashboard — Twitter 数据采集
   1. 浏览器自动化 (Playwright) — 精确抓取粉丝数、互动数
   2. Web Search 备选 — 通过搜索引擎获取公开信息
 
-用法: python3 collect_twitter.py
+用法:
+  python3 collect_twitter.py                   # 采集（每次启动 Chromium）
+  python3 collect_twitter.py --browser-server  # 启动常驻浏览器，之后设置 PLAYWRIGHT_CDP_URL 复用
 依赖: pip install playwright && playwright install chromium
 """
 
+import asyncio
 import json
 import os
 import sys
@@ -16,10 +19,11 @@ import time
 import re
 import urllib.request
 from datetime import datetime
-from pathlib import Path
 
-BASE_DIR = Path(__file__).parent
-DATA_DIR = BASE_DIR / "data"
+import paths
+import telemetry
+
+DATA_DIR = paths.data_dir()
 
 # ============================================================
 # 追踪账号配置
@@ -38,80 +42,125 @@ ACCOUNTS = {
 
 
 # ============================================================
-# 方法1: Playwright 浏览器自动化
+# 方法1: Playwright 浏览器自动化（异步并发）
 # ============================================================
+# - 一个 context 内最多 SCRAPE_CONCURRENCY 个页面并发
+# - 通过 route 拦截图片 / 视频 / 字体 / 样式，只加载文档和脚本
+# - 等待粉丝数链接出现，而不是固定 sleep
+# - PLAYWRIGHT_CDP_URL 指向常驻浏览器（python3 collect_twitter.py --browser-server）时复用，
+#   省掉每次启动 Chromium 的开销
+SCRAPE_CONCURRENCY = int(os.environ.get("TWITTER_SCRAPE_CONCURRENCY", "4"))
+CDP_URL = os.environ.get("PLAYWRIGHT_CDP_URL", "")
+CDP_PORT = 9222
+NAV_TIMEOUT_MS = 20000
+SELECTOR_TIMEOUT_MS = 10000
+BLOCKED_RESOURCES = {"image", "media", "font", "stylesheet"}
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+
+def followers_selector(handle):
+    return f'a[href="/{handle}/verified_followers"], a[href="/{handle}/followers"]'
+
+
+async def _block_heavy(route):
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _scrape_account(ctx, sem, handle, info):
+    async with sem:
+        print(f"  抓取 @{handle}...")
+        page = await ctx.new_page()
+        try:
+            await page.goto(f"https://x.com/{handle}", timeout=NAV_TIMEOUT_MS, wait_until="domcontentloaded")
+
+            followers = None
+            # 方法A: 粉丝数链接出现即读取
+            try:
+                el = await page.wait_for_selector(followers_selector(handle), timeout=SELECTOR_TIMEOUT_MS)
+                followers = parse_count(await el.inner_text())
+            except Exception:
+                pass
+
+            # 方法B: 从页面文本搜索
+            if not followers:
+                m = re.search(r'([\d,.]+[KkMm]?)\s*(?:Followers|followers)', await page.content())
+                if m:
+                    followers = parse_count(m.group(1))
+
+            return handle, {
+                "label": info["label"],
+                "type": info["type"],
+                "followers": followers,
+                "source": "playwright",
+            }
+        except Exception as e:
+            print(f"    ✗ @{handle} 抓取失败: {e}")
+            return handle, {
+                "label": info["label"],
+                "type": info["type"],
+                "followers": None,
+                "source": "playwright",
+                "error": str(e),
+            }
+        finally:
+            await page.close()
+
+
+async def _collect_playwright_async(accounts):
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as pw:
+        if CDP_URL:
+            browser = await pw.chromium.connect_over_cdp(CDP_URL)
+            print(f"  复用浏览器: {CDP_URL}")
+        else:
+            browser = await pw.chromium.launch(headless=True)
+        ctx = await browser.new_context(user_agent=USER_AGENT, viewport={"width": 1280, "height": 800})
+        await ctx.route("**/*", _block_heavy)
+        try:
+            sem = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+            pairs = await asyncio.gather(*(_scrape_account(ctx, sem, h, info) for h, info in accounts.items()))
+        finally:
+            await ctx.close()
+            # 常驻浏览器只断开连接，不关闭
+            if not CDP_URL:
+                await browser.close()
+    return dict(pairs)
+
+
 def collect_playwright():
-    """使用 Playwright 抓取 Twitter/X 页面数据"""
+    """使用 Playwright 并发抓取 Twitter/X 页面数据"""
     try:
-        from playwright.sync_api import sync_playwright
+        import playwright.async_api  # noqa: F401
     except ImportError:
         print("  Playwright 未安装，跳过浏览器自动化")
         print("  安装: pip install playwright && playwright install chromium")
         return None
 
-    results = {}
     try:
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch(headless=True)
-            ctx = browser.new_context(
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-                viewport={"width": 1280, "height": 800},
-            )
-
-            for handle, info in ACCOUNTS.items():
-                print(f"  抓取 @{handle}...")
-                page = ctx.new_page()
-                try:
-                    page.goto(f"https://x.com/{handle}", timeout=20000, wait_until="domcontentloaded")
-                    page.wait_for_timeout(3000)
-
-                    # 获取页面文本，解析粉丝数
-                    text = page.content()
-
-                    # 尝试多种方式解析 followers
-                    followers = None
-
-                    # 方法A: 从 aria-label 或 title 获取
-                    try:
-                        el = page.locator(f'a[href="/{handle}/verified_followers"]').first
-                        if el:
-                            txt = el.inner_text()
-                            followers = parse_count(txt)
-                    except:
-                        pass
-
-                    # 方法B: 从页面文本搜索
-                    if not followers:
-                        m = re.search(r'([\d,.]+[KkMm]?)\s*(?:Followers|followers)', text)
-                        if m:
-                            followers = parse_count(m.group(1))
-
-                    # 获取最近推文互动（可选）
-                    results[handle] = {
-                        "label": info["label"],
-                        "type": info["type"],
-                        "followers": followers,
-                        "source": "playwright",
-                    }
-                except Exception as e:
-                    print(f"    ✗ @{handle} 抓取失败: {e}")
-                    results[handle] = {
-                        "label": info["label"],
-                        "type": info["type"],
-                        "followers": None,
-                        "source": "playwright",
-                        "error": str(e),
-                    }
-                finally:
-                    page.close()
-                time.sleep(2)  # 防止限速
-
-            browser.close()
+        return asyncio.run(_collect_playwright_async(ACCOUNTS))
     except Exception as e:
         print(f"  Playwright 运行错误: {e}")
         return None
 
-    return results
+
+def serve_browser(port=CDP_PORT):
+    """启动常驻 Chromium 供采集复用（Ctrl-C 退出）"""
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as pw:
+        browser = pw.chromium.launch(headless=True, args=[f"--remote-debugging-port={port}"])
+        print(f"✓ 浏览器已启动: export PLAYWRIGHT_CDP_URL=http://127.0.0.1:{port}")
+        try:
+            while browser.is_connected():
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            browser.close()
 
 
 # ============================================================
@@ -213,11 +262,14 @@ def main():
 
     # 尝试 Playwright，失败则用备选
     print("[1] 尝试 Playwright 浏览器自动化...")
+    telemetry.stage("playwright")
     results = collect_playwright()
 
     if not results:
         print("\n[2] Playwright 不可用，使用备选方案...")
+        telemetry.stage("fallback")
         results = collect_socialblade_fallback()
+    telemetry.stage("write")
 
     # 计算增长
     history = load_history(today)
@@ -251,4 +303,13 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if "--browser-server" in sys.argv:
+        serve_browser()
+    else:
+        telemetry.start_run("twitter")
+        ok = False
+        try:
+            main()
+            ok = True
+        finally:
+            telemetry.finish_run(ok=ok)
@@ -9,22 +9,40 @@ X/Twitter 采集 v2 — 6551 OpenTwitter API
 
 API: https://ai.6551.io
 Token: 环境变量 TWITTER_TOKEN
-输出: data/x_cache.json
+输出: data/social.db（tweet_store 推文 + 互动快照，social_search 全文索引）、data/x_cache.json（48/72h 窗口导出）、
+      data/x_cursors.json（增量游标）
+预算: x_planner.py 按每个 job 的历史产出分配每日 credit（--no-plan 跳过规划全量采集）
 """
 
 import json
 import os
-import time
+import sys
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
 
-BASE_DIR = Path(__file__).parent
-OUTPUT_PATH = BASE_DIR / "data" / "x_cache.json"
-API_BASE = "https://ai.6551.io/open"
+import near_dup
+import paths
+import ratelimit
+import relevance
+import social_search
+import telemetry
+import tweet_store
+from x_planner import Planner
+
+DATA_DIR = paths.data_dir()
+OUTPUT_PATH = DATA_DIR / "x_cache.json"
+API_BASE = f"{os.environ.get('BYREAL_MOCK_API', '').rstrip('/') or 'https://ai.6551.io'}/open"
 TOKEN = os.environ.get("TWITTER_TOKEN", "")
 
+# 并发 + 限速：所有模块共用一个令牌桶，按 6551 API 配额设置
+API_RPS = float(os.environ.get("X_API_RPS", "5"))
+API_BURST = int(os.environ.get("X_API_BURST", "5"))
+API_CONCURRENCY = int(os.environ.get("X_API_CONCURRENCY", "8"))
+API_RETRIES_429 = 2
+_bucket = ratelimit.TokenBucket(API_RPS, API_BURST)
+
 # ==================== 账号配置 ====================
 
 ACCOUNTS = {
@@ -97,20 +115,17 @@ COMPETITOR_SEARCHES = [
 # ==================== API 调用 ====================
 
 def api_call(endpoint, payload):
-    """Call 6551 API endpoint"""
-    url = f"{API_BASE}/{endpoint}"
-    data = json.dumps(payload).encode()
+    """Call 6551 API endpoint（经共享令牌桶限速，429 时按 Retry-After 退避重试，见 ratelimit.fetch）"""
     req = urllib.request.Request(
-        url,
-        data=data,
+        f"{API_BASE}/{endpoint}",
+        data=json.dumps(payload).encode(),
         headers={
             "Authorization": f"Bearer {TOKEN}",
             "Content-Type": "application/json",
         },
     )
     try:
-        resp = urllib.request.urlopen(req, timeout=30)
-        return json.loads(resp.read().decode())
+        return json.loads(ratelimit.fetch(_bucket, req, retries=API_RETRIES_429).decode())
     except urllib.error.HTTPError as e:
         body = e.read().decode()[:200]
         print(f"  ✗ API error {e.code}: {body}")
@@ -156,53 +171,107 @@ def is_within_hours(created_at_str, hours=48):
         return True
 
 
+# ==================== 增量游标 ====================
+# 每个账号 / 查询记录最后见过的 tweet id 和时间，下次只取更新的内容：
+#   - user_tweets 没有 since 参数：先用小页探测，全是新推文才拉满 max
+#   - twitter_search 带 sinceDate（日粒度）
+# 新结果与推文库中仍在时间窗内的推文合并，窗口不会因增量拉取而变小。
+
+CURSORS_PATH = DATA_DIR / "x_cursors.json"
+INCREMENTAL_PROBE = 3
+
+
+def load_cursors():
+    if not CURSORS_PATH.exists():
+        return {}
+    try:
+        with open(CURSORS_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cursors(cursors):
+    CURSORS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(CURSORS_PATH, "w") as f:
+        json.dump(cursors, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def tweet_id(raw):
+    """Snowflake id → int（越大越新），无法解析返回 0"""
+    try:
+        return int(raw.get("id") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def update_cursor(cursors, key, raw_tweets):
+    """用本次返回的原始推文推进游标，返回比旧游标新的条数"""
+    cur = cursors.get(key) or {}
+    last_id = int(cur.get("lastId") or 0)
+    newer = [t for t in raw_tweets if tweet_id(t) > last_id]
+    if newer:
+        top = max(newer, key=tweet_id)
+        cursors[key] = {
+            "lastId": str(tweet_id(top)),
+            "lastTs": top.get("createdAt", ""),
+            "updated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+    return len(newer)
+
+
+def since_date(created_at_str):
+    try:
+        return datetime.strptime(created_at_str, "%a %b %d %H:%M:%S %z %Y").strftime("%Y-%m-%d")
+    except (ValueError, TypeError):
+        return None
+
+
+def load_window(conn):
+    """读取推文库中仍在时间窗内的推文（账号 48h，搜索 72h）"""
+    if not conn.execute("SELECT 1 FROM tweets LIMIT 1").fetchone() and OUTPUT_PATH.exists():
+        # 首次使用推文库：导入旧的 x_cache.json
+        try:
+            tweet_store.import_cache(conn, OUTPUT_PATH)
+        except (OSError, ValueError):
+            pass
+    # 包含上次被合并的近似重复，整窗重新聚类
+    return tweet_store.window(conn, hours=72, account_hours=48, collapse=False)
+
+
 # ==================== 采集模块 ====================
+# 四个模块的请求全部展开成 job，统一放进线程池并发执行；
+# 结果按完成顺序流式合并，重复推文按 MODULE_PRIORITY 决定保留哪一份。
 
-def fetch_account_tweets():
-    """Module 1: 关注账号推文采集"""
-    print("\n📡 [1/3] 采集关注账号推文...")
-    all_tweets = []
-    total_cost = 0
-    errors = []
+# KOL search 有互动数据，优先级最高（与旧版合并顺序一致）
+# carried = 上次窗口内保留下来的推文，优先级最低（新数据覆盖旧互动数）
+MODULE_PRIORITY = {"kol_search": 0, "account_tweets": 1, "hot_topics": 2, "competitor_buzz": 3, "carried": 9}
 
-    for handle, config in ACCOUNTS.items():
-        result = api_call("twitter_user_tweets", {
+
+def account_jobs():
+    """Module 1: 关注账号推文采集"""
+    return [{
+        "module": "account_tweets",
+        "key": f"account:{handle}",
+        "endpoint": "twitter_user_tweets",
+        "payload": {
             "username": handle,
             "maxResults": config["max"],
             "product": "Latest",
             "includeReplies": False,
             "includeRetweets": False,
-        })
-
-        if not result:
-            errors.append(f"@{handle}: API call failed")
-            time.sleep(1)
-            continue
-
-        cost = int(result.get("cost", 1))
-        total_cost += cost
-        tweets = result.get("data", []) or []
-
-        recent = [t for t in tweets if is_within_hours(t.get("createdAt"), 48)]
-        for t in recent:
-            all_tweets.append(parse_tweet(t, source_type=config["type"], source_handle=handle))
-
-        print(f"  ✓ @{handle}: {len(recent)}/{len(tweets)} tweets (48h), cost={cost}")
-        time.sleep(0.3)
-
-    print(f"  📊 账号采集完成: {len(all_tweets)} tweets, cost={total_cost}")
-    if errors:
-        print(f"  ⚠️ {len(errors)} errors: {'; '.join(errors)}")
-    return all_tweets, total_cost
+        },
+        "source_type": config["type"],
+        "source_handle": handle,
+        "tag": "",
+        "hours": 48,
+        "label": f"@{handle}",
+    } for handle, config in ACCOUNTS.items()]
 
 
-def fetch_hot_topics():
+def hot_topic_jobs():
     """Module 2: 行业热点关键词搜索"""
-    print("\n🔥 [2/3] 搜索行业热点...")
-    all_tweets = []
-    total_cost = 0
-    seen_ids = set()
-
+    jobs = []
     for q in SEARCH_QUERIES:
         payload = {
             "keywords": q["keywords"],
@@ -213,191 +282,285 @@ def fetch_hot_topics():
         }
         if q.get("lang"):
             payload["lang"] = q["lang"]
+        jobs.append({"module": "hot_topics", "key": f"search:{q['keywords']}|{q.get('lang', '')}",
+                     "endpoint": "twitter_search", "payload": payload,
+                     "source_type": "hot_topic", "source_handle": "", "tag": q.get("tag", ""),
+                     "hours": 72, "label": f"[{q.get('tag', '')}] \"{q['keywords']}\""})
+    return jobs
 
-        result = api_call("twitter_search", payload)
-        if not result:
-            time.sleep(1)
-            continue
-
-        cost = int(result.get("cost", 1)) if isinstance(result, dict) else 1
-        total_cost += cost
-
-        tweets = result.get("data", result) if isinstance(result, dict) else result
-        if not isinstance(tweets, list):
-            tweets = []
-
-        count = 0
-        for t in tweets:
-            tid = t.get("id", "")
-            if tid in seen_ids:
-                continue
-            seen_ids.add(tid)
-            if is_within_hours(t.get("createdAt"), 72):
-                parsed = parse_tweet(t, source_type="hot_topic", tag=q.get("tag", ""))
-                all_tweets.append(parsed)
-                count += 1
-
-        print(f"  ✓ [{q.get('tag','')}] \"{q['keywords']}\": {count} tweets, cost={cost}")
-        time.sleep(0.3)
 
-    print(f"  📊 热点搜索完成: {len(all_tweets)} tweets, cost={total_cost}")
-    return all_tweets, total_cost
-
-
-def fetch_kol_search():
+def kol_search_jobs():
     """Module 2.5: KOL 推文搜索补采（带互动数据）"""
-    print("\n👤 [2.5/3] 搜索 KOL 推文（补采互动数据）...")
-    all_tweets = []
-    total_cost = 0
-    seen_ids = set()
-
-    for q in KOL_SEARCHES:
-        payload = {
+    return [{
+        "module": "kol_search",
+        "key": f"kol:{q['fromUser']}",
+        "endpoint": "twitter_search",
+        "payload": {
             "fromUser": q["fromUser"],
             "maxResults": q.get("maxResults", 5),
             "product": q.get("product", "Latest"),
             "excludeRetweets": True,
-        }
-
-        result = api_call("twitter_search", payload)
-        if not result:
-            time.sleep(1)
-            continue
-
-        cost = int(result.get("cost", 1)) if isinstance(result, dict) else 1
-        total_cost += cost
-
-        tweets = result.get("data", result) if isinstance(result, dict) else result
-        if not isinstance(tweets, list):
-            tweets = []
-
-        count = 0
-        for t in tweets:
-            tid = t.get("id", "")
-            if tid in seen_ids:
-                continue
-            seen_ids.add(tid)
-            if is_within_hours(t.get("createdAt"), 72):
-                parsed = parse_tweet(t, source_type="kol", tag=q.get("tag", ""))
-                all_tweets.append(parsed)
-                count += 1
-
-        print(f"  ✓ @{q['fromUser']}: {count} tweets, cost={cost}")
-        time.sleep(0.3)
-
-    print(f"  📊 KOL 补采完成: {len(all_tweets)} tweets, cost={total_cost}")
-    return all_tweets, total_cost
+        },
+        "source_type": "kol",
+        "source_handle": "",
+        "tag": q.get("tag", ""),
+        "hours": 72,
+        "label": f"@{q['fromUser']}",
+    } for q in KOL_SEARCHES]
 
 
-def fetch_competitor_buzz():
+def competitor_jobs():
     """Module 3: 竞品舆情搜索"""
-    print("\n🏷️ [3/3] 搜索竞品舆情...")
-    all_tweets = []
-    total_cost = 0
-    seen_ids = set()
-
-    for q in COMPETITOR_SEARCHES:
-        payload = {
+    return [{
+        "module": "competitor_buzz",
+        "key": f"competitor:{q['keywords']}",
+        "endpoint": "twitter_search",
+        "payload": {
             "keywords": q["keywords"],
             "maxResults": q.get("maxResults", 10),
             "product": q.get("product", "Top"),
             "minLikes": q.get("minLikes", 0),
             "excludeRetweets": q.get("excludeRetweets", True),
-        }
-
-        result = api_call("twitter_search", payload)
+        },
+        "source_type": "competitor_buzz",
+        "source_handle": "",
+        "tag": q.get("tag", ""),
+        "hours": 72,
+        "label": f"[{q.get('tag', '')}] \"{q['keywords']}\"",
+    } for q in COMPETITOR_SEARCHES]
+
+
+def result_tweets(result):
+    tweets = result.get("data", result) if isinstance(result, dict) else result
+    return tweets if isinstance(tweets, list) else []
+
+
+def result_cost(result):
+    return int(result.get("cost", 1)) if isinstance(result, dict) else 1
+
+
+def run_job(job, cursor=None):
+    """执行单个 job；有游标时只请求游标之后的内容"""
+    payload = dict(job["payload"])
+    last_id = int((cursor or {}).get("lastId") or 0)
+
+    if last_id and job["endpoint"] == "twitter_user_tweets":
+        full = payload["maxResults"]
+        payload["maxResults"] = min(INCREMENTAL_PROBE, full)
+        result = api_call(job["endpoint"], payload)
+        probe = result_tweets(result) if result else []
+        # 探测页满且全部比游标新 → 中间可能还有，拉满一次
+        if probe and payload["maxResults"] < full and len(probe) >= payload["maxResults"] \
+                and min(tweet_id(t) for t in probe) > last_id:
+            payload["maxResults"] = full
+            more = api_call(job["endpoint"], payload)
+            if more:
+                return {"cost": result_cost(result) + result_cost(more), "data": result_tweets(more)}
+        return result
+
+    if last_id and job["endpoint"] == "twitter_search":
+        since = since_date(cursor.get("lastTs"))
+        if since:
+            payload["sinceDate"] = since
+    return api_call(job["endpoint"], payload)
+
+
+def run_jobs(jobs, cursors=None):
+    """并发执行 job，按完成顺序 yield (job, result)"""
+    cursors = cursors or {}
+    with ThreadPoolExecutor(max_workers=API_CONCURRENCY) as pool:
+        futures = {pool.submit(run_job, job, cursors.get(job["key"])): job for job in jobs}
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
+
+
+def job_tweets(job, result):
+    """API 结果 → (cost, 原始推文, 时间窗内的标准化推文)"""
+    tweets = result_tweets(result)
+    recent = [
+        parse_tweet(t, source_type=job["source_type"], source_handle=job["source_handle"], tag=job["tag"])
+        for t in tweets if is_within_hours(t.get("createdAt"), job["hours"])
+    ]
+    return result_cost(result), tweets, recent
+
+
+def engagement(t):
+    return t.get("likes", 0) + t.get("retweets", 0) * 3 + t.get("quotes", 0) * 2
+
+
+class TweetMerger:
+    """流式合并：同一 tweet id 只保留优先级最高（模块优先级, job 顺序）的一份"""
+
+    def __init__(self):
+        self.best = {}        # id -> (rank, tweet)
+        self.no_id = []
+        self.sections = {m: set() for m in MODULE_PRIORITY}
+
+    def add(self, module, order, tweets):
+        rank_base = (MODULE_PRIORITY[module], order)
+        for i, t in enumerate(tweets):
+            tid = t.get("id", "")
+            if not tid:
+                self.no_id.append(((*rank_base, i), t))
+                continue
+            self.sections[module].add(tid)
+            rank = (*rank_base, i)
+            cur = self.best.get(tid)
+            if cur is None or rank < cur[0]:
+                self.best[tid] = (rank, t)
+
+    def result(self):
+        items = list(self.best.values()) + self.no_id
+        # 互动分降序；同分按合并优先级，保证结果与完成顺序无关
+        items.sort(key=lambda x: (-engagement(x[1]), x[0]))
+        return [t for _, t in items]
+
+
+def collect_jobs(jobs, merger=None, cursors=None, planner=None):
+    """执行一组 job 并合并，返回 (merger, 各模块 cost, 错误列表)
+    传入 cursors 时原地推进游标；传入 planner 时记录每个 job 的产出"""
+    merger = merger or TweetMerger()
+    costs = {m: 0 for m in MODULE_PRIORITY}
+    errors = []
+    order = {id(job): i for i, job in enumerate(jobs)}
+    done = []     # (job, cost, 新推文)
+    for job, result in run_jobs(jobs, cursors):
         if not result:
-            time.sleep(1)
+            errors.append(f"{job['label']}: API call failed")
             continue
+        cost, raw, tweets = job_tweets(job, result)
+        costs[job["module"]] += cost
+        merger.add(job["module"], order[id(job)], tweets)
+        last_id = int(((cursors or {}).get(job["key"]) or {}).get("lastId") or 0)
+        fresh = [t for t in tweets if tweet_id(t) > last_id]
+        done.append((job, cost, fresh))
+        if cursors is not None:
+            update_cursor(cursors, job["key"], raw)
+        print(f"  ✓ {job['label']}: {len(tweets)}/{len(raw)} tweets ({job['hours']}h), new={len(fresh)}, cost={cost}")
+
+    if planner is not None:
+        # 独有 = 本轮其它 job 都没拿到的新推文，与完成顺序无关
+        holders = {}
+        for _, _, fresh in done:
+            for t in fresh:
+                holders[t["id"]] = holders.get(t["id"], 0) + 1
+        for job, cost, fresh in done:
+            unique = [t for t in fresh if holders[t["id"]] == 1]
+            planner.record(job, cost, len(fresh), len(unique), sum(engagement(t) for t in unique))
+    return merger, costs, errors
+
+
+def _fetch_module(jobs, module):
+    merger, costs, errors = collect_jobs(jobs)
+    if errors:
+        print(f"  ⚠️ {len(errors)} errors: {'; '.join(errors)}")
+    return merger.result(), costs[module]
 
-        cost = int(result.get("cost", 1)) if isinstance(result, dict) else 1
-        total_cost += cost
 
-        tweets = result.get("data", result) if isinstance(result, dict) else result
-        if not isinstance(tweets, list):
-            tweets = []
+def fetch_account_tweets():
+    """单独运行 Module 1"""
+    return _fetch_module(account_jobs(), "account_tweets")
+
+
+def fetch_hot_topics():
+    """单独运行 Module 2"""
+    return _fetch_module(hot_topic_jobs(), "hot_topics")
 
-        count = 0
-        for t in tweets:
-            tid = t.get("id", "")
-            if tid in seen_ids:
-                continue
-            seen_ids.add(tid)
-            if is_within_hours(t.get("createdAt"), 72):
-                parsed = parse_tweet(t, source_type="competitor_buzz", tag=q.get("tag", ""))
-                all_tweets.append(parsed)
-                count += 1
 
-        print(f"  ✓ [{q.get('tag','')}] \"{q['keywords']}\": {count} tweets, cost={cost}")
-        time.sleep(0.3)
+def fetch_kol_search():
+    """单独运行 Module 2.5"""
+    return _fetch_module(kol_search_jobs(), "kol_search")
+
 
-    print(f"  📊 竞品舆情完成: {len(all_tweets)} tweets, cost={total_cost}")
-    return all_tweets, total_cost
+def fetch_competitor_buzz():
+    """单独运行 Module 3"""
+    return _fetch_module(competitor_jobs(), "competitor_buzz")
 
 
 # ==================== 主流程 ====================
 
-def fetch_all():
+def fetch_all(plan=True):
     """Run all collection modules"""
     if not TOKEN:
         print("❌ TWITTER_TOKEN 未设置")
         return []
 
     print(f"🚀 X/Twitter 采集 v2 启动 — {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-
-    account_tweets, cost1 = fetch_account_tweets()
-    hot_tweets, cost2 = fetch_hot_topics()
-    kol_tweets, cost_kol = fetch_kol_search()
-    competitor_tweets, cost3 = fetch_competitor_buzz()
-
-    # Merge & deduplicate by tweet ID (KOL search overrides account data for same tweet)
-    all_tweets = []
-    seen_ids = set()
-    # KOL search first (has engagement data), then others
-    for t in kol_tweets + account_tweets + hot_tweets + competitor_tweets:
-        tid = t.get("id", "")
-        if tid and tid in seen_ids:
-            continue
-        if tid:
-            seen_ids.add(tid)
-        all_tweets.append(t)
-
-    # Sort by engagement score
-    all_tweets.sort(key=lambda x: (x.get("likes", 0) + x.get("retweets", 0) * 3 + x.get("quotes", 0) * 2), reverse=True)
-
-    total_cost = cost1 + cost2 + cost_kol + cost3
+    print(f"  并发 {API_CONCURRENCY}，限速 {API_RPS:g} req/s (burst {API_BURST})")
+
+    telemetry.stage("x_fetch")
+    cursors = load_cursors()
+    planner = Planner()
+    jobs = kol_search_jobs() + account_jobs() + hot_topic_jobs() + competitor_jobs()
+    if plan:
+        jobs, skipped = planner.plan(jobs)
+        print(f"  规划: 执行 {len(jobs)} 个 job，跳过 {len(skipped)} 个"
+              f"（今日已用 {planner.spent_today()}/{planner.daily_credits} credits）")
+        telemetry.gauge("x_jobs_skipped", len(skipped))
+    merger, costs, errors = collect_jobs(jobs, cursors=cursors, planner=planner)
+
+    telemetry.stage("x_merge")
+    conn = tweet_store.connect()
+    merger.add("carried", 0, load_window(conn))
+    all_tweets = merger.result()
+
+    # 内容近似去重：全部推文带标记入库，输出只保留每簇代表
+    telemetry.stage("x_dedup")
+    marked = near_dup.annotate(all_tweets)
+    all_tweets = [t for t in marked if not t["dup_of"]]
+    near_dups = len(marked) - len(all_tweets)
+    telemetry.gauge("x_near_dups", near_dups)
+
+    # 实体标签：关键词 / 竞品 / 池子 ticker，一次扫描
+    relevance.tag_items(marked, relevance.build())
+    sections = {m: len(ids) for m, ids in merger.sections.items()}
+    total_cost = sum(costs.values())
+    telemetry.count("x_credits", total_cost)
+    telemetry.gauge("x_tweets", len(all_tweets))
+    if errors:
+        print(f"  ⚠️ {len(errors)} errors: {'; '.join(errors)}")
 
     # Build output with metadata
     output = {
         "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
         "total_tweets": len(all_tweets),
         "total_cost": total_cost,
-        "sections": {
-            "account_tweets": len(account_tweets),
-            "kol_search": len(kol_tweets),
-            "hot_topics": len(hot_tweets),
-            "competitor_buzz": len(competitor_tweets),
-        },
+        "sections": sections,
         "tweets": all_tweets,
     }
 
     # Save
+    telemetry.stage("x_store")
+    added, snaps = tweet_store.upsert_tweets(conn, marked)
+    social_search.ensure_schema(conn)
+    social_search.index_tweets(conn, marked)
+    conn.close()
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     with open(OUTPUT_PATH, "w") as f:
         json.dump(output, f, ensure_ascii=False, indent=2)
+    save_cursors(cursors)
+    planner.save()
 
     print(f"\n{'='*50}")
     print(f"✅ 采集完成!")
-    print(f"  📝 账号推文: {len(account_tweets)}")
-    print(f"  👤 KOL 补采: {len(kol_tweets)}")
-    print(f"  🔥 行业热点: {len(hot_tweets)}")
-    print(f"  🏷️ 竞品舆情: {len(competitor_tweets)}")
-    print(f"  📊 总计: {len(all_tweets)} tweets (去重后)")
+    print(f"  📝 账号推文: {sections['account_tweets']}")
+    print(f"  👤 KOL 补采: {sections['kol_search']}")
+    print(f"  🔥 行业热点: {sections['hot_topics']}")
+    print(f"  🏷️ 竞品舆情: {sections['competitor_buzz']}")
+    print(f"  ♻️ 窗口保留: {sections['carried']}")
+    print(f"  📊 总计: {len(all_tweets)} tweets (去重后，合并近似重复 {near_dups} 条)")
     print(f"  💰 API credits: {total_cost}")
+    print(f"  🗄️ 推文库: 新增 {added} 条，互动快照 {snaps} 条 → {tweet_store.DB_PATH}")
     print(f"  💾 保存到: {OUTPUT_PATH}")
 
     return all_tweets
 
 
 if __name__ == "__main__":
-    fetch_all()
+    telemetry.start_run("x_api")
+    ok = False
+    try:
+        fetch_all(plan="--no-plan" not in sys.argv)
+        ok = True
+    finally:
+        telemetry.finish_run(ok=ok)
@@ -1,28 +1,47 @@
 #!/usr/bin/env python3
 """
 X/Twitter 热点采集
-优先读取本地缓存 (data/x_cache.json)，由 Camofox 定期抓取更新
+优先读取本地推文库 (data/social.db，由 collect_x_api.py 写入) 的最近窗口
+（与采集窗口一致：账号时间线 48h，搜索 72h），库不存在时回退到 data/x_cache.json
 """
 
 import json
-from datetime import datetime, timezone
-from pathlib import Path
 
-BASE_DIR = Path(__file__).parent
-X_CACHE = BASE_DIR / "data" / "x_cache.json"
+import paths
+import tweet_store
 
+X_CACHE = paths.data_dir() / "x_cache.json"
+WINDOW_HOURS = 72            # 搜索推文（带 tag）
+ACCOUNT_WINDOW_HOURS = 48    # 账号时间线推文
+MAX_TWEETS = 200    # 写入 summary.json 的上限，看板只展示前几条
 
-def fetch_x_trends():
-    """从本地缓存读取 X 推文数据"""
+
+def fetch_x_trends(hours=WINDOW_HOURS, limit=MAX_TWEETS, account_hours=ACCOUNT_WINDOW_HOURS):
+    """读取时间窗内的推文（账号时间线 account_hours，搜索 hours），按互动分降序"""
     print("  采集 X/Twitter 热点...")
 
+    if tweet_store.DB_PATH.exists():
+        try:
+            conn = tweet_store.connect()
+            try:
+                trends = tweet_store.window(conn, hours=hours, account_hours=account_hours, limit=limit)
+            finally:
+                conn.close()
+            if trends:
+                print(f"  ✓ 从推文库读取 {len(trends)} 条推文 (账号 {account_hours}h / 搜索 {hours}h)")
+                return trends
+        except Exception as e:
+            print(f"  ✗ 推文库读取失败: {e}")
+
     if X_CACHE.exists():
         try:
             with open(X_CACHE) as f:
-                trends = json.load(f)
+                cache = json.load(f)
+            # collect_x_api 输出 {date, sections, tweets}；兼容旧版纯列表
+            trends = cache.get("tweets", []) if isinstance(cache, dict) else cache
             real_count = sum(1 for t in trends if t.get("content") and "暂无" not in t["content"])
             print(f"  ✓ 从缓存读取 {len(trends)} 条推文 ({real_count} 条真实)")
-            return trends
+            return trends[:limit]
         except Exception as e:
             print(f"  ✗ 缓存读取失败: {e}")
 
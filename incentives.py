@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+激励追踪（按到期时间排序的索引）
+process_pools 把每个池子的全部激励记进 pools[].rewards；这里把它们摊平成一张按 endTs 升序的表，
+并行保存 endTs 键，"N 天内到期" / "当前生效" 都是 bisect 区间查询，不再扫描所有池子：
+  - expiring(now, days)   N 天内到期的激励
+  - active(now)           尚未到期的激励（预警引擎的 rewards 作用域直接用它）
+  - spend_by_token(now)   生效中的激励按代币汇总每日发放量 / 美元
+  - calendar(now, days)   未来 N 天按到期日分组的激励日历
+结果写入 summary.json 的 incentives，看板「🎁 激励」展示
+
+用法:
+  python3 incentives.py           # 对 data/latest 快照打印激励日历和代币花费
+"""
+
+import json
+import sys
+import time
+from bisect import bisect_right
+from datetime import datetime
+
+import paths
+
+DATA_DIR = paths.data_dir()
+
+DAY_MS = 86400000
+CALENDAR_DAYS = 30
+
+
+def _float(v):
+    try:
+        return float(v or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_rewards(raw_rewards):
+    """Byreal API 的 rewards → [{symbol, mint, apr, endTs, dailyAmount, price, dailyUsd}]"""
+    out = []
+    for r in raw_rewards or []:
+        token = r.get("token", {})
+        info = token.get("mintInfo", {})
+        amount = _float(r.get("dailyAmountDisplay") or r.get("dailyMaxAmount"))
+        price = _float(token.get("price"))
+        out.append({
+            "symbol": info.get("symbol", ""),
+            "mint": info.get("address", ""),
+            "apr": _float(r.get("apr")),
+            "endTs": int(r.get("endTimestamp") or 0),
+            "dailyAmount": amount,
+            "price": price,
+            "dailyUsd": amount * price,
+        })
+    return out
+
+
+def flatten(pools):
+    """池子 → 激励行（带池子地址 / 名称）；旧快照只有 reward 单条时退回用它"""
+    rows = []
+    for p in pools:
+        rewards = p.get("rewards")
+        if rewards is None:
+            rewards = [p["reward"]] if p.get("reward") else []
+        for r in rewards:
+            # 旧格式 reward 的 endTs / dailyAmount 保留 API 原值（可能是字符串）
+            end_ts = int(_float(r.get("endTs")))
+            if end_ts:
+                rows.append({"addr": p.get("addr", ""), "name": p.get("name", ""), "mint": "", "price": 0.0,
+                             "dailyUsd": 0.0, **r, "endTs": end_ts, "dailyAmount": _float(r.get("dailyAmount"))})
+    return rows
+
+
+class IncentiveIndex:
+    """按 endTs 升序的激励行 + 并行的 endTs 键"""
+
+    def __init__(self, rows):
+        self.rows = sorted(rows, key=lambda r: r["endTs"])
+        self.keys = [r["endTs"] for r in self.rows]
+
+    def between(self, start_ms, end_ms):
+        """start_ms < endTs <= end_ms"""
+        return self.rows[bisect_right(self.keys, start_ms):bisect_right(self.keys, end_ms)]
+
+    def active(self, now_ms):
+        return self.rows[bisect_right(self.keys, now_ms):]
+
+    def expiring(self, now_ms, days):
+        return self.between(now_ms, now_ms + days * DAY_MS)
+
+    def spend_by_token(self, now_ms):
+        """生效中的激励按代币汇总，按每日美元降序"""
+        tokens = {}
+        for r in self.active(now_ms):
+            t = tokens.setdefault(r["symbol"] or r["mint"][:6], {
+                "symbol": r["symbol"] or r["mint"][:6], "pools": 0, "dailyAmount": 0.0, "dailyUsd": 0.0,
+                "nextEndTs": r["endTs"],
+            })
+            t["pools"] += 1
+            t["dailyAmount"] += r["dailyAmount"]
+            t["dailyUsd"] += r["dailyUsd"]
+        return sorted(tokens.values(), key=lambda t: -t["dailyUsd"])
+
+    def calendar(self, now_ms, days=CALENDAR_DAYS):
+        """未来 days 天内到期的激励按日期（本地时区）分组"""
+        out = {}
+        for r in self.expiring(now_ms, days):
+            date = datetime.fromtimestamp(r["endTs"] / 1000).strftime("%Y-%m-%d")
+            day = out.setdefault(date, {"date": date, "dailyUsd": 0.0, "items": []})
+            day["dailyUsd"] += r["dailyUsd"]
+            day["items"].append({"name": r["name"], "symbol": r["symbol"], "dailyUsd": round(r["dailyUsd"], 2)})
+        return list(out.values())
+
+    def summary(self, now_ms, days=CALENDAR_DAYS):
+        """summary.json 的 incentives"""
+        active = self.active(now_ms)
+        return {
+            "active": len(active),
+            "pools": len({r["addr"] for r in active}),
+            "dailyUsd": round(sum(r["dailyUsd"] for r in active), 2),
+            "byToken": [{**t, "dailyAmount": round(t["dailyAmount"], 4), "dailyUsd": round(t["dailyUsd"], 2)}
+                        for t in self.spend_by_token(now_ms)],
+            "calendar": [{**d, "dailyUsd": round(d["dailyUsd"], 2)} for d in self.calendar(now_ms, days)],
+        }
+
+
+def build(pools):
+    return IncentiveIndex(flatten(pools))
+
+
+def main():
+    try:
+        with open(DATA_DIR / "latest" / "summary.json") as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        print("✗ 无法读取 data/latest/summary.json")
+        return 1
+    now_ms = int(time.time() * 1000)
+    t0 = time.perf_counter()
+    index = build(summary.get("pools", []))
+    s = index.summary(now_ms)
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"🎁 {len(index.rows)} 条激励，生效中 {s['active']} 条 / {s['pools']} 个池子，"
+          f"每日 ${s['dailyUsd']:,.0f} ({ms:.1f} ms)\n")
+    for t in s["byToken"]:
+        print(f"  {t['symbol']:<10} {t['pools']:>3} 池  每日 {t['dailyAmount']:>14,.2f}  ≈ ${t['dailyUsd']:>10,.0f}")
+    print()
+    for d in s["calendar"]:
+        print(f"  {d['date']}  " + ", ".join(f"{i['name']} ({i['symbol']})" for i in d["items"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
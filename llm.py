@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+LLM 调用后端（可插拔）
+  LLM_BACKEND=anthropic  Anthropic Messages API（流式读取），默认；
+                         key 取 ANTHROPIC_API_KEY，没有时读 ../byreal-daily/.env
+  LLM_BACKEND=replay     按 (模型, prompt) 哈希回放 data/llm_replay.jsonl 里录制的响应，未录制的返回空串
+  LLM_BACKEND=stub       本地确定性替身，不联网；LLM_STUB_LATENCY_MS 模拟响应延迟（压测 / 基准）
+  LLM_RECORD=1           anthropic 后端把每次成功响应追加到 data/llm_replay.jsonl
+
+每次调用计入 telemetry 计数器：llm_calls / llm_errors / llm_input_tokens / llm_output_tokens /
+llm_seconds / llm_cost_usd
+
+用法:
+  text = llm.complete(prompt, max_tokens=1000, deadline=time.monotonic() + 30)
+  python3 llm.py "prompt ..."      # 用当前后端试调用
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import paths
+import telemetry
+
+BASE_DIR = Path(__file__).parent
+DATA_DIR = paths.data_dir()
+REPLAY_PATH = DATA_DIR / "llm_replay.jsonl"
+
+MODEL = os.environ.get("LLM_MODEL", "claude-sonnet-4-20250514")
+API_URL = "https://api.anthropic.com/v1/messages"
+# 美元 / 百万 token（输入, 输出）
+PRICES = {"claude-sonnet-4-20250514": (3.0, 15.0)}
+
+
+def _api_key():
+    key = os.environ.get("ANTHROPIC_API_KEY", "")
+    if not key:
+        env_path = BASE_DIR.parent / "byreal-daily" / ".env"
+        if env_path.exists():
+            for line in env_path.read_text().splitlines():
+                if line.startswith("ANTHROPIC_API_KEY="):
+                    key = line.split("=", 1)[1].strip()
+                    break
+    return key
+
+
+def prompt_key(prompt, model):
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()[:24]
+
+
+def estimate_tokens(text):
+    """无 usage 时的粗估：中文约 1 字 1 token，其它约 4 字符 1 token"""
+    cjk = len(re.findall("[\u3400-\u9fff]", text or ""))
+    return cjk + (len(text or "") - cjk) // 4
+
+
+# ==================== 后端 ====================
+
+class AnthropicBackend:
+    name = "anthropic"
+
+    def __init__(self, model=MODEL, record=False):
+        self.model = model
+        self.key = _api_key()
+        self.record = record
+        self.lock = threading.Lock()
+
+    def available(self):
+        return bool(self.key)
+
+    def complete(self, prompt, max_tokens, deadline):
+        """返回 (文本, 输入 token, 输出 token)；超过 deadline 抛 TimeoutError"""
+        payload = json.dumps({
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "stream": True,
+            "messages": [{"role": "user", "content": prompt}],
+        }).encode("utf-8")
+        req = urllib.request.Request(
+            API_URL,
+            data=payload,
+            headers={
+                "Content-Type": "application/json",
+                "x-api-key": self.key,
+                "anthropic-version": "2023-06-01",
+            },
+            method="POST",
+        )
+        timeout = 60 if deadline is None else max(1.0, min(60.0, deadline - time.monotonic()))
+        parts, tokens_in, tokens_out = [], 0, 0
+        with telemetry.http(req.full_url) as h, urllib.request.urlopen(req, timeout=timeout) as resp:
+            for line in resp:
+                h.bytes += len(line)
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError("超出时间预算")
+                if not line.startswith(b"data:"):
+                    continue
+                event = json.loads(line[5:])
+                kind = event.get("type")
+                if kind == "content_block_delta":
+                    parts.append(event.get("delta", {}).get("text", ""))
+                elif kind == "message_start":
+                    tokens_in = event.get("message", {}).get("usage", {}).get("input_tokens", 0)
+                elif kind == "message_delta":
+                    tokens_out = event.get("usage", {}).get("output_tokens", tokens_out)
+                elif kind == "error":
+                    raise RuntimeError(event.get("error", {}).get("message", "stream error"))
+        text = "".join(parts)
+        if self.record and text:
+            with self.lock:
+                REPLAY_PATH.parent.mkdir(parents=True, exist_ok=True)
+                with open(REPLAY_PATH, "a") as f:
+                    f.write(json.dumps({"key": prompt_key(prompt, self.model), "model": self.model, "text": text,
+                                        "input_tokens": tokens_in, "output_tokens": tokens_out},
+                                       ensure_ascii=False) + "\n")
+        return text, tokens_in, tokens_out
+
+
+class ReplayBackend:
+    name = "replay"
+
+    def __init__(self, model=MODEL, path=None):
+        self.model = model
+        self.responses = {}
+        try:
+            with open(path or REPLAY_PATH) as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.responses[rec["key"]] = rec
+        except OSError:
+            pass
+
+    def available(self):
+        return bool(self.responses)
+
+    def complete(self, prompt, max_tokens, deadline):
+        rec = self.responses.get(prompt_key(prompt, self.model))
+        if rec is None:
+            telemetry.count("llm_replay_misses")
+            return "", 0, 0
+        return rec["text"], rec.get("input_tokens", 0), rec.get("output_tokens", 0)
+
+
+# 替身按 prompt 内容分派：调用方注册 (标记, 函数)，prompt 含标记时由该函数生成响应
+_stub_responders = []
+
+
+def register_stub(marker, fn):
+    _stub_responders.append((marker, fn))
+
+
+class StubBackend:
+    name = "stub"
+    model = "stub"
+
+    def __init__(self, latency_ms=0):
+        self.latency = latency_ms / 1000
+
+    def available(self):
+        return True
+
+    def complete(self, prompt, max_tokens, deadline):
+        if self.latency:
+            if deadline is not None and time.monotonic() + self.latency > deadline:
+                time.sleep(max(deadline - time.monotonic(), 0))
+                raise TimeoutError("超出时间预算")
+            time.sleep(self.latency)
+        for marker, fn in _stub_responders:
+            if marker in prompt:
+                text = fn(prompt)
+                break
+        else:
+            digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+            text = f"〔stub {digest}〕{prompt.strip().splitlines()[-1][:60] if prompt.strip() else ''}"
+        return text, estimate_tokens(prompt), estimate_tokens(text)
+
+
+def make_backend(name=None):
+    name = name or os.environ.get("LLM_BACKEND", "anthropic")
+    if name == "replay":
+        return ReplayBackend()
+    if name == "stub":
+        return StubBackend(float(os.environ.get("LLM_STUB_LATENCY_MS", "0")))
+    return AnthropicBackend(record=os.environ.get("LLM_RECORD") == "1")
+
+
+_backend = None
+
+
+def backend():
+    global _backend
+    if _backend is None:
+        _backend = make_backend()
+    return _backend
+
+
+def use(name):
+    """切换后端（测试 / 基准 / 命令行 --stub）"""
+    global _backend
+    _backend = make_backend(name)
+    return _backend
+
+
+def available():
+    return backend().available()
+
+
+def model():
+    return backend().model
+
+
+# ==================== 调用入口 ====================
+
+def complete(prompt, max_tokens=1000, deadline=None):
+    """调用当前后端；失败 / 超时返回空串。deadline 为 time.monotonic() 截止时刻"""
+    b = backend()
+    if not b.available():
+        return ""
+    t0 = time.perf_counter()
+    try:
+        text, tokens_in, tokens_out = b.complete(prompt, max_tokens, deadline)
+    except Exception as e:
+        print(f"  [WARN] LLM ({b.name}) 调用失败: {e}")
+        telemetry.count("llm_errors")
+        return ""
+    finally:
+        telemetry.count("llm_calls")
+        telemetry.count("llm_seconds", round(time.perf_counter() - t0, 3))
+    price_in, price_out = PRICES.get(b.model, (0.0, 0.0))
+    telemetry.count("llm_input_tokens", tokens_in)
+    telemetry.count("llm_output_tokens", tokens_out)
+    telemetry.count("llm_cost_usd", round((tokens_in * price_in + tokens_out * price_out) / 1e6, 6))
+    return text
+
+
+def main():
+    prompt = " ".join(a for a in sys.argv[1:] if not a.startswith("--")) or sys.stdin.read()
+    if "--stub" in sys.argv:
+        use("stub")
+    b = backend()
+    print(f"后端: {b.name} / 模型: {b.model} / 可用: {'✓' if b.available() else '✗'}")
+    t0 = time.perf_counter()
+    text = complete(prompt)
+    print(f"({(time.perf_counter() - t0) * 1000:.0f} ms)\n{text}")
+
+
+if __name__ == "__main__":
+    main()
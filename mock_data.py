@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Byreal Dashboard — 合成数据生成器
+为 mock_server.py / 基准测试生成任意规模、结构与真实接口一致的数据：
+  - Byreal 池子列表（分类 / 激励 / K 线）
+  - 6551 推文、Reddit 帖子
+
+用法: python3 mock_data.py --pools 10000 --out /tmp/pools_raw.json
+"""
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# ============================================================
+# 代币样本
+# ============================================================
+PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+
+XSTOCK_SYMBOLS = ["TSLAx", "NVDAx", "AAPLx", "GOOGLx", "AMZNx", "MSTRx", "COINx",
+                  "HOODx", "CRCLx", "SPYx", "QQQx", "METAx", "MSFTx", "NFLXx"]
+GOLD_SYMBOLS = ["XAUt0"]
+MAJOR_SYMBOLS = ["SOL", "WETH", "WBTC"]
+STABLE_SYMBOLS = ["USDC", "USDT", "USD1"]
+MEME_PREFIX = ["Punch", "Lobstar", "Buttcoin", "Capy", "Bonk", "Moo", "Pepe", "Frog",
+               "Goat", "Wif", "Chad", "Mog", "Pnut", "Myro", "Popcat", "Giga"]
+
+# 真实快照中的 category 分布（0 普通 / 16 / 32 xStocks / 64 / 128 / 2）
+CATEGORY_WEIGHTS = [(0, 45), (16, 24), (32, 14), (128, 6), (64, 4), (2, 3)]
+
+TWEET_HANDLES = ["byreal_io", "xStocksFi", "JupiterExchange", "MeteoraAG", "Raydium",
+                 "orca_so", "solana", "toly", "CryptoHayes", "colinwu"]
+TWEET_TEMPLATES = [
+    "{sym} liquidity on Solana just hit a new high, CLMM pools are printing fees",
+    "New {sym}-USDC pool is live with boosted rewards, check it out",
+    "RWA tokenization keeps growing: {sym} volume up {n}% this week",
+    "Solana DEX volume report: {n}M in 24h, {sym} leads the pack",
+    "{sym} 流动性池上线，Solana 生态又一个 DEX 机会",
+    "今天 {sym} 涨了 {n}%，concentrated liquidity 策略表现不错",
+]
+
+
+def _addr(rng):
+    # 只需唯一且长度接近真实地址，不做 base58 编码
+    return f"{rng.getrandbits(176):044x}"
+
+
+def _mint(sym, rng):
+    addr = _addr(rng)
+    return {
+        "mintInfo": {
+            "programId": PROGRAM_ID,
+            "address": addr,
+            "symbol": sym,
+            "name": sym,
+            "decimals": 6,
+            "logoURI": f"https://example.invalid/{sym}.png",
+        },
+        "price": f"{rng.uniform(0.0001, 500):.9g}",
+    }
+
+
+def _kline(px, n, rng, vol=0.02):
+    out = []
+    for _ in range(n):
+        px *= 1 + rng.gauss(0, vol)
+        out.append(f"{max(px, 1e-9):.10g}")
+    return out
+
+
+def _pair(category, i, rng):
+    """按 category 挑选一个看起来真实的交易对"""
+    if category == 32:
+        return XSTOCK_SYMBOLS[i % len(XSTOCK_SYMBOLS)], "USDC"
+    roll = rng.random()
+    if roll < 0.05:
+        return GOLD_SYMBOLS[0], rng.choice(STABLE_SYMBOLS)
+    if roll < 0.10:
+        return rng.choice(STABLE_SYMBOLS[1:]), "USDC"
+    if roll < 0.35:
+        return rng.choice(MAJOR_SYMBOLS), rng.choice(STABLE_SYMBOLS)
+    return f"{rng.choice(MEME_PREFIX)}{i}", rng.choice(["USDC", "SOL"])
+
+
+# ============================================================
+# 池子
+# ============================================================
+def gen_pool(i, rng, now_ms=None):
+    """生成单个与 Byreal pools/info/list 记录结构一致的池子"""
+    now_ms = now_ms or int(time.time() * 1000)
+    cats, weights = zip(*CATEGORY_WEIGHTS)
+    category = rng.choices(cats, weights)[0]
+    base_sym, quote_sym = _pair(category, i, rng)
+    base, quote = _mint(base_sym, rng), _mint(quote_sym, rng)
+
+    # TVL / 交易量呈长尾分布
+    tvl = rng.lognormvariate(9, 2.2)
+    v24 = tvl * rng.lognormvariate(-0.5, 1.3) if rng.random() > 0.15 else 0.0
+    fee_rate = rng.choice([0.0001, 0.0005, 0.0025, 0.01])
+    f24 = v24 * fee_rate
+    px = float(base["price"])
+
+    rewards = []
+    if rng.random() < 0.2:
+        for _ in range(rng.choice([1, 1, 2])):
+            token = _mint(rng.choice(["USDC", "SOL", base_sym, "XAUt0"]), rng)
+            rewards.append({
+                "token": token,
+                "dailyMaxAmount": f"{rng.uniform(10, 5000):.18f}",
+                "dailyAmountDisplay": f"{rng.uniform(10, 5000):.1f}",
+                "endTimestamp": now_ms + int(rng.uniform(-3, 30) * 86400000),
+                "apr": f"{rng.uniform(0.01, 3):.8f}",
+            })
+
+    return {
+        "poolAddress": _addr(rng),
+        "mintA": base,
+        "mintB": quote,
+        "baseMint": base,
+        "quoteMint": quote,
+        "feeRate": {"fixFeeRate": str(int(fee_rate * 1e6))},
+        "category": category,
+        "price": f"{px:.13g}",
+        "priceChange1h": f"{rng.gauss(0, 0.01):.6f}",
+        "priceChange12h": f"{rng.gauss(0, 0.03):.6f}",
+        "priceChange1d": f"{rng.gauss(0, 0.05):.6f}",
+        "priceChange7d": f"{rng.gauss(0, 0.12):.6f}",
+        "tvl": f"{tvl:.18f}",
+        "feeTvl1d": f"{(f24 / tvl if tvl else 0):.9f}",
+        "volumeUsd1h": f"{v24 / 24 * rng.uniform(0.2, 2):.10f}",
+        "volumeUsd24h": f"{v24:.10f}",
+        "volumeUsd1d": f"{v24:.10f}",
+        "volumeUsd7d": f"{v24 * rng.uniform(4, 9):.10f}",
+        "feeUsd24h": f"{f24:.18f}",
+        "feeUsd1d": f"{f24:.18f}",
+        "feeUsd7d": f"{f24 * rng.uniform(4, 9):.18f}",
+        "feeApr24h": f"{(f24 * 365 / tvl if tvl else 0):.9f}",
+        "totalBonus": f"{rng.uniform(0, 5000):.18f}",
+        "openTime": now_ms // 1000 - rng.randint(0, 200) * 86400,
+        "decayFeeFlag": 0,
+        "rewards": rewards,
+        "displayReversed": False,
+        "kline1h": _kline(px, 13, rng, 0.002),
+        "kline12h": _kline(px, 13, rng, 0.01),
+        "kline1d": _kline(px, 25, rng, 0.01),
+        "kline7d": _kline(px, 29, rng, 0.03),
+    }
+
+
+def gen_pools(n, seed=0):
+    """生成 n 个池子（同 seed 结果可复现）"""
+    rng = random.Random(seed)
+    now_ms = int(time.time() * 1000)
+    return [gen_pool(i, rng, now_ms) for i in range(n)]
+
+
+def pools_response(pools, page=1, page_size=500):
+    """按 Byreal API 格式返回一页池子"""
+    page = max(int(page), 1)
+    page_size = max(int(page_size), 1)
+    start = (page - 1) * page_size
+    total = len(pools)
+    return {
+        "retCode": 0,
+        "retMsg": "",
+        "result": {
+            "success": True,
+            "version": "mock",
+            "timestamp": int(time.time() * 1000),
+            "ret_code": 0,
+            "ret_msg": "",
+            "args": None,
+            "data": {
+                "total": total,
+                "pageNum": page,
+                "pageSize": page_size,
+                "records": pools[start:start + page_size],
+                "current": page,
+                "pages": (total + page_size - 1) // page_size,
+            },
+        },
+        "retExtInfo": {},
+        "time": int(time.time() * 1000),
+    }
+
+
+# ============================================================
+# 社交数据
+# ============================================================
+def gen_tweets(n, seed=0, handle=None):
+    """生成 6551 API 格式的原始推文（按时间倒序）"""
+    rng = random.Random(seed)
+    ts = time.time()
+    out = []
+    for i in range(n):
+        h = handle or rng.choice(TWEET_HANDLES)
+        ts -= rng.uniform(600, 7200)
+        text = rng.choice(TWEET_TEMPLATES).format(
+            sym=rng.choice(XSTOCK_SYMBOLS + MAJOR_SYMBOLS + ["Byreal", "Raydium", "Meteora"]),
+            n=rng.randint(2, 80),
+        )
+        out.append({
+            "id": str(1900000000000000000 + int(ts * 1000) * 10 + i % 10),
+            "text": text,
+            "userScreenName": h,
+            "userName": h,
+            "userFollowers": rng.randint(100, 2_000_000),
+            "userVerified": rng.random() < 0.3,
+            "favoriteCount": int(rng.lognormvariate(3, 1.5)),
+            "retweetCount": int(rng.lognormvariate(1.5, 1.3)),
+            "replyCount": int(rng.lognormvariate(1, 1.2)),
+            "quoteCount": int(rng.lognormvariate(0.5, 1)),
+            "viewCount": int(rng.lognormvariate(8, 1.5)),
+            "createdAt": time.strftime("%a %b %d %H:%M:%S +0000 %Y", time.gmtime(ts)),
+            "isQuote": rng.random() < 0.1,
+            "isReply": False,
+            "conversationId": "",
+        })
+    return out
+
+
+def gen_reddit_posts(sub, n, seed=0):
+    """生成 Reddit listing children 格式的帖子"""
+    rng = random.Random(f"{sub}:{seed}")
+    now = time.time()
+    out = []
+    for i in range(n):
+        pid = f"{sub[:3]}{i:05d}"
+        title = rng.choice(TWEET_TEMPLATES).format(sym=rng.choice(MAJOR_SYMBOLS + ["DEX", "Byreal"]), n=rng.randint(2, 80))
+        out.append({"kind": "t3", "data": {
+            "id": pid,
+            "name": f"t3_{pid}",
+            "subreddit": sub,
+            "title": title,
+            "selftext": "",
+            "author": f"user{rng.randint(1, 9999)}",
+            "score": int(rng.lognormvariate(4, 1.5)),
+            "upvote_ratio": round(rng.uniform(0.6, 1), 2),
+            "num_comments": int(rng.lognormvariate(2.5, 1.2)),
+            "permalink": f"/r/{sub}/comments/{pid}/",
+            "created_utc": now - i * 1800,
+            "link_flair_text": rng.choice(["", "Discussion", "News", "DeFi"]),
+        }})
+    return out
+
+
+def main():
+    n = 1000
+    out = None
+    seed = 0
+    args = sys.argv[1:]
+    for i, arg in enumerate(args):
+        if arg == "--pools" and i + 1 < len(args):
+            n = int(args[i + 1])
+        elif arg == "--seed" and i + 1 < len(args):
+            seed = int(args[i + 1])
+        elif arg == "--out" and i + 1 < len(args):
+            out = Path(args[i + 1])
+
+    raw = pools_response(gen_pools(n, seed), page=1, page_size=max(n, 1))
+    if out:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with open(out, "w") as f:
+            json.dump(raw, f, ensure_ascii=False)
+        print(f"✓ {n} pools → {out}")
+    else:
+        json.dump(raw, sys.stdout, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Byreal Dashboard — 本地 Mock API 服务
+在一台机器上模拟所有外部依赖，用于采集器压测和故障演练：
+  Byreal 池子列表（分页） / CoinGecko / alternative.me F&G / DefiLlama
+  6551 Twitter / Reddit hot.json / Lark webhook
+
+用法:
+  python3 mock_server.py --pools 10000 --latency 50 --error-rate 0.05 --rate-429 0.02
+  BYREAL_MOCK_API=http://127.0.0.1:8765 python3 collect.py
+
+  # 启动服务 + 跑一条命令（临时数据目录），结束后打印耗时和请求统计
+  python3 mock_server.py --pools 10000 -- python3 collect.py
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import mock_data
+
+DEFAULT_PORT = 8765
+
+
+# ============================================================
+# 路由 → 响应
+# ============================================================
+class MockState:
+    """服务端共享状态：合成数据 + 故障注入参数 + 请求统计"""
+
+    def __init__(self, pools=500, seed=0, latency_ms=0, jitter_ms=0,
+                 error_rate=0.0, rate_429=0.0, fault_routes=None):
+        self.pools = mock_data.gen_pools(pools, seed)
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.fault_routes = set(fault_routes or [])
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.faults = Counter()
+        self.lark_messages = []
+        self.reddit = {}
+
+    def subreddit(self, sub):
+        """按 subreddit 缓存合成帖子，listing 与 by_id 共用"""
+        with self.lock:
+            if sub not in self.reddit:
+                self.reddit[sub] = mock_data.gen_reddit_posts(sub, 200, self.seed)
+            return self.reddit[sub]
+
+    def fault_for(self, route):
+        """按概率决定本次请求注入的故障：None / 429 / 500"""
+        if self.fault_routes and route not in self.fault_routes:
+            return None
+        with self.lock:
+            roll = self.rng.random()
+        if roll < self.rate_429:
+            return 429
+        if roll < self.rate_429 + self.error_rate:
+            return 500
+        return None
+
+    def delay(self):
+        if self.latency_ms or self.jitter_ms:
+            with self.lock:
+                jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+            time.sleep(max(self.latency_ms + jitter, 0) / 1000)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requests": dict(self.requests),
+                "faults": dict(self.faults),
+                "larkMessages": len(self.lark_messages),
+            }
+
+
+def route_of(path):
+    if path.startswith("/byreal/"):
+        return "byreal"
+    if path.startswith("/api/v3/simple/price"):
+        return "coingecko"
+    if path.startswith("/fng"):
+        return "fng"
+    if path.startswith("/protocol/") or path.startswith("/summary/dexs/"):
+        return "defillama"
+    if path.startswith("/open/"):
+        return "x"
+    if path.startswith("/r/") or path.startswith("/by_id/"):
+        return "reddit"
+    if path.startswith("/lark/"):
+        return "lark"
+    if path == "/_stats":
+        return "stats"
+    return None
+
+
+def handle_get(state, path, qs):
+    if path.startswith("/byreal/"):
+        return mock_data.pools_response(
+            state.pools,
+            page=qs.get("page", ["1"])[0],
+            page_size=qs.get("pageSize", ["500"])[0],
+        )
+
+    if path.startswith("/api/v3/simple/price"):
+        out = {}
+        for i, coin in enumerate(qs.get("ids", ["solana,bitcoin,ethereum"])[0].split(",")):
+            out[coin] = {
+                "usd": [84.2, 68750.0, 1985.5][i % 3],
+                "usd_24h_change": [-3.1, -1.2, 0.8][i % 3],
+                "usd_24h_vol": 2.1e9,
+                "usd_market_cap": 4.7e10,
+            }
+        return out
+
+    if path.startswith("/fng"):
+        return {"name": "Fear and Greed Index",
+                "data": [{"value": "18", "value_classification": "Extreme Fear",
+                          "timestamp": str(int(time.time()))}]}
+
+    if path.startswith("/protocol/"):
+        slug = path.rsplit("/", 1)[-1]
+        rng = random.Random(f"{slug}:{state.seed}")
+        tvl = rng.uniform(1e8, 2e9)
+        return {"name": slug.title(), "currentChainTvls": {"Solana": tvl},
+                "tvl": [{"date": int(time.time()) - 86400 * i, "totalLiquidityUSD": tvl} for i in range(30)]}
+
+    if path.startswith("/summary/dexs/"):
+        slug = path.rsplit("/", 1)[-1]
+        rng = random.Random(f"{slug}:{state.seed}:vol")
+        v = rng.uniform(5e7, 1e9)
+        return {"name": slug.title(), "total24h": v, "total7d": v * 7}
+
+    if path.startswith("/r/"):
+        # /r/<sub>/hot.json?limit=&after=
+        sub = path.split("/")[2]
+        limit = min(int(qs.get("limit", ["25"])[0]), 100)
+        after = qs.get("after", [""])[0]
+        children = state.subreddit(sub)
+        start = 0
+        if after:
+            names = [c["data"]["name"] for c in children]
+            start = names.index(after) + 1 if after in names else len(children)
+        page = children[start:start + limit]
+        nxt = page[-1]["data"]["name"] if page and start + limit < len(children) else None
+        return {"kind": "Listing", "data": {"after": nxt, "dist": len(page), "children": page}}
+
+    if path.startswith("/by_id/"):
+        # /by_id/t3_xxx,t3_yyy.json
+        wanted = set(path[len("/by_id/"):].removesuffix(".json").split(","))
+        with state.lock:
+            listings = list(state.reddit.values())
+        children = [c for posts in listings for c in posts if c["data"]["name"] in wanted]
+        return {"kind": "Listing", "data": {"after": None, "children": children}}
+
+    if path == "/_stats":
+        return state.stats()
+
+    return None
+
+
+def handle_post(state, path, body):
+    if path.startswith("/open/twitter_user_tweets"):
+        handle = body.get("username", "")
+        n = int(body.get("maxResults", 10))
+        return {"code": 0, "cost": 1, "data": mock_data.gen_tweets(n, seed=handle, handle=handle)}
+
+    if path.startswith("/open/twitter_search"):
+        key = body.get("keywords") or body.get("fromUser") or ""
+        n = int(body.get("maxResults", 10))
+        return {"code": 0, "cost": 1, "data": mock_data.gen_tweets(n, seed=key, handle=body.get("fromUser"))}
+
+    if path.startswith("/lark/"):
+        with state.lock:
+            state.lark_messages.append(body)
+        return {"code": 0, "msg": "success"}
+
+    return None
+
+
+# ============================================================
+# HTTP 服务
+# ============================================================
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _reply(self, code, payload, headers=None):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _dispatch(self, method):
+            url = urlparse(self.path)
+            route = route_of(url.path)
+            if route is None:
+                return self._reply(404, {"error": "not found"})
+
+            body = {}
+            if method == "POST":
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw or b"{}")
+                except ValueError:
+                    return self._reply(400, {"error": "bad json"})
+
+            with state.lock:
+                state.requests[route] += 1
+
+            if route != "stats":
+                state.delay()
+                fault = state.fault_for(route)
+                if fault:
+                    with state.lock:
+                        state.faults[f"{route}:{fault}"] += 1
+                    if fault == 429:
+                        return self._reply(429, {"error": "rate limited"}, {"Retry-After": "1"})
+                    return self._reply(500, {"error": "injected failure"})
+
+            if method == "GET":
+                payload = handle_get(state, url.path, parse_qs(url.query))
+            else:
+                payload = handle_post(state, url.path, body)
+            if payload is None:
+                return self._reply(404, {"error": "not found"})
+            self._reply(200, payload)
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+    return Handler
+
+
+def serve(state, host="127.0.0.1", port=DEFAULT_PORT):
+    """后台线程启动服务，返回 (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    args = sys.argv[1:]
+    cmd = []
+    if "--" in args:
+        i = args.index("--")
+        args, cmd = args[:i], args[i + 1:]
+
+    opts = {"pools": 500, "seed": 0, "port": DEFAULT_PORT, "latency": 0, "jitter": 0,
+            "error-rate": 0.0, "rate-429": 0.0, "fault-routes": ""}
+    for i, arg in enumerate(args):
+        key = arg.lstrip("-")
+        if arg.startswith("--") and key in opts and i + 1 < len(args):
+            opts[key] = type(opts[key])(args[i + 1])
+
+    print(f"  生成 {opts['pools']} 个合成池子...")
+    state = MockState(
+        pools=opts["pools"], seed=opts["seed"],
+        latency_ms=opts["latency"], jitter_ms=opts["jitter"],
+        error_rate=opts["error-rate"], rate_429=opts["rate-429"],
+        fault_routes=[r for r in opts["fault-routes"].split(",") if r],
+    )
+    server, base = serve(state, port=opts["port"])
+    print(f"✓ Mock API: {base}")
+    print(f"  BYREAL_MOCK_API={base}  Lark webhook: {base}/lark/hook")
+
+    if not cmd:
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    # 压测模式：临时数据目录，避免覆盖真实 data/
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, BYREAL_MOCK_API=base, BYREAL_DATA_DIR=tmp)
+        env.setdefault("TWITTER_TOKEN", "mock")
+        t0 = time.perf_counter()
+        rc = subprocess.call(cmd, env=env)
+        elapsed = time.perf_counter() - t0
+
+    server.shutdown()
+    stats = state.stats()
+    print(f"\n{'='*50}")
+    print(f"  命令: {' '.join(cmd)}  → exit {rc}")
+    print(f"  耗时: {elapsed:.2f}s")
+    print(f"  请求: {json.dumps(stats['requests'])}")
+    print(f"  注入故障: {json.dumps(stats['faults'])}")
+    sys.exit(rc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+池子日环比涨跌榜
+今天和昨天的池子按 addr 做一次哈希连接（昨天建索引，今天逐个查），得到每个池子的 TVL / 交易量 /
+手续费 / APR 变化，输出 summary.json 的 movers：
+  gainers / losers   TVL 增加 / 减少金额最多的前 TOP_N 个（两天 TVL 都低于 MIN_TVL 的池子不参与）
+  removed            昨天有、今天没有的池子（按昨日 TVL 降序，最多 MAX_REMOVED 个）
+  added / removedTotal / matched   新增数 / 消失总数 / 两天都在的池子数
+昨日索引同时交给预警引擎判断新池，不再另建地址集合
+
+用法:
+  python3 movers.py        # 对 data/latest 与前一天的快照试跑
+"""
+
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+
+import paths
+
+DATA_DIR = paths.data_dir()
+
+TOP_N = 5
+MAX_REMOVED = 10
+MIN_TVL = 10_000
+METRICS = {"tvl": "dTvl", "v24h": "dV24h", "f24h": "dF24h", "apr": "dApr"}   # 字段 → 变化量键
+
+
+def index_pools(pools):
+    """addr → 池子；昨日快照只建一次"""
+    return {p["addr"]: p for p in pools or [] if p.get("addr")}
+
+
+def _delta(p, q):
+    row = {"addr": p["addr"], "name": p.get("name", ""), "tvl": p.get("tvl") or 0}
+    for m, key in METRICS.items():
+        row[key] = (p.get(m) or 0) - (q.get(m) or 0)
+    prev_tvl = q.get("tvl") or 0
+    row["tvlPct"] = row["dTvl"] / prev_tvl if prev_tvl else None
+    return row
+
+
+def compute(pools, prev_index):
+    """today pools × 昨日索引 → movers；prev_index 为 None（昨天没有快照）时返回 None"""
+    if prev_index is None:
+        return None
+    rows, seen, added = [], set(), 0
+    for p in pools:
+        addr = p.get("addr")
+        q = prev_index.get(addr)
+        if q is None:
+            added += bool(addr)
+            continue
+        seen.add(addr)
+        if max(p.get("tvl") or 0, q.get("tvl") or 0) >= MIN_TVL:
+            rows.append(_delta(p, q))
+
+    removed = [q for a, q in prev_index.items() if a not in seen]
+    removed.sort(key=lambda q: -(q.get("tvl") or 0))
+    rows.sort(key=lambda r: r["dTvl"])
+    return {
+        "gainers": [r for r in reversed(rows[-TOP_N:]) if r["dTvl"] > 0],
+        "losers": [r for r in rows[:TOP_N] if r["dTvl"] < 0],
+        "removed": [{"addr": q["addr"], "name": q.get("name", ""), "tvl": q.get("tvl") or 0}
+                    for q in removed[:MAX_REMOVED]],
+        "removedTotal": len(removed),
+        "added": added,
+        "matched": len(seen),
+    }
+
+
+def main():
+    try:
+        with open(DATA_DIR / "latest" / "summary.json") as f:
+            summary = json.load(f)
+        yd = (datetime.strptime(summary["date"], "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
+    except (OSError, ValueError, KeyError):
+        print("✗ 无法读取 data/latest/summary.json")
+        return 1
+    try:
+        with open(DATA_DIR / yd / "summary.json") as f:
+            yesterday = json.load(f)
+    except (OSError, ValueError):
+        print(f"✗ 没有 {yd} 的快照")
+        return 1
+    t0 = time.perf_counter()
+    mv = compute(summary.get("pools", []), index_pools(yesterday.get("pools")))
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"🔀 {summary['date']} vs {yd}: 匹配 {mv['matched']} / 新增 {mv['added']} / 消失 {mv['removedTotal']} ({ms:.1f} ms)\n")
+    for title, key in (("TVL 增加", "gainers"), ("TVL 减少", "losers")):
+        print(f"  {title}:")
+        for r in mv[key]:
+            pct = f" ({r['tvlPct'] * 100:+.1f}%)" if r["tvlPct"] is not None else ""
+            print(f"    {r['name']:<20} {r['dTvl']:>+14,.0f}{pct}  vol {r['dV24h']:>+12,.0f}")
+    for r in mv["removed"]:
+        print(f"  消失: {r['name']} (昨日 TVL {r['tvl']:,.0f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+推文近似去重（SimHash 分块索引 + 特征前缀索引 + 短文本特征集复核）
+collect_x_api 只按 tweet id 去重，转发公告、引用推文、复制粘贴的 KOL 内容会占满热点列表。
+这里按文本内容聚类：
+  - 特征: 英文词 + 相邻词对，中文二元组；去掉链接 / 标点 / 大小写差异
+  - 64 位 SimHash；汉明距离 <= MAX_DISTANCE 直接视为近似重复
+  - 局限: 改一个词会换掉约 3 个特征，短文本里这占了很大比例，SimHash 距离随之变大——
+    10 个词左右的推文改一个词，距离中位数约 10；而两条无关的短推文（大半是 the / to / is 这类常用词）
+    距离也可能低到 4~6。所以短文本单靠 SimHash 阈值分不开：
+    距离在 (MAX_DISTANCE, VERIFY_DISTANCE] 之间的候选对再比较特征集合，
+    对称差 <= MAX_EDIT_FEATURES（约两处改词）且 Jaccard >= MIN_JACCARD 才合并；
+    4~5 个词的超短推文改一个词通常达不到 MIN_JACCARD，不会合并
+  - 只比较两个索引给出的候选对，不做两两比较，候选数随推文数近似线性增长：
+      SimHash 切成 5 块，任取 2 块做键建 10 张表（距离 <= 3 时至少 2 块完全相同，必在某张表同桶）；
+      键约 26 位，常见词让 SimHash 各位有偏向时也不会挤进同一个桶
+      特征前缀索引（prefix filtering，复核用）：特征按出现次数从少到多排序，只索引前 min(n/2, 8) + 2 个，
+      满足复核条件的两条推文必共享一个键（见 prefix_keys）；和 SimHash 距离无关，不靠放宽 SimHash 分桶
+  - 并查集合并成簇，保留互动分最高的一条，记录 dup_count / dup_of
+"""
+
+import hashlib
+import math
+import re
+from functools import lru_cache
+from itertools import combinations
+
+import tweet_store
+from social_search import CJK_RUN
+
+MAX_DISTANCE = 3
+VERIFY_DISTANCE = 12    # 超过 MAX_DISTANCE、不超过此距离的候选用特征集合复核
+MAX_EDIT_FEATURES = 8   # 复核: 特征集合对称差上限（改一个词 ≈ 6）
+MIN_JACCARD = 0.5       # 复核: 特征集合 Jaccard 下限
+BLOCKS = 5              # SimHash 切成 5 块，距离 <= MAX_DISTANCE 时至少 2 块完全相同
+TABLES = list(combinations(range(BLOCKS), BLOCKS - MAX_DISTANCE))   # 10 张表，每张取其中 2 块（约 26 位）做键
+RARE_FEATURE = 4        # 前缀索引: 出现次数不超过此值的特征单独做键，更常见的组成特征对
+MIN_FEATURES = 4        # 特征太少（"gm"、纯链接）不参与去重，避免误合并
+
+URL = re.compile(r"https?://\S+")
+WORD = re.compile(r"[^\W_]+")
+
+# 逐位累加：64 个计数器放在一个大整数的 64 个 24 位槽里，每个特征一次加法完成
+_LANE = 24
+_LANE_MASK = (1 << _LANE) - 1
+_SPREAD = [[sum(1 << (_LANE * (8 * k + j)) for j in range(8) if b >> j & 1) for b in range(256)] for k in range(8)]
+
+
+def features(text):
+    text = URL.sub(" ", (text or "").lower())
+    feats = []
+    for m in CJK_RUN.finditer(text):
+        run = m.group()
+        feats.extend([run] if len(run) == 1 else [run[i:i + 2] for i in range(len(run) - 1)])
+    words = WORD.findall(CJK_RUN.sub(" ", text))
+    feats.extend(words)
+    feats.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return feats
+
+
+@lru_cache(maxsize=1 << 16)
+def _spread(feat):
+    """特征哈希展开到 64 个计数槽（常见词反复出现，缓存后每个特征只剩一次加法）"""
+    digest = hashlib.blake2b(feat.encode("utf-8"), digest_size=8).digest()
+    return sum(_SPREAD[k][b] for k, b in enumerate(digest))
+
+
+def simhash(text, feats=None):
+    """64 位 SimHash；特征不足时返回 None（feats 为已算好的 features(text)）"""
+    feats = features(text) if feats is None else feats
+    if len(feats) < MIN_FEATURES:
+        return None
+    acc = sum(map(_spread, feats))
+    half = len(feats) / 2
+    h = 0
+    for i in range(64):
+        if (acc >> (_LANE * i)) & _LANE_MASK > half:
+            h |= 1 << i
+    return h
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def same_text(a, b):
+    """特征集合复核：对称差小且 Jaccard 够高"""
+    diff = len(a ^ b)
+    return diff <= MAX_EDIT_FEATURES and len(a & b) >= MIN_JACCARD * (len(a & b) + diff)
+
+
+def _table_masks():
+    """每张表选中的块 → 64 位掩码（块宽 13 / 13 / 13 / 13 / 12 位）"""
+    blocks, shift = [], 0
+    for k in range(BLOCKS):
+        bits = 64 // BLOCKS + (k < 64 % BLOCKS)
+        blocks.append(((1 << bits) - 1) << shift)
+        shift += bits
+    return [sum(blocks[k] for k in t) for t in TABLES]
+
+
+TABLE_MASKS = _table_masks()
+
+
+def prefix_keys(feats, df):
+    """前缀索引的键。特征按 (出现次数, 特征) 排序（罕见的在前，全体推文同一顺序），取前 n - 最小重叠 + 2 个：
+    其中出现次数 <= RARE_FEATURE 的特征单独做键，更常见的两两组成特征对做键。
+    复核要求重叠 >= n - MAX_EDIT_FEATURES 且 >= MIN_JACCARD * n（>= 2），两条都满足时前 2 个共同特征
+    都落在双方的前缀里：其中有罕见特征就共享这个键，都常见就共享这个特征对。
+    罕见特征的桶不超过 RARE_FEATURE 条；常见词 / 词对单独出现得再多，凑成同一对的也很少"""
+    n = len(feats)
+    overlap = max(math.ceil(MIN_JACCARD * n), n - MAX_EDIT_FEATURES)
+    head = sorted(feats, key=lambda f: (df[f], f))[:n - overlap + 2]
+    common = [f for f in head if df[f] > RARE_FEATURE]
+    return [f for f in head if df[f] <= RARE_FEATURE] + list(combinations(common, 2))
+
+
+def candidates(hashes, feature_sets=None):
+    """候选对 (i, j)，j < i，每对只出一次
+    hashes 完全相同的直接配对、不进索引（转发 / 复制粘贴最常见）；
+    其余按 SimHash 分块建表，给了 feature_sets 时再按特征前缀建索引"""
+    df = {}
+    if feature_sets is not None:
+        for i, h in enumerate(hashes):
+            if h is not None:
+                for f in feature_sets[i]:
+                    df[f] = df.get(f, 0) + 1
+    tables = [{} for _ in TABLE_MASKS]
+    prefixes = {}
+    exact = {}
+    for i, h in enumerate(hashes):
+        if h is None:
+            continue
+        if h in exact:
+            yield i, exact[h]
+            continue
+        exact[h] = i
+        seen = set()
+        for table, mask in zip(tables, TABLE_MASKS):
+            bucket = table.setdefault(h & mask, [])
+            for j in bucket:
+                if j not in seen:
+                    seen.add(j)
+                    yield i, j
+            bucket.append(i)
+        if feature_sets is None:
+            continue
+        for key in prefix_keys(feature_sets[i], df):
+            bucket = prefixes.setdefault(key, [])
+            for j in bucket:
+                if j not in seen:
+                    seen.add(j)
+                    yield i, j
+            bucket.append(i)
+
+
+def clusters(hashes, max_distance=MAX_DISTANCE, feature_sets=None):
+    """hashes: [int|None] → 并查集根下标列表（None 自成一簇）
+    feature_sets: 与 hashes 对齐的特征集合；给出时距离在 (max_distance, VERIFY_DISTANCE] 的候选对再复核
+    （max_distance 超过 MAX_DISTANCE 时 SimHash 分块索引不再保证召回）"""
+    parent = list(range(len(hashes)))
+    verify = VERIFY_DISTANCE if feature_sets is not None else max_distance
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in candidates(hashes, feature_sets):
+        if find(i) == find(j):
+            continue
+        d = hamming(hashes[i], hashes[j])
+        if d <= max_distance or (d <= verify and same_text(feature_sets[i], feature_sets[j])):
+            parent[find(i)] = find(j)
+    return [find(i) for i in range(len(hashes))]
+
+
+def annotate(tweets, score=tweet_store.engagement, max_distance=MAX_DISTANCE):
+    """返回带去重标记的推文副本（顺序不变）：
+    代表推文 dup_count = 簇内其它条数；其余推文 dup_of = 代表推文 id"""
+    feats = [features(t.get("content", "")) for t in tweets]
+    roots = clusters([simhash(None, f) for f in feats], max_distance, [set(f) for f in feats])
+    best = {}
+    size = {}
+    for i, r in enumerate(roots):
+        size[r] = size.get(r, 0) + 1
+        if r not in best or score(tweets[i]) > score(tweets[best[r]]):
+            best[r] = i
+    out = []
+    for i, (t, r) in enumerate(zip(tweets, roots)):
+        rep = best[r]
+        out.append({**t, "dup_of": None if i == rep else tweets[rep].get("id") or None,
+                    "dup_count": size[r] - 1 if i == rep else 0})
+    return out
+
+
+def collapse(tweets, score=tweet_store.engagement, max_distance=MAX_DISTANCE):
+    """只保留每簇的代表推文"""
+    return [t for t in annotate(tweets, score, max_distance) if not t["dup_of"]]
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Byreal Ops Dashboard — 运维页（采集器性能历史）
+入口: app.py?page=ops（不在主页面出现）
+数据: data/metrics/daily.json（telemetry.py 每次运行后预聚合，不扫描日志）
+"""
+
+import json
+
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+CHART_CONFIG = dict(background="#0a0e17")
+AXIS_CONFIG = dict(labelColor="#94a3b8", titleColor="#94a3b8", gridColor="#1e293b")
+
+
+def _styled(chart, height=280):
+    return chart.properties(height=height).configure_view(strokeWidth=0).configure(**CHART_CONFIG).configure_axis(**AXIS_CONFIG)
+
+
+@st.cache_data(ttl=300)
+def load_daily(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def frames(daily, run):
+    """daily.json → 各图表用的长表"""
+    runs, stages, hosts, sizes = [], [], [], []
+    for date in sorted(daily):
+        d = daily[date].get(run)
+        if not d:
+            continue
+        g = d.get("gauges", {})
+        runs.append({
+            "日期": date,
+            "最长耗时": d["secondsMax"],
+            "平均耗时": d["secondsSum"] / d["runs"] if d["runs"] else 0,
+            "运行次数": d["runs"],
+            "失败": d["failed"],
+            "超预算": d["overBudget"],
+            "预算": d["budget"],
+            "credits": d.get("counters", {}).get("x_credits", 0),
+            "LLM 调用": d.get("counters", {}).get("llm_calls", 0),
+            "LLM tokens": d.get("counters", {}).get("llm_input_tokens", 0) + d.get("counters", {}).get("llm_output_tokens", 0),
+            "LLM 费用": d.get("counters", {}).get("llm_cost_usd", 0),
+            "LLM 秒": d.get("counters", {}).get("llm_seconds", 0),
+            "峰值 RSS (MB)": (g.get("peak_rss_bytes") or 0) / 1e6,
+        })
+        for st_name, sec in d.get("stages", {}).items():
+            stages.append({"日期": date, "阶段": st_name, "秒": sec})
+        for host, h in d.get("hosts", {}).items():
+            hosts.append({"日期": date, "host": host, "p50": h["p50"], "p90": h["p90"],
+                          "请求": h["requests"], "错误": h["errors"]})
+        for key, label in (("pools_raw_bytes", "pools_raw.json"), ("summary_bytes", "summary.json")):
+            if g.get(key):
+                sizes.append({"日期": date, "文件": label, "KB": g[key] / 1024})
+    return _df(runs), _df(stages), _df(hosts), _df(sizes)
+
+
+def _df(rows):
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        df["日期"] = pd.to_datetime(df["日期"])
+    return df
+
+
+def render(data_dir):
+    st.markdown('<div class="section-title">🛠 采集器性能（运维）</div>', unsafe_allow_html=True)
+
+    daily = load_daily(str(data_dir / "metrics" / "daily.json"))
+    if not daily:
+        st.info("📊 暂无遥测数据，采集运行后会生成 data/metrics/daily.json")
+        return
+
+    run_names = sorted({r for d in daily.values() for r in d})
+    run = st.selectbox("运行", run_names, index=run_names.index("collect") if "collect" in run_names else 0)
+    df_runs, df_stages, df_hosts, df_sizes = frames(daily, run)
+    if df_runs.empty:
+        st.info("📊 该运行暂无数据")
+        return
+
+    # ━━━━ 概览 ━━━━
+    last = df_runs.iloc[-1]
+    cols = st.columns(4)
+    cols[0].metric("最近一天最长耗时", f"{last['最长耗时']:.1f}s", f"预算 {last['预算']:.0f}s", delta_color="off")
+    cols[1].metric("超预算天数", int((df_runs["超预算"] > 0).sum()))
+    cols[2].metric("失败运行", int(df_runs["失败"].sum()))
+    cols[3].metric("近 7 天 credits", int(df_runs.tail(7)["credits"].sum()))
+    week = df_runs.tail(7)
+    if week["LLM 调用"].sum():
+        st.caption(f"近 7 天 AI: {int(week['LLM 调用'].sum())} 次调用 · {int(week['LLM tokens'].sum()):,} tokens · "
+                   f"${week['LLM 费用'].sum():.2f} · 累计 {week['LLM 秒'].sum():.0f}s")
+
+    # ━━━━ 总耗时 vs 预算 ━━━━
+    st.markdown('<div class="section-title">⏱ 运行耗时</div>', unsafe_allow_html=True)
+    base = alt.Chart(df_runs).encode(x=alt.X("日期:T", title=""))
+    bars = base.mark_bar(opacity=0.85).encode(
+        y=alt.Y("最长耗时:Q", title="秒"),
+        color=alt.condition(alt.datum["超预算"] > 0, alt.value("#ef4444"), alt.value("#22d3ee")),
+        tooltip=["日期:T", "最长耗时:Q", "平均耗时:Q", "运行次数:Q", "失败:Q"],
+    )
+    budget = base.mark_rule(color="#f59e0b", strokeDash=[4, 2]).encode(y="预算:Q")
+    st.altair_chart(_styled(alt.layer(bars, budget)), use_container_width=True)
+
+    over = df_runs[df_runs["超预算"] > 0]
+    if not over.empty:
+        st.markdown(f'<div class="alert-red">🔴 {len(over)} 天出现超预算运行: '
+                    f'{", ".join(d.strftime("%m-%d") for d in over["日期"])}</div>', unsafe_allow_html=True)
+
+    # ━━━━ 阶段耗时 ━━━━
+    if not df_stages.empty:
+        st.markdown('<div class="section-title">🧱 各阶段耗时</div>', unsafe_allow_html=True)
+        chart = alt.Chart(df_stages).mark_bar().encode(
+            x=alt.X("日期:T", title=""),
+            y=alt.Y("秒:Q", stack=True),
+            color=alt.Color("阶段:N", scale=alt.Scale(scheme="tableau10")),
+            tooltip=["日期:T", "阶段:N", "秒:Q"],
+        )
+        st.altair_chart(_styled(chart), use_container_width=True)
+
+        recent = df_stages[df_stages["日期"] >= df_stages["日期"].max() - pd.Timedelta(days=7)]
+        slow = recent.groupby("阶段")["秒"].agg(["mean", "max"]).sort_values("mean", ascending=False).head(5)
+        st.caption("近 7 天最慢阶段: " + " · ".join(f"**{k}** 平均 {r['mean']:.1f}s / 最长 {r['max']:.1f}s"
+                                              for k, r in slow.iterrows()))
+
+    # ━━━━ Host 延迟 ━━━━
+    if not df_hosts.empty:
+        st.markdown('<div class="section-title">🌐 各 Host 延迟 (p90)</div>', unsafe_allow_html=True)
+        chart = alt.Chart(df_hosts).mark_line(point=True).encode(
+            x=alt.X("日期:T", title=""),
+            y=alt.Y("p90:Q", title="秒"),
+            color=alt.Color("host:N", scale=alt.Scale(scheme="tableau10")),
+            tooltip=["日期:T", "host:N", "p50:Q", "p90:Q", "请求:Q", "错误:Q"],
+        )
+        st.altair_chart(_styled(chart), use_container_width=True)
+
+    # ━━━━ Credits / 快照大小 ━━━━
+    c1, c2 = st.columns(2)
+    with c1:
+        st.markdown('<div class="section-title">💰 X API credits</div>', unsafe_allow_html=True)
+        chart = alt.Chart(df_runs).mark_bar(color="#a78bfa").encode(
+            x=alt.X("日期:T", title=""), y=alt.Y("credits:Q", title=""))
+        st.altair_chart(_styled(chart, 220), use_container_width=True)
+    with c2:
+        st.markdown('<div class="section-title">💾 快照大小</div>', unsafe_allow_html=True)
+        if not df_sizes.empty:
+            chart = alt.Chart(df_sizes).mark_line(point=True).encode(
+                x=alt.X("日期:T", title=""), y=alt.Y("KB:Q", title="KB"),
+                color=alt.Color("文件:N", scale=alt.Scale(scheme="tableau10")))
+            st.altair_chart(_styled(chart, 220), use_container_width=True)
+        else:
+            st.info("📊 暂无快照大小数据")
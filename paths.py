@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+数据目录
+所有模块都从这里取 data/ 的位置：默认仓库下的 data/，BYREAL_DATA_DIR 指向别处时用它
+（mock_server.py / bench_app.py 用临时目录跑完整流程，不碰真实数据）
+"""
+
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+
+
+def data_dir():
+    """每次调用都重新读环境变量（Streamlit 重跑 app.py 时模块不会重新导入）"""
+    return Path(os.environ.get("BYREAL_DATA_DIR") or BASE_DIR / "data")
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+池子业务线分类（规则即数据 + 编译查找表 + 按地址缓存）
+分类规则是一张有序列表（RULES），可以用 pool_rules.json（或 BYREAL_POOL_RULES 指定的文件）整体替换；
+规则编译成集合 / 正则后，按 (category, baseSym, quoteSym) 记忆结果，同一组合只算一次：
+  - 分类顺序: overrides（按 poolAddress 钉死）→ 地址缓存 → 查找表 → 逐条规则，都不命中记 DEFAULT
+  - 地址缓存存 data/pool_classes.json：{addr: [category, baseSym, quoteSym, 业务线]}，带规则指纹；
+    规则或 overrides 变了指纹就变，旧缓存整体作废，下一次运行自动全量重分类
+  - 历史快照用 --reclassify 批量重写（pools / rankings 的 biz、bizLines、xStocks），不用重新采集
+
+规则条目（按顺序匹配，第一条命中的生效）：
+  {"biz": "xStocks", "category": [32]}               池子 category 在列表内
+  {"biz": "xStocks", "suffix": "x", "upperStem": 2}   base 或 quote 以 suffix 结尾，去掉后至少 upperStem 个字符
+                                                      且 str.isupper()（与 Unicode 大小写规则一致，SPYx / NVDAx）
+  {"biz": ..., "pattern": "..."}                      base 或 quote 符号整串匹配正则（re.fullmatch）
+  {"biz": "Gold_RWA", "contains": ["XAUt"]}           base 或 quote 符号包含任一子串
+  {"biz": "Stablecoin", "both": ["USDC", ...]}        base 和 quote 都在集合内
+  {"biz": "Major", "either": ["SOL", ...]}            base 或 quote 在集合内
+pool_rules.json 示例: {"overrides": {"<poolAddress>": "Gold_RWA"}}（只写 overrides 时沿用默认规则）
+
+用法:
+  python3 pool_classifier.py                           # 用当前规则给最新快照分类，列出与快照不同的池子
+  python3 pool_classifier.py --reclassify [--dry-run]  # 用当前规则重写 data/ 下全部历史快照
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import paths
+
+BASE_DIR = Path(__file__).parent
+DATA_DIR = paths.data_dir()
+CONFIG_PATH = Path(os.environ.get("BYREAL_POOL_RULES") or BASE_DIR / "pool_rules.json")
+CACHE_PATH = DATA_DIR / "pool_classes.json"
+
+# xStocks 启发式：符号以 x 结尾、去掉 x 后至少两位且全是大写（SPYx / NVDAx）
+RULES = [
+    {"biz": "xStocks", "category": [32]},
+    {"biz": "xStocks", "suffix": "x", "upperStem": 2},
+    {"biz": "Gold_RWA", "contains": ["XAUt"]},
+    {"biz": "Stablecoin", "both": ["USDC", "USDT", "USD1", "DAI"]},
+    {"biz": "Major", "either": ["SOL", "WETH", "WBTC", "BTC", "ETH", "Wrapped SOL", "Wrapped Ether"]},
+]
+DEFAULT = "Other"
+CACHE_VERSION = 1
+DATE_DIR = re.compile(r"\d{4}-\d{2}-\d{2}$")
+
+
+# ==================== 配置 ====================
+
+def load_config(path=None):
+    """默认规则 + pool_rules.json；文件里给了 rules 就整体替换，overrides 单独合并"""
+    config = {"rules": RULES, "default": DEFAULT, "overrides": {}}
+    path = Path(path or CONFIG_PATH)
+    if path.exists():
+        try:
+            with open(path) as f:
+                config.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"  [WARN] 分类规则读取失败 {path}: {e}")
+    return config
+
+
+def fingerprint(config):
+    return hashlib.sha1(json.dumps(config, sort_keys=True, ensure_ascii=False).encode()).hexdigest()[:12]
+
+
+def compile_rule(rule):
+    """规则条目 → (category, base, quote) 谓词"""
+    if "category" in rule:
+        cats = set(rule["category"])
+        return lambda cat, base, quote: cat in cats
+    if "suffix" in rule:
+        suffix, stem = rule["suffix"], rule.get("upperStem", 1)
+
+        def upper_stem(sym):
+            return sym.endswith(suffix) and len(sym) - len(suffix) >= stem and sym[:-len(suffix)].isupper()
+        return lambda cat, base, quote: upper_stem(base) or upper_stem(quote)
+    if "pattern" in rule:
+        rx = re.compile(rule["pattern"])
+        return lambda cat, base, quote: bool(rx.fullmatch(base) or rx.fullmatch(quote))
+    if "contains" in rule:
+        kws = tuple(rule["contains"])
+        return lambda cat, base, quote: any(kw in base or kw in quote for kw in kws)
+    if "both" in rule:
+        syms = frozenset(rule["both"])
+        return lambda cat, base, quote: base in syms and quote in syms
+    if "either" in rule:
+        syms = frozenset(rule["either"])
+        return lambda cat, base, quote: base in syms or quote in syms
+    raise ValueError(f"未知分类规则: {rule}")
+
+
+# ==================== 分类器 ====================
+
+class Classifier:
+    def __init__(self, config=None, cache=None):
+        config = config or load_config()
+        self.rules = [(compile_rule(r), r["biz"]) for r in config["rules"]]
+        self.default = config.get("default") or DEFAULT
+        self.overrides = config.get("overrides") or {}
+        self.version = fingerprint(config)
+        self.table = {}                 # (category, base, quote) → 业务线
+        self.pools = {}                 # addr → [category, base, quote, 业务线]
+        if cache and cache.get("version") == CACHE_VERSION and cache.get("rules") == self.version:
+            self.pools = cache.get("pools", {})
+        self.hits = 0
+
+    def lookup(self, cat, base, quote):
+        key = (cat, base, quote)
+        biz = self.table.get(key)
+        if biz is None:
+            biz = next((b for pred, b in self.rules if pred(cat, base, quote)), self.default)
+            self.table[key] = biz
+        return biz
+
+    def classify(self, addr, cat, base, quote):
+        biz = self.overrides.get(addr)
+        if biz:
+            return biz
+        entry = self.pools.get(addr)
+        if entry and entry[0] == cat and entry[1] == base and entry[2] == quote:
+            self.hits += 1
+            return entry[3]
+        biz = self.lookup(cat, base, quote)
+        if addr:
+            self.pools[addr] = [cat, base, quote, biz]
+        return biz
+
+    def classify_raw(self, pool):
+        """Byreal API 原始池子记录"""
+        return self.classify(pool.get("poolAddress", ""), pool.get("category", 0),
+                             pool.get("baseMint", {}).get("mintInfo", {}).get("symbol", ""),
+                             pool.get("quoteMint", {}).get("mintInfo", {}).get("symbol", ""))
+
+    def classify_row(self, p):
+        """summary.json 里的池子"""
+        return self.classify(p.get("addr", ""), p.get("cat", 0), p.get("baseSym", ""), p.get("quoteSym", ""))
+
+    def save(self, path=None):
+        path = Path(path or CACHE_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"version": CACHE_VERSION, "rules": self.version, "pools": self.pools},
+                      f, ensure_ascii=False, separators=(",", ":"))
+
+
+def load(config=None):
+    """规则 + 地址缓存（规则指纹不一致时缓存作废）"""
+    try:
+        with open(CACHE_PATH) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = None
+    return Classifier(config, cache)
+
+
+# ==================== 历史重分类 ====================
+
+def apply(summary, clf):
+    """用分类器重写一个快照的 biz / bizLines / xStocks，返回改了业务线的池子数"""
+    pools = summary.get("pools", [])
+    changed, by_addr = 0, {}
+    biz = {}
+    for p in pools:
+        line = clf.classify_row(p)
+        if p.get("biz") != line:
+            changed += 1
+            p["biz"] = line
+        by_addr[p.get("addr")] = line
+        b = biz.setdefault(line, {"tvl": 0, "vol24h": 0, "fee24h": 0, "count": 0})
+        b["tvl"] += p.get("tvl") or 0
+        b["vol24h"] += p.get("v24h") or 0
+        b["fee24h"] += p.get("f24h") or 0
+        b["count"] += 1
+    if not changed:
+        return 0
+    for rows in summary.get("rankings", {}).values():
+        for r in rows:
+            r["biz"] = by_addr.get(r.get("addr"), r.get("biz"))
+    summary["bizLines"] = biz
+    summary["xStocks"] = sorted([p for p in pools if p["biz"] == "xStocks"], key=lambda x: x["tvl"], reverse=True)
+    return changed
+
+
+def reclassify_history(clf, dry_run=False):
+    """→ [(日期, 改动池子数)]；latest 是复制出来的目录（不是软链接）时一并重写"""
+    out = []
+    dirs = sorted(d for d in DATA_DIR.iterdir() if DATE_DIR.match(d.name)) if DATA_DIR.exists() else []
+    latest = DATA_DIR / "latest"
+    if latest.is_dir() and not latest.is_symlink():
+        dirs.append(latest)
+    for d in dirs:
+        path = d / "summary.json"
+        try:
+            with open(path) as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            continue
+        changed = apply(summary, clf)
+        out.append((d.name, changed))
+        if changed and not dry_run:
+            with open(path, "w") as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+    return out
+
+
+# ==================== 命令行 ====================
+
+def main():
+    clf = load()
+    if "--reclassify" in sys.argv:
+        dry_run = "--dry-run" in sys.argv
+        t0 = time.perf_counter()
+        results = reclassify_history(clf, dry_run)
+        ms = (time.perf_counter() - t0) * 1000
+        for date, changed in results:
+            if changed:
+                print(f"  {date}: {changed} 个池子改了业务线")
+        total = sum(c for _, c in results)
+        verb = "将改写" if dry_run else "已改写"
+        print(f"✓ {len(results)} 个快照，{verb} {sum(1 for _, c in results if c)} 个（{total} 个池子，规则 {clf.version}，"
+              f"{ms:.0f} ms）")
+        if total and not dry_run:
+            print("  提示: 池子注册表里的业务线用 python3 pool_registry.py --rebuild 同步")
+        if not dry_run:
+            clf.save()
+        return 0
+
+    try:
+        with open(DATA_DIR / "latest" / "summary.json") as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        print("✗ 无法读取 data/latest/summary.json")
+        return 1
+    pools = summary.get("pools", [])
+    before = {p.get("addr"): p.get("biz") for p in pools}
+    t0 = time.perf_counter()
+    after = {p.get("addr"): clf.classify_row(p) for p in pools}
+    ms = (time.perf_counter() - t0) * 1000
+    counts = {}
+    for line in after.values():
+        counts[line] = counts.get(line, 0) + 1
+    print(f"🏷  {len(pools)} 个池子：地址缓存命中 {clf.hits}，查找表 {len(clf.table)} 个 (category, base, quote) 组合，"
+          f"overrides {len(clf.overrides)} 条，规则 {clf.version} ({ms:.1f} ms)")
+    print("  " + ", ".join(f"{k} {v}" for k, v in sorted(counts.items(), key=lambda kv: -kv[1])))
+    diff = [(p.get("name", ""), before[p.get("addr")], after[p.get("addr")]) for p in pools
+            if before[p.get("addr")] != after[p.get("addr")]]
+    for name, old, new in diff:
+        print(f"  {name}: {old} → {new}")
+    if diff:
+        print(f"\n  {len(diff)} 个池子与快照不同，python3 pool_classifier.py --reclassify 重写历史")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
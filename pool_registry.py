@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+池子注册表 + 新池 cohort
+每个 poolAddress 记一条：名称 / 业务线 / 首次出现日期 / 最近出现日期，以及上线后前 CURVE_DAYS 天的
+每日 [第几天, TVL, 24h 交易量]。存 data/pool_registry.json，按地址 O(1) 查询，每次运行增量更新：
+  - 新池 = 首次出现日期是今天的池子；data/ 缺几天的快照也不会把老池子重新当成新池
+  - 同一天重复运行结果不变（当天的曲线点覆盖写）
+  - 注册表为空时先用历史快照重建（只发生一次；缺 summary.json 的日子用 pools_raw.json 补上）；第一个快照里的池子上线日期未知，记为基线，不算新池、不进 cohort
+  - cohort: 按首次出现的周（周一）分组，看每组池子上线第 0 / 7 / 14 / 30 天的 TVL 和交易量合计
+
+用法:
+  python3 pool_registry.py              # 注册表概况 + 最近的 cohort
+  python3 pool_registry.py --rebuild    # 按日期重放 data/ 下全部快照重建注册表
+"""
+
+import json
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+import paths
+
+DATA_DIR = paths.data_dir()
+REGISTRY_PATH = DATA_DIR / "pool_registry.json"
+
+CURVE_DAYS = 30
+CHECKPOINTS = (0, 7, 14, 30)
+COHORT_WEEKS = 8        # summary.json 里保留最近几周的 cohort
+REGISTRY_VERSION = 1
+DATE_DIR = re.compile(r"\d{4}-\d{2}-\d{2}$")
+
+
+def _days_between(a, b):
+    return (datetime.strptime(b, "%Y-%m-%d") - datetime.strptime(a, "%Y-%m-%d")).days
+
+
+def week_of(date):
+    d = datetime.strptime(date, "%Y-%m-%d")
+    return (d - timedelta(days=d.weekday())).strftime("%Y-%m-%d")
+
+
+# ==================== 注册表 ====================
+
+def empty():
+    return {"version": REGISTRY_VERSION, "updated": None, "pools": {}}
+
+
+def load():
+    try:
+        with open(REGISTRY_PATH) as f:
+            reg = json.load(f)
+        if reg.get("version") == REGISTRY_VERSION:
+            return reg
+    except (OSError, ValueError):
+        pass
+    return empty()
+
+
+def save(reg):
+    REGISTRY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(REGISTRY_PATH, "w") as f:
+        json.dump(reg, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def update(reg, pools, today, baseline=False):
+    """用今天的池子更新注册表，返回今天首次出现的地址集合
+    baseline=True：注册表的第一个快照，这些池子上线日期未知，不算新池、不进 cohort"""
+    entries = reg["pools"]
+    new = set()
+    for p in pools:
+        addr = p.get("addr")
+        if not addr:
+            continue
+        e = entries.get(addr)
+        if e is None:
+            e = entries[addr] = {"first": today, "curve": []}
+            if baseline:
+                e["baseline"] = True
+        e.update(name=p.get("name", ""), biz=p.get("biz", ""), last=max(e.get("last") or today, today))
+        if e["first"] == today and not e.get("baseline"):
+            new.add(addr)
+        age = _days_between(e["first"], today)
+        if 0 <= age <= CURVE_DAYS:
+            point = [age, round(p.get("tvl") or 0, 2), round(p.get("v24h") or 0, 2)]
+            if e["curve"] and e["curve"][-1][0] == age:
+                e["curve"][-1] = point
+            elif not e["curve"] or e["curve"][-1][0] < age:
+                e["curve"].append(point)
+    reg["updated"] = max(reg.get("updated") or today, today)
+    return new
+
+
+def history_days():
+    return sorted(d.name for d in DATA_DIR.iterdir() if DATE_DIR.match(d.name)) if DATA_DIR.exists() else []
+
+
+def load_snapshot(date):
+    """某天的快照：优先 summary.json；没有 summary（采集中途失败的日子）时用 pools_raw.json 现场 process_pools，
+    行情取当天的 market.json → (summary, 来源)；两个都读不到时返回 (None, None)"""
+    day = DATA_DIR / date
+    try:
+        with open(day / "summary.json") as f:
+            return json.load(f), "summary"
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(day / "pools_raw.json") as f:
+            raw = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    import collect   # 延迟导入：collect 本身依赖本模块
+    summary = {"date": date, **collect.process_pools(raw)}
+    try:
+        with open(day / "market.json") as f:
+            summary["market"] = json.load(f)
+    except (OSError, ValueError):
+        pass
+    return summary, "raw"
+
+
+def load_day(date):
+    """某天的池子 → (池子列表, 来源)，见 load_snapshot"""
+    summary, source = load_snapshot(date)
+    return (None if summary is None else summary.get("pools", [])), source
+
+
+def rebuild(until=None):
+    """按日期重放 data/ 下的快照（until 之前，不含）重建注册表"""
+    reg = empty()
+    count, from_raw, skipped = 0, [], []
+    for date in history_days():
+        if until and date >= until:
+            break
+        pools, source = load_day(date)
+        if pools is None:
+            skipped.append(date)
+            continue
+        if source == "raw":
+            from_raw.append(date)
+        update(reg, pools, date, baseline=count == 0)
+        count += 1
+    if from_raw:
+        print(f"  {len(from_raw)} 天没有 summary.json，改用 pools_raw.json: {', '.join(from_raw)}")
+    if skipped:
+        print(f"  [WARN] {len(skipped)} 天没有可读的快照，已跳过: {', '.join(skipped)}")
+    return reg, count
+
+
+def record(pools, today):
+    """collect.py 入口：更新注册表并保存，返回 (注册表, 今天的新池地址集合)"""
+    reg = load()
+    if not reg["pools"]:
+        reg, count = rebuild(until=today)
+        if count:
+            print(f"  ✓ 池子注册表从 {count} 个历史快照重建（{len(reg['pools'])} 个池子）")
+        else:
+            # 没有任何历史：今天作为基线，不把全部池子当新池
+            update(reg, pools, today, baseline=True)
+    new = update(reg, pools, today)
+    try:
+        save(reg)
+    except OSError as e:
+        print(f"  [WARN] 池子注册表写入失败: {e}")
+    return reg, new
+
+
+# ==================== cohort ====================
+
+def _value_at(e, day, col):
+    """上线第 day 天（或之前最近一次）的取值；那天之前已经下线的池子记 0"""
+    if _days_between(e["first"], e["last"]) < day:
+        return 0
+    val = None
+    for point in e["curve"]:
+        if point[0] > day:
+            break
+        val = point[col]
+    return val or 0
+
+
+def cohorts(reg, today, weeks=None):
+    """按上线周分组 → [{week, pools, biz, tvl: {天: 合计}, vol: {天: 合计}}]，新的在前
+    某个检查点还没到（组内最晚上线的池子不满该天数）时不给值"""
+    groups = {}
+    for e in reg["pools"].values():
+        if e.get("baseline"):
+            continue
+        groups.setdefault(week_of(e["first"]), []).append(e)
+    out = []
+    for week in sorted(groups, reverse=True)[:weeks]:
+        members = groups[week]
+        age = _days_between(max(e["first"] for e in members), today)
+        biz = {}
+        for e in members:
+            biz[e.get("biz") or "Other"] = biz.get(e.get("biz") or "Other", 0) + 1
+        out.append({
+            "week": week,
+            "pools": len(members),
+            "biz": biz,
+            "tvl": {str(d): round(sum(_value_at(e, d, 1) for e in members)) for d in CHECKPOINTS if d <= age},
+            "vol": {str(d): round(sum(_value_at(e, d, 2) for e in members)) for d in CHECKPOINTS if d <= age},
+        })
+    return out
+
+
+# ==================== 命令行 ====================
+
+def _fmt(v):
+    return f"${v / 1e6:.2f}M" if v >= 1e6 else f"${v / 1e3:.1f}K" if v >= 1e3 else f"${v:.0f}"
+
+
+def main():
+    if "--rebuild" in sys.argv:
+        t0 = time.perf_counter()
+        reg, count = rebuild()
+        save(reg)
+        print(f"✓ 重放 {count} 个快照 → {len(reg['pools'])} 个池子 → {REGISTRY_PATH} "
+              f"({(time.perf_counter() - t0) * 1000:.0f} ms)")
+        return 0
+    reg = load()
+    if not reg["pools"]:
+        print("✗ 注册表为空，先运行 python3 pool_registry.py --rebuild")
+        return 1
+    today = reg["updated"]
+    active = sum(1 for e in reg["pools"].values() if e.get("last") == today)
+    print(f"🗂  {len(reg['pools'])} 个池子（{today} 在线 {active} 个）\n")
+    print(f"  {'上线周':<7} {'池子':>3}  " + "  ".join(f"{'D' + str(d) + ' TVL':>10} {'Vol':>9}" for d in CHECKPOINTS))
+    for c in cohorts(reg, today, COHORT_WEEKS):
+        cells = "  ".join(f"{_fmt(c['tvl'][str(d)]):>10} {_fmt(c['vol'][str(d)]):>9}" if str(d) in c["tvl"]
+                          else f"{'—':>10} {'—':>9}" for d in CHECKPOINTS)
+        print(f"  {c['week']:<10} {c['pools']:>5}  {cells}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
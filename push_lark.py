@@ -9,10 +9,10 @@ import json
 import os
 import sys
 import urllib.request
-from pathlib import Path
 
-BASE_DIR = Path(__file__).parent
-SUMMARY_PATH = BASE_DIR / "data" / "latest" / "summary.json"
+import paths
+
+SUMMARY_PATH = paths.data_dir() / "latest" / "summary.json"
 
 # 从环境变量或命令行获取 webhook
 LARK_WEBHOOK = os.environ.get("LARK_WEBHOOK", "")
@@ -77,6 +77,19 @@ def build_message(data):
             chg_str = f"{'▲' if s['pc1d']>=0 else '▼'}{abs(s['pc1d'])*100:.1f}%" if s.get("pc1d") else ""
             lines.append(f"  {s['name']}: TVL {fmt(s['tvl'])} | Vol {fmt(s['v24h'])} | ${s['px']:.2f} {chg_str}")
 
+    # 池子日环比
+    mv = data.get("movers") or {}
+    if mv.get("gainers") or mv.get("losers") or mv.get("removed"):
+        lines += ["", "━━━━ 池子日环比 ━━━━"]
+        for title, key in (("📈 TVL 增加", "gainers"), ("📉 TVL 减少", "losers")):
+            rows = mv.get(key, [])
+            if rows:
+                lines.append(f"  {title}: " + " | ".join(
+                    f"{r['name']} {'+' if r['dTvl'] >= 0 else '-'}{fmt(abs(r['dTvl']))}" for r in rows[:3]))
+        if mv.get("removed"):
+            lines.append(f"  ❌ 消失 {mv.get('removedTotal', len(mv['removed']))} 个: "
+                         + ", ".join(r["name"] for r in mv["removed"][:5]))
+
     # 竞品
     comps = data.get("competitors", {})
     if comps:
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+线程安全的令牌桶限速器 + 限速 HTTP 请求
+多个采集线程共享一个桶：平均速率 rate 次/秒，允许 capacity 次突发。
+fetch() 是 6551 X API / Reddit 共用的请求循环：每次请求先拿令牌，429 时按 Retry-After 清空共享桶、
+所有线程一起退避后重试。
+"""
+
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import telemetry
+
+MAX_RETRY_AFTER = 10    # Retry-After 上限（秒），防止服务端给一个很大的值把整次采集卡住
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        if not rate or float(rate) <= 0:
+            raise ValueError(f"令牌桶速率必须大于 0: {rate!r}")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, n=1):
+        """阻塞直到拿到 n 个令牌，返回等待秒数"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return waited
+                wait = (n - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def penalize(self, seconds):
+        """服务端返回 429 时清空令牌，让所有线程一起退避"""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+def retry_after(err, default=1.0):
+    """429 响应的 Retry-After（秒，最多 MAX_RETRY_AFTER）；缺失或不是数字时用 default"""
+    try:
+        return min(float(err.headers.get("Retry-After") or default), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return default
+
+
+def fetch(bucket, req, retries=2, timeout=30):
+    """经 bucket 限速发送 urllib 请求，返回响应体 bytes
+    429 时退避重试最多 retries 次；重试耗尽的 429 和其它 HTTP / 网络错误原样抛出"""
+    for attempt in range(retries + 1):
+        bucket.acquire()
+        try:
+            with telemetry.http(req.full_url) as h, urllib.request.urlopen(req, timeout=timeout) as resp:
+                body = resp.read()
+                h.bytes = len(body)
+            return body
+        except urllib.error.HTTPError as e:
+            if e.code == 429 and attempt < retries:
+                bucket.penalize(retry_after(e))
+                continue
+            raise
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+社媒相关性引擎（Aho-Corasick 多模式匹配）
+把 Byreal 关键词、池子 ticker（最新快照里所有 baseSym / quoteSym，含 xStocks）和竞品名
+编译成一个自动机，一次扫描给推文 / 帖子打上命中的实体标签：
+  keyword:<kw>       子串匹配，大小写不敏感（关键词见 relevance.BYREAL_KEYWORDS）
+  competitor:<slug>  整词匹配，大小写不敏感
+  ticker:<SYM>       "$SYM" 大小写不敏感；裸写 SYM 需整词且大小写一致
+                     （只对 >= 3 个字符且含大写的 symbol 生效，避免 "gas"、"fish" 之类误命中）
+
+用法:
+  engine = relevance.build(pools)        # pools 省略时读取 data/latest/summary.json
+  engine.tag("NVDAx 流动性上线 Raydium")  # → ["competitor:raydium", "ticker:NVDAx"]
+  python3 relevance.py "text ..."         # 命令行试匹配
+"""
+
+import json
+import sys
+from collections import deque
+
+import paths
+
+DATA_DIR = paths.data_dir()
+
+BYREAL_KEYWORDS = ["byreal", "solana", "dex"]
+COMPETITOR_NAMES = {
+    "raydium": ["raydium"],
+    "meteora": ["meteora"],
+    "orca": ["orca", "orca_so"],
+    "pumpswap": ["pumpswap", "pump swap"],
+    "jupiter": ["jupiter", "jupiterexchange"],
+    "uniswap": ["uniswap", "unichain"],
+}
+MIN_BARE_TICKER = 3
+
+
+def _is_word(ch):
+    return ch.isalnum() or ch == "_"
+
+
+class Engine:
+    """Aho-Corasick 自动机；模式统一小写入树，大小写 / 整词约束在命中时校验"""
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        self.built = False
+        self.size = 0
+
+    def add(self, pattern, entity, boundary=False, case=False):
+        node = 0
+        for ch in pattern.lower():
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            node = nxt
+        self.out[node].append((len(pattern), entity, boundary, pattern if case else None))
+        self.built = False
+        self.size += 1
+        return self
+
+    def build(self):
+        """BFS 计算失败指针，输出沿失败链合并"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[child] = self.goto[f].get(ch, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+                queue.append(child)
+        self.built = True
+        return self
+
+    def scan(self, text):
+        """返回 [(entity, start, end)]"""
+        if not self.built:
+            self.build()
+        goto, fail, out = self.goto, self.fail, self.out
+        hits = []
+        node = 0
+        lower = text.lower()
+        if len(lower) != len(text):
+            # 个别字符小写后变长（如 "İ"），逐字符处理保持下标对齐
+            lower = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+        for i, ch in enumerate(lower):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            for length, entity, boundary, exact in out[node]:
+                start = i - length + 1
+                if boundary and ((start > 0 and _is_word(text[start - 1]))
+                                 or (i + 1 < len(text) and _is_word(text[i + 1]))):
+                    continue
+                if exact is not None and text[start:i + 1] != exact:
+                    continue
+                hits.append((entity, start, i + 1))
+        return hits
+
+    def tag(self, *texts):
+        """多段文本的命中实体（去重排序）"""
+        found = set()
+        for text in texts:
+            if text:
+                found.update(entity for entity, _, _ in self.scan(text))
+        return sorted(found)
+
+
+def load_pools():
+    try:
+        with open(DATA_DIR / "latest" / "summary.json") as f:
+            return json.load(f).get("pools", [])
+    except (OSError, ValueError):
+        return []
+
+
+def build(pools=None, keywords=BYREAL_KEYWORDS, competitors=COMPETITOR_NAMES):
+    engine = Engine()
+    for kw in keywords:
+        engine.add(kw, f"keyword:{kw}")
+    for slug, names in competitors.items():
+        for name in names:
+            engine.add(name, f"competitor:{slug}", boundary=True)
+    symbols = set()
+    for p in load_pools() if pools is None else pools:
+        symbols.update(s for s in (p.get("baseSym"), p.get("quoteSym")) if s)
+    for sym in sorted(symbols):
+        engine.add(f"${sym}", f"ticker:{sym}", boundary=True)
+        if len(sym) >= MIN_BARE_TICKER and sym != sym.lower():
+            engine.add(sym, f"ticker:{sym}", boundary=True, case=True)
+    return engine.build()
+
+
+def tag_items(items, engine, fields=("content",)):
+    """原地给一组推文 / 帖子加 entities 字段"""
+    for item in items:
+        item["entities"] = engine.tag(*(item.get(f, "") for f in fields))
+    return items
+
+
+def is_relevant(entities):
+    return any(e.startswith("keyword:") for e in entities)
+
+
+def main():
+    engine = build()
+    text = " ".join(sys.argv[1:]) or sys.stdin.read()
+    print(f"自动机: {engine.size} 个模式 / {len(engine.goto)} 个节点")
+    for entity, start, end in engine.scan(text):
+        print(f"  {entity:<28} {text[start:end]!r} @{start}")
+
+
+if __name__ == "__main__":
+    main()
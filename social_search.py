@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+社媒全文检索（SQLite FTS5）
+推文（collect_x_api）和 Reddit 帖子（collect_reddit）采集时写入 data/social.db：
+  social_docs  元数据（来源 / 作者 / 原文 / 链接 / 时间 / 互动分）
+  social_fts   FTS5 倒排索引，rowid 与 social_docs 对应
+
+中文没有空格分词，unicode61 会把整段汉字当成一个 token。写入和查询前统一做预分词：
+连续的 CJK 字符拆成重叠二元组（"流动性" → "流动 动性"），查询词按同样方式拆成短语匹配。
+
+用法:
+  python3 social_search.py xStocks               # 命令行检索
+  python3 social_search.py "流动性 Raydium" --days 7
+  python3 social_search.py --rebuild             # 从推文库重建推文索引
+"""
+
+import re
+import sqlite3
+import sys
+import time
+
+import tweet_store
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS social_docs (
+    id          INTEGER PRIMARY KEY,
+    source      TEXT NOT NULL,
+    ext_id      TEXT NOT NULL,
+    author      TEXT,
+    channel     TEXT,
+    title       TEXT,
+    text        TEXT,
+    url         TEXT,
+    created_at  INTEGER NOT NULL,
+    engagement  INTEGER DEFAULT 0,
+    UNIQUE (source, ext_id)
+);
+CREATE INDEX IF NOT EXISTS idx_social_docs_created ON social_docs(created_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS social_fts USING fts5(body, tokenize = 'unicode61 remove_diacritics 2');
+"""
+
+# CJK 统一汉字 + 扩展 A + 兼容汉字 + 假名 + 谚文
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+CJK_RUN = re.compile(f"[{_CJK}]+")
+TERM = re.compile(r'"[^"]+"|\S+')
+
+
+def _bigrams(run):
+    if len(run) == 1:
+        return run
+    return " ".join(run[i:i + 2] for i in range(len(run) - 1))
+
+
+def tokenize(text):
+    """CJK 片段拆成二元组，其它字符交给 unicode61 处理"""
+    return CJK_RUN.sub(lambda m: f" {_bigrams(m.group())} ", text or "")
+
+
+def build_query(q):
+    """用户输入 → FTS5 MATCH 表达式：空格分隔的词全部命中（AND），词尾 * 为前缀匹配"""
+    parts = []
+    for term in TERM.findall(q or ""):
+        prefix = term.endswith("*") and not term.startswith('"')
+        term = term.strip('"').rstrip("*")
+        tokens = re.findall(r"\w+", tokenize(term))
+        if not tokens:
+            continue
+        # 单个汉字不会单独入索引，按二元组前缀匹配
+        prefix = prefix or (len(tokens) == 1 and len(tokens[0]) == 1 and CJK_RUN.fullmatch(tokens[0]) is not None)
+        phrase = '"' + " ".join(tokens) + '"'
+        parts.append(phrase + ("*" if prefix else ""))
+    return " AND ".join(parts)
+
+
+def ensure_schema(conn):
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def connect(path=None):
+    return ensure_schema(tweet_store.connect(path))
+
+
+# ==================== 写入 ====================
+
+def index_docs(conn, docs):
+    """docs: [{source, ext_id, author, channel, title, text, url, created_at, engagement}]
+    已存在的文档只更新互动分，正文索引不重复写入；返回新增条数"""
+    docs = [d for d in docs if d.get("ext_id")]
+    if not docs:
+        return 0
+    added = 0
+    with conn:
+        for d in docs:
+            cur = conn.execute(
+                "INSERT INTO social_docs (source, ext_id, author, channel, title, text, url, created_at, engagement) "
+                "VALUES (:source, :ext_id, :author, :channel, :title, :text, :url, :created_at, :engagement) "
+                "ON CONFLICT(source, ext_id) DO NOTHING",
+                {"author": "", "channel": "", "title": "", "text": "", "url": "", "engagement": 0, **d})
+            if cur.rowcount:
+                body = " ".join(filter(None, (d.get("author"), d.get("title"), d.get("text"))))
+                conn.execute("INSERT INTO social_fts (rowid, body) VALUES (?, ?)", (cur.lastrowid, tokenize(body)))
+                added += 1
+            else:
+                conn.execute("UPDATE social_docs SET engagement = ? WHERE source = ? AND ext_id = ?",
+                             (d.get("engagement", 0), d["source"], d["ext_id"]))
+    return added
+
+
+def tweet_doc(t, now=None):
+    return {
+        "source": "x",
+        "ext_id": t.get("id", ""),
+        "author": t.get("handle", ""),
+        "channel": t.get("type", ""),
+        "title": "",
+        "text": t.get("content", ""),
+        "url": t.get("url", ""),
+        "created_at": tweet_store.parse_created(t.get("timestamp"), int(now or time.time())),
+        "engagement": tweet_store.engagement(t),
+    }
+
+
+def reddit_doc(p, selftext=""):
+    return {
+        "source": "reddit",
+        "ext_id": p.get("id") or p.get("url", ""),
+        "author": p.get("author", ""),
+        "channel": p.get("subreddit", ""),
+        "title": p.get("title", ""),
+        "text": (selftext or "")[:4000],
+        "url": p.get("url", ""),
+        "created_at": int(p.get("created") or time.time()),
+        "engagement": int(p.get("score") or 0) + int(p.get("numComments") or 0) * 2,
+    }
+
+
+def index_tweets(conn, tweets):
+    return index_docs(conn, [tweet_doc(t) for t in tweets])
+
+
+def index_reddit(posts, selftexts=None, path=None):
+    """Reddit 帖子写入索引（独立连接，失败不影响采集）"""
+    selftexts = selftexts or {}
+    conn = connect(path)
+    try:
+        return index_docs(conn, [reddit_doc(p, selftexts.get(p.get("url"), "")) for p in posts])
+    finally:
+        conn.close()
+
+
+# ==================== 检索 ====================
+
+def search(conn, q, source=None, since=None, limit=50, order="rank"):
+    """全文检索，order = rank（BM25 相关度）/ engagement / recent
+    来源 / 时间条件和 MATCH 写在同一个 WHERE 里，排序和 LIMIT 都在 SQL 里完成，不先截断候选"""
+    expr = build_query(q)
+    if not expr:
+        return []
+    where, args = ["social_fts MATCH ?"], [expr]
+    if source:
+        where.append("d.source = ?")
+        args.append(source)
+    if since:
+        where.append("d.created_at >= ?")
+        args.append(int(since))
+    order_by = {"rank": "bm25(social_fts)", "engagement": "d.engagement DESC", "recent": "d.created_at DESC"}[order]
+    sql = (f"SELECT d.source, d.ext_id, d.author, d.channel, d.title, d.text, d.url, d.created_at, d.engagement "
+           f"FROM social_fts JOIN social_docs d ON d.id = social_fts.rowid "
+           f"WHERE {' AND '.join(where)} ORDER BY {order_by} LIMIT ?")
+    args.append(int(limit))
+    try:
+        return [dict(r) for r in conn.execute(sql, args)]
+    except sqlite3.OperationalError:
+        # 用户输入无法解析为 MATCH 表达式
+        return []
+
+
+def rebuild_tweets(conn):
+    """从 tweets 表补建推文索引（已有的跳过）"""
+    rows = conn.execute("SELECT id, handle, type, content, url, timestamp, likes, retweets, quotes FROM tweets")
+    return index_tweets(conn, [dict(r) for r in rows])
+
+
+def main():
+    args = sys.argv[1:]
+    conn = connect()
+    if "--rebuild" in args:
+        t0 = time.perf_counter()
+        added = rebuild_tweets(conn)
+        print(f"✓ 推文索引新增 {added} 条 ({time.perf_counter() - t0:.1f}s)")
+        return
+    days = None
+    if "--days" in args:
+        i = args.index("--days")
+        days = float(args[i + 1])
+        del args[i:i + 2]
+    q = " ".join(a for a in args if not a.startswith("--"))
+    if not q:
+        print(__doc__)
+        return
+    since = time.time() - days * 86400 if days else None
+    t0 = time.perf_counter()
+    rows = search(conn, q, since=since, limit=20)
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"🔍 {q!r} → {build_query(q)}  {len(rows)} 条 ({ms:.1f} ms)\n")
+    for r in rows:
+        when = time.strftime("%m-%d %H:%M", time.localtime(r["created_at"]))
+        text = (r["title"] or r["text"]).replace("\n", " ")[:90]
+        print(f"  [{r['source']:<6}] {when} {r['author'][:16]:<16} {r['engagement']:>7,}  {text}")
+
+
+if __name__ == "__main__":
+    main()
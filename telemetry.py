@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Byreal Dashboard — 采集运行遥测
+记录每次采集运行的阶段耗时、按 host 统计的 HTTP 请求数 / 字节 / 延迟分位 / 错误数、
+计数器（如 X API credits）和峰值 RSS。
+tracemalloc 会拖慢整次运行的每一次内存分配，默认不开：TELEMETRY_TRACEMALLOC=1 时才统计 Python 堆峰值，
+或者调用方（压测脚本）已经开启 tracemalloc 时顺带记录。
+
+输出:
+  data/metrics/runs.jsonl           每次运行一行 JSON
+  data/metrics/collector_<run>.prom Prometheus textfile exporter 格式（node_exporter 可直接读取）
+  data/metrics/daily.json           按天 / 按运行名预聚合，供看板运维页直接读取
+
+用法:
+  telemetry.start_run("collect")
+  telemetry.stage("byreal")          # 开始新阶段，自动结束上一阶段
+  with telemetry.http(url) as h:     # 记录一次 HTTP 请求
+      body = resp.read(); h.bytes = len(body)
+  telemetry.count("x_credits", cost)
+  telemetry.gauge("alert_rule_ms", 0.8, label=("rule", "high_apr"))   # 按标签分行的 gauge
+  telemetry.finish_run(ok=True)
+未调用 start_run 时所有记录函数都是空操作。
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+import paths
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRICS_DIR = paths.data_dir() / "metrics"
+RUNS_PATH = METRICS_DIR / "runs.jsonl"
+DAILY_PATH = METRICS_DIR / "daily.json"
+
+# app.py auto_collect 的 subprocess timeout
+RUN_BUDGET_S = 120
+TRACEMALLOC = os.environ.get("TELEMETRY_TRACEMALLOC", "") == "1"
+
+_lock = threading.Lock()
+_run = None
+
+
+class _Run:
+    def __init__(self, name):
+        self.name = name
+        self.t0 = time.perf_counter()
+        self.started = datetime.now(timezone.utc)
+        self.stages = {}
+        self.stage_name = None
+        self.stage_t0 = None
+        self.hosts = {}
+        self.counters = {}
+        self.gauges = {}
+        self.gauge_labels = {}          # 按标签分行的 gauge: key → 标签名（gauges[key] 为 {标签值: 值}）
+        self.own_tracemalloc = False
+
+
+class _HttpCall:
+    __slots__ = ("bytes", "status")
+
+    def __init__(self):
+        self.bytes = 0
+        self.status = None
+
+
+# ============================================================
+# 记录
+# ============================================================
+def start_run(name):
+    """开始一次运行；已有运行时沿用（例如 collect.py 内调用 X 采集）"""
+    global _run
+    with _lock:
+        if _run is not None:
+            return _run
+        _run = _Run(name)
+        if TRACEMALLOC and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _run.own_tracemalloc = True
+        return _run
+
+
+def active():
+    return _run is not None
+
+
+def _close_stage(run, now):
+    if run.stage_name is not None:
+        run.stages[run.stage_name] = run.stages.get(run.stage_name, 0) + now - run.stage_t0
+        run.stage_name = None
+
+
+def stage(name):
+    """进入新阶段（结束上一个阶段计时）"""
+    run = _run
+    if run is None:
+        return
+    with _lock:
+        now = time.perf_counter()
+        _close_stage(run, now)
+        run.stage_name = name
+        run.stage_t0 = now
+
+
+@contextmanager
+def http(url):
+    """记录一次 HTTP 请求的延迟 / 字节数 / 成败；异常原样抛出"""
+    call = _HttpCall()
+    t0 = time.perf_counter()
+    ok = False
+    try:
+        yield call
+        ok = True
+    finally:
+        run = _run
+        if run is not None:
+            elapsed = time.perf_counter() - t0
+            host = urlparse(url).netloc or url
+            with _lock:
+                h = run.hosts.setdefault(host, {"requests": 0, "errors": 0, "bytes": 0, "latencies": []})
+                h["requests"] += 1
+                h["bytes"] += call.bytes or 0
+                h["latencies"].append(elapsed)
+                if not ok or (call.status and call.status >= 400):
+                    h["errors"] += 1
+
+
+def count(key, n=1):
+    run = _run
+    if run is None:
+        return
+    with _lock:
+        run.counters[key] = run.counters.get(key, 0) + n
+
+
+def gauge(key, value, label=None):
+    """label=(标签名, 标签值) 时同一指标按标签分行记录，例如每条预警规则一行"""
+    run = _run
+    if run is None:
+        return
+    with _lock:
+        if label is None:
+            run.gauges[key] = value
+        else:
+            run.gauge_labels[key] = label[0]
+            run.gauges.setdefault(key, {})[label[1]] = value
+
+
+# ============================================================
+# 汇总输出
+# ============================================================
+def percentile(values, q):
+    if not values:
+        return 0.0
+    s = sorted(values)
+    k = (len(s) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(s) - 1)
+    return s[lo] + (s[hi] - s[lo]) * (k - lo)
+
+
+def peak_rss_bytes():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位 KB，macOS 单位 byte
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _snapshot(run, ok):
+    now = time.perf_counter()
+    _close_stage(run, now)
+    hosts = {}
+    for host, h in run.hosts.items():
+        lat = h["latencies"]
+        hosts[host] = {
+            "requests": h["requests"],
+            "errors": h["errors"],
+            "bytes": h["bytes"],
+            "p50": round(percentile(lat, 0.5), 4),
+            "p90": round(percentile(lat, 0.9), 4),
+            "p99": round(percentile(lat, 0.99), 4),
+            "max": round(max(lat), 4) if lat else 0.0,
+            "sum": round(sum(lat), 4),
+        }
+    tm_peak = None
+    if tracemalloc.is_tracing():
+        tm_peak = tracemalloc.get_traced_memory()[1]
+    return {
+        "run": run.name,
+        "ts": run.started.isoformat(timespec="seconds"),
+        "date": run.started.astimezone().strftime("%Y-%m-%d"),
+        "ok": ok,
+        "seconds": round(now - run.t0, 3),
+        "budget_s": RUN_BUDGET_S,
+        "stages": {k: round(v, 3) for k, v in run.stages.items()},
+        "hosts": hosts,
+        "counters": dict(run.counters),
+        "gauges": {k: dict(v) if isinstance(v, dict) else v for k, v in run.gauges.items()},
+        "gaugeLabels": dict(run.gauge_labels),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "tracemalloc_peak_bytes": tm_peak,
+    }
+
+
+def _label(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def _metric_name(key):
+    return "".join(c if c.isalnum() else "_" for c in key).lower()
+
+
+def to_prometheus(rec):
+    """单次运行 → Prometheus textfile 格式"""
+    run = _label(rec["run"])
+    p = "byreal_collector"
+    lines = [
+        f"# HELP {p}_run_seconds Wall time of the last collector run.",
+        f"# TYPE {p}_run_seconds gauge",
+        f'{p}_run_seconds{{run="{run}"}} {rec["seconds"]}',
+        f"# TYPE {p}_run_success gauge",
+        f'{p}_run_success{{run="{run}"}} {1 if rec["ok"] else 0}',
+        f"# TYPE {p}_run_budget_seconds gauge",
+        f'{p}_run_budget_seconds{{run="{run}"}} {rec["budget_s"]}',
+        f"# TYPE {p}_last_run_timestamp_seconds gauge",
+        f'{p}_last_run_timestamp_seconds{{run="{run}"}} {int(time.time())}',
+        f"# HELP {p}_stage_seconds Wall time per collector stage.",
+        f"# TYPE {p}_stage_seconds gauge",
+    ]
+    for st, sec in rec["stages"].items():
+        lines.append(f'{p}_stage_seconds{{run="{run}",stage="{_label(st)}"}} {sec}')
+
+    # 每个 .prom 只描述最近一次运行，因此用 gauge 而不是累计 counter
+    for metric, key in (("http_requests", "requests"), ("http_errors", "errors"), ("http_bytes", "bytes")):
+        lines.append(f"# TYPE {p}_{metric} gauge")
+        for host, h in rec["hosts"].items():
+            lines.append(f'{p}_{metric}{{run="{run}",host="{_label(host)}"}} {h[key]}')
+
+    lines.append(f"# HELP {p}_http_latency_seconds HTTP latency per host.")
+    lines.append(f"# TYPE {p}_http_latency_seconds summary")
+    for host, h in rec["hosts"].items():
+        lbl = f'run="{run}",host="{_label(host)}"'
+        for q, key in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99")):
+            lines.append(f'{p}_http_latency_seconds{{{lbl},quantile="{q}"}} {h[key]}')
+        lines.append(f"{p}_http_latency_seconds_sum{{{lbl}}} {h['sum']}")
+        lines.append(f"{p}_http_latency_seconds_count{{{lbl}}} {h['requests']}")
+
+    for key, val in {**rec["counters"], **rec["gauges"]}.items():
+        if isinstance(val, (int, float)):
+            name = f"{p}_{_metric_name(key)}"
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f'{name}{{run="{run}"}} {val}')
+
+    for key, label in rec.get("gaugeLabels", {}).items():
+        name = f"{p}_{_metric_name(key)}"
+        lines.append(f"# TYPE {name} gauge")
+        for lv, val in rec["gauges"].get(key, {}).items():
+            lines.append(f'{name}{{run="{run}",{_metric_name(label)}="{_label(lv)}"}} {val}')
+
+    for key in ("peak_rss_bytes", "tracemalloc_peak_bytes"):
+        if rec.get(key) is not None:
+            lines.append(f"# TYPE {p}_{key} gauge")
+            lines.append(f'{p}_{key}{{run="{run}"}} {rec[key]}')
+    return "\n".join(lines) + "\n"
+
+
+def aggregate(daily, rec):
+    """把一次运行合并进按天聚合的结构 {date: {run: {...}}}（原地修改）"""
+    day = daily.setdefault(rec["date"], {}).setdefault(rec["run"], {
+        "runs": 0, "failed": 0, "overBudget": 0, "secondsMax": 0.0, "secondsSum": 0.0,
+        "budget": rec.get("budget_s", RUN_BUDGET_S), "stages": {}, "hosts": {}, "counters": {}, "gauges": {},
+    })
+    day["runs"] += 1
+    day["failed"] += 0 if rec.get("ok") else 1
+    day["overBudget"] += 1 if rec["seconds"] > day["budget"] else 0
+    day["secondsMax"] = max(day["secondsMax"], rec["seconds"])
+    day["secondsSum"] = round(day["secondsSum"] + rec["seconds"], 3)
+    for st, sec in rec.get("stages", {}).items():
+        day["stages"][st] = max(day["stages"].get(st, 0), sec)
+    for host, h in rec.get("hosts", {}).items():
+        d = day["hosts"].setdefault(host, {"requests": 0, "errors": 0, "bytes": 0, "p50": 0.0, "p90": 0.0})
+        d["requests"] += h["requests"]
+        d["errors"] += h["errors"]
+        d["bytes"] += h["bytes"]
+        d["p50"] = max(d["p50"], h["p50"])
+        d["p90"] = max(d["p90"], h["p90"])
+    for key, val in rec.get("counters", {}).items():
+        day["counters"][key] = day["counters"].get(key, 0) + val
+    day["gauges"].update(rec.get("gauges", {}))
+    for key in ("peak_rss_bytes", "tracemalloc_peak_bytes"):
+        if rec.get(key) is not None:
+            day["gauges"][key] = max(day["gauges"].get(key, 0), rec[key])
+    return daily
+
+
+def load_daily():
+    if not DAILY_PATH.exists():
+        return {}
+    try:
+        with open(DAILY_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def rebuild_daily():
+    """从 runs.jsonl 全量重建 daily.json"""
+    daily = {}
+    if RUNS_PATH.exists():
+        with open(RUNS_PATH) as f:
+            for line in f:
+                try:
+                    aggregate(daily, json.loads(line))
+                except (ValueError, KeyError):
+                    continue
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    _write_json(DAILY_PATH, daily)
+    return daily
+
+
+def _write_json(path, obj):
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(obj, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp, path)
+
+
+def finish_run(ok=True):
+    """结束运行：写 runs.jsonl + .prom，返回本次记录"""
+    global _run
+    with _lock:
+        run = _run
+        if run is None:
+            return None
+        rec = _snapshot(run, ok)
+        _run = None
+        if run.own_tracemalloc:
+            tracemalloc.stop()
+
+    try:
+        METRICS_DIR.mkdir(parents=True, exist_ok=True)
+        with open(RUNS_PATH, "a") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        # 先写临时文件再 rename，避免 node_exporter 读到半个文件
+        prom = METRICS_DIR / f"collector_{_metric_name(rec['run'])}.prom"
+        tmp = prom.with_suffix(".prom.tmp")
+        tmp.write_text(to_prometheus(rec))
+        os.replace(tmp, prom)
+        _write_json(DAILY_PATH, aggregate(load_daily(), rec))
+    except OSError as e:
+        print(f"  [WARN] 遥测写入失败: {e}")
+
+    slow = sorted(rec["stages"].items(), key=lambda x: x[1], reverse=True)[:3]
+    over = " ⚠️ 超出预算" if rec["seconds"] > RUN_BUDGET_S else ""
+    print(f"⏱ {rec['run']} {rec['seconds']:.1f}s{over} | "
+          + ", ".join(f"{k} {v:.1f}s" for k, v in slow))
+    return rec
+
+
+if __name__ == "__main__":
+    if "--rebuild" in sys.argv:
+        daily = rebuild_daily()
+        print(f"✓ {DAILY_PATH}: {len(daily)} 天")
+    else:
+        print("用法: python3 telemetry.py --rebuild   # 从 runs.jsonl 重建 daily.json")
@@ -0,0 +1,17 @@
+"""
+测试公共设置：仓库是平铺的模块，直接把根目录加进 sys.path；
+数据目录 / 配置文件指向临时位置，测试不会读写真实的 data/ 和 alert_rules.json / pool_rules.json
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_TMP = Path(tempfile.mkdtemp(prefix="byreal-test-"))
+os.environ["BYREAL_DATA_DIR"] = str(_TMP / "data")
+os.environ["BYREAL_ALERT_CONFIG"] = str(_TMP / "alert_rules.json")
+os.environ["BYREAL_POOL_RULES"] = str(_TMP / "pool_rules.json")
@@ -0,0 +1,33 @@
+import json
+
+import collect
+import llm
+
+
+def run(monkeypatch, tmp_path, available, text, today):
+    monkeypatch.setattr(collect, "AI_CACHE_PATH", tmp_path / "ai_cache.json")
+    monkeypatch.setattr(llm, "available", lambda: available)
+    monkeypatch.setattr(collect, "call_claude", lambda prompt, max_tokens=1000, deadline=None: text)
+    monkeypatch.setattr(collect, "build_data_brief", lambda *a: f"brief {today}")
+    return collect.generate_ai_summary({}, {}, [], [], today)
+
+
+def test_fallback_only_after_failed_attempt_and_marked_stale(monkeypatch, tmp_path):
+    out = run(monkeypatch, tmp_path, True, "今日总结", "2026-03-01")
+    assert out["insight"] == "今日总结" and out["stale"] == {}
+
+    # 后端失败：沿用上次文本并标记来源日期
+    out = run(monkeypatch, tmp_path, True, "", "2026-03-02")
+    assert out["insight"] == "今日总结"
+    assert out["stale"] == {"insight": "2026-03-01", "public": "2026-03-01"}
+
+    # 没有可用后端：不沿用旧文本
+    out = run(monkeypatch, tmp_path, False, "", "2026-03-03")
+    assert out["insight"] == "" and out["public"] == "" and out["stale"] == {}
+
+
+def test_legacy_string_cache_is_marked_stale(monkeypatch, tmp_path):
+    (tmp_path / "ai_cache.json").write_text(json.dumps({"responses": {}, "last": {"insight": "旧文本"}}))
+    out = run(monkeypatch, tmp_path, True, "", "2026-03-02")
+    assert out["insight"] == "旧文本"
+    assert out["stale"] == {"insight": "未知日期"}
@@ -0,0 +1,127 @@
+import alert_rules
+
+DAY_MS = 86400000
+NOW = 1_700_000_000_000
+
+
+def summary(pools=(), xstocks=(), tvl=1_000_000):
+    return {"pools": list(pools), "xStocks": list(xstocks), "platform": {"tvl": tvl}}
+
+
+def pool(addr, apr=0.1, tvl=50_000, **kw):
+    return {"addr": addr, "name": addr.upper(), "apr": apr, "tvl": tvl, **kw}
+
+
+def run(s, market=None, **kw):
+    return alert_rules.evaluate(s, market or {}, now_ms=NOW, thresholds=dict(alert_rules.THRESHOLDS), **kw)
+
+
+def fired(result):
+    return {st["rule"]: st["fired"] for st in result["stats"] if st["fired"]}
+
+
+def test_high_apr_needs_every_condition():
+    s = summary([pool("a", apr=6), pool("b", apr=6, tvl=10), pool("c", apr=1)])
+    result = run(s)
+    assert fired(result) == {"high_apr": 1}
+    assert result["alerts"] == [{"lv": "orange", "cat": "pool", "msg": "A APR 600%，注意监控"}]
+
+
+def test_thresholds_override_defaults():
+    s = summary([pool("a", apr=3)])
+    assert run(s)["alerts"] == []
+    th = {**alert_rules.THRESHOLDS, "pool_apr": 2}
+    result = alert_rules.evaluate(s, {}, now_ms=NOW, thresholds=th)
+    assert fired(result) == {"high_apr": 1}
+
+
+def test_load_thresholds_reads_config_then_overrides(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text('{"pool_apr": 3, "reward_days": 14}')
+    th = alert_rules.load_thresholds(path, overrides={"reward_days": 2})
+    assert th["pool_apr"] == 3 and th["reward_days"] == 2
+    assert th["fng_fear"] == alert_rules.THRESHOLDS["fng_fear"]
+
+
+def test_grouped_rules_interleave_by_row():
+    xs = [{"name": "AAPLx", "pc1d": 0.08}, {"name": "TSLAx", "pc1d": -0.07}, {"name": "SPYx", "pc1d": 0.06}]
+    msgs = [a["msg"] for a in run(summary(xstocks=xs))["alerts"]]
+    assert [m.split()[0] for m in msgs] == ["AAPLx", "TSLAx", "SPYx"]
+    assert msgs[1] == "TSLAx 24h 跌 7.0%，建议发推关联相关新闻"
+
+
+def test_market_rules():
+    market = {"sol": {"change24h": -12.5}, "fearGreed": {"value": 15}}
+    result = run(summary(), market)
+    assert fired(result) == {"sol_dump": 1, "fng_fear": 1}
+    assert result["alerts"][0]["msg"] == "SOL 24h 暴跌 -12.5%，准备相关营销内容"
+
+
+def test_new_pool_prefers_registry_then_yesterday():
+    s = summary([pool("a"), pool("b")])
+    yesterday = summary([pool("a")])
+    assert fired(run(s, yesterday=yesterday)) == {"new_pool": 1}
+    assert fired(run(s, yesterday=yesterday, new_addrs={"a", "b"})) == {"new_pool": 2}
+    # 没有昨日快照也没有注册表：不判断新池
+    assert fired(run(s)) == {}
+
+
+def test_reward_expiry_uses_reward_rows_inside_window():
+    rewards = [
+        {"addr": "a", "name": "A", "symbol": "BYR", "endTs": NOW + 3 * DAY_MS},
+        {"addr": "a", "name": "A", "symbol": "USDC", "endTs": NOW + 30 * DAY_MS},
+        {"addr": "b", "name": "B", "symbol": "SOL", "endTs": NOW - DAY_MS},
+    ]
+    result = run(summary([pool("a"), pool("b")]), rewards=rewards)
+    assert result["alerts"] == [{"lv": "red", "cat": "reward", "msg": "A 激励 3 天后到期（BYR），提醒团队续期"}]
+
+
+def test_reward_scope_falls_back_to_pool_rewards():
+    p = pool("a", rewards=[{"symbol": "BYR", "endTs": NOW + 2 * DAY_MS}])
+    assert fired(run(summary([p]))) == {"reward_expiry": 1}
+
+
+def test_platform_tvl_drop_against_yesterday():
+    result = run(summary(tvl=900_000), yesterday=summary(tvl=1_000_000))
+    assert result["alerts"] == [{"lv": "red", "cat": "platform", "msg": "平台 TVL 日环比下降 10.0%，排查原因"}]
+
+
+def test_prepared_state_is_reused_across_thresholds():
+    s = summary([pool("a", apr=3), pool("b", apr=6)])
+    state = alert_rules.prepare(s, {}, now_ms=NOW)
+    counts = []
+    for apr in (2, 5, 10):
+        th = {**alert_rules.THRESHOLDS, "pool_apr": apr}
+        counts.append(fired(alert_rules.evaluate(None, None, thresholds=th, state=state)).get("high_apr", 0))
+    assert counts == [2, 1, 0]
+
+
+def test_compile_template_bakes_thresholds_and_escapes_braces():
+    fmt, names = alert_rules.compile_template("{name} {{x}} > {pool_apr}", {"name": None}, {"pool_apr": 5})
+    assert names == ["name"]
+    assert fmt.format("A") == "A {x} > 5"
+
+
+def test_columns_are_read_once_per_scope(monkeypatch):
+    calls = []
+    apr = alert_rules.FIELDS["pools"]["apr"]
+    monkeypatch.setitem(alert_rules.FIELDS["pools"], "apr", lambda r, ctx: calls.append(1) or apr(r, ctx))
+    rules = [alert_rules.Rule(f"apr_{k}", "pools", [("apr", ">", k), ("tvl", ">", 0)], "orange", "pool", "{name}")
+             for k in (1, 2, 3)]
+    s = summary([pool("a", apr=1.5), pool("b", apr=2.5), pool("c", apr=3.5)])
+    result = alert_rules.evaluate(s, {}, now_ms=NOW, thresholds=dict(alert_rules.THRESHOLDS), rules=rules)
+    assert [st["fired"] for st in result["stats"]] == [3, 2, 1]
+    assert len(calls) == 3
+
+
+def test_rule_stats_go_to_telemetry_by_rule(monkeypatch):
+    import collect
+    import telemetry
+
+    run = telemetry._Run("test")
+    monkeypatch.setattr(telemetry, "_run", run)
+    collect.generate_alerts(summary([pool("a", apr=6)]), {}, None, now_ms=NOW)
+    assert run.gauges["alert_rule_fired"]["high_apr"] == 1
+    assert set(run.gauges["alert_rule_ms"]) == {r.name for r in alert_rules.RULES}
+    prom = telemetry.to_prometheus(telemetry._snapshot(run, True))
+    assert 'byreal_collector_alert_rule_fired{run="test",rule="high_apr"} 1' in prom
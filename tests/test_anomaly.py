@@ -0,0 +1,94 @@
+import copy
+import math
+
+import anomaly
+
+
+def days(n, start=1):
+    return [f"2026-01-{d:02d}" for d in range(start, start + n)]
+
+
+def run_days(values_by_day):
+    """[(日期, values)] 依次喂给 step，返回最后的 entry"""
+    entry = None
+    for today, values in values_by_day:
+        entry, _ = anomaly.step(entry, values, today)
+    return entry
+
+
+def close(a, b):
+    return all(math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-12) for x, y in zip(a[:3], b[:3]))
+
+
+def test_update_undo_round_trip():
+    rec = None
+    history = []
+    for y in (1.0, 1.3, 0.8, 1.1, 1.05) + (1.2,) * (anomaly.SPAN + 5):
+        history.append(rec)
+        rec = anomaly.update(rec, y)
+    # 逐次撤销回到每一步之前的统计量（等权段和指数加权段都覆盖）
+    for prev in reversed(history[1:]):
+        rec = anomaly.undo(rec)
+        assert close(rec, prev)
+        rec = prev
+    assert anomaly.undo(anomaly.update(None, 1.0)) is None
+
+
+def test_same_day_rerun_matches_single_run():
+    values = [(d, {"tvl": 1000 + 10 * i, "apr": 0.1}) for i, d in enumerate(days(10))]
+    once = run_days(values)
+    entry, _ = anomaly.step(copy.deepcopy(once), values[-1][1], values[-1][0])
+    entry, _ = anomaly.step(entry, values[-1][1], values[-1][0])
+    assert entry[0] == once[0]
+    for m in once[1]:
+        assert close(entry[1][m], once[1][m])
+        assert entry[1][m][0] == once[1][m][0]
+
+
+def test_same_day_rerun_keeps_series_missing_today():
+    """今天 apr 缺失：重跑不能把 apr 昨天的更新撤销掉，也不能把序列丢掉"""
+    values = [(d, {"tvl": 1000, "apr": 0.1 + i / 100}) for i, d in enumerate(days(8))]
+    today = "2026-01-09"
+    once, _ = anomaly.step(run_days(values), {"tvl": 1200, "apr": None}, today)
+    twice, _ = anomaly.step(copy.deepcopy(once), {"tvl": 1200, "apr": None}, today)
+    twice, _ = anomaly.step(twice, {"tvl": 1200, "apr": None}, today)
+    assert once[1]["apr"][0] == 8 and once[1]["apr"][3] is None
+    assert twice[1]["apr"] == once[1]["apr"]
+    assert close(twice[1]["tvl"], once[1]["tvl"]) and twice[1]["tvl"][0] == 9
+
+
+def test_single_observation_rerun_does_not_drop_other_series():
+    entry, _ = anomaly.step(None, {"tvl": 1000}, "2026-01-01")
+    entry, _ = anomaly.step(entry, {"tvl": 1000, "apr": 0.2}, "2026-01-02")
+    entry, _ = anomaly.step(entry, {"tvl": 1000, "apr": 0.2}, "2026-01-02")
+    assert entry[1]["tvl"][0] == 2 and entry[1]["apr"][0] == 1
+
+
+def summary(tvl, v24h=50_000):
+    return {"platform": {"tvl": tvl, "vol24h": v24h, "fee24h": v24h / 100},
+            "pools": [{"addr": "p1", "name": "SOL/USDC", "tvl": tvl / 10, "v24h": v24h, "f24h": v24h / 100,
+                       "apr": 0.2, "px": 150}]}
+
+
+def test_detect_flags_jump_and_is_idempotent():
+    state = {"version": anomaly.STATE_VERSION, "platform": None, "pools": {}}
+    for i, d in enumerate(days(15)):
+        assert anomaly.detect(summary(1_000_000 * (1 + (i % 3) / 100)), d, state, save=False) == []
+    today = "2026-01-16"
+    first = anomaly.detect(summary(1_000_000, v24h=500_000), today, state, save=False)
+    again = anomaly.detect(summary(1_000_000, v24h=500_000), today, state, save=False)
+    # 撤销再重算只有浮点误差
+    assert [(a["scope"], a["metric"], a["z"]) for a in first] == [(a["scope"], a["metric"], a["z"]) for a in again]
+    assert all(math.isclose(a["mean"], b["mean"]) for a, b in zip(first, again))
+    hits = {(a["scope"], a["metric"]) for a in first}
+    assert ("platform", "v24h") in hits and ("pool", "v24h") in hits
+    assert all(a["z"] > anomaly.Z_ALERT for a in first)
+    alerts = anomaly.to_alerts(first)
+    assert alerts[0]["cat"] == "anomaly" and "高于近期均值" in alerts[0]["msg"]
+
+
+def test_stale_pools_are_dropped():
+    state = {"version": anomaly.STATE_VERSION, "platform": None, "pools": {}}
+    anomaly.detect(summary(1_000_000), "2026-01-01", state, save=False)
+    anomaly.detect({"platform": {"tvl": 1_000_000}, "pools": []}, "2026-03-01", state, save=False)
+    assert state["pools"] == {}
@@ -0,0 +1,26 @@
+import alert_rules
+import backtest_alerts
+
+
+def day(date, addrs):
+    return date, {"date": date, "platform": {"tvl": 1}, "market": {},
+                  "pools": [{"addr": a, "name": a.upper(), "apr": 0, "tvl": 1} for a in addrs], "xStocks": []}
+
+
+def new_pool_hits(days, since=None):
+    states = backtest_alerts.prepare_all(days, since)
+    results = backtest_alerts.run(states, dict(alert_rules.THRESHOLDS))
+    return {date: counts["new_pool"] for date, counts, _ in results}
+
+
+def test_new_pool_replays_first_seen_registry():
+    days = [day("2026-01-01", ["a"]), day("2026-01-02", ["a", "b"]),
+            day("2026-01-04", ["a", "b", "c"]),     # 01-03 缺快照：b 不会被再算一次
+            day("2026-01-05", ["a", "c"]), day("2026-01-06", ["a", "b", "c"])]
+    assert new_pool_hits(days) == {"2026-01-01": 0, "2026-01-02": 1, "2026-01-04": 1,
+                                   "2026-01-05": 0, "2026-01-06": 0}
+
+
+def test_since_still_replays_earlier_days():
+    days = [day("2026-01-01", ["a"]), day("2026-01-02", ["a", "b"]), day("2026-01-03", ["a", "b"])]
+    assert new_pool_hits(days, since="2026-01-03") == {"2026-01-03": 0}
@@ -0,0 +1,21 @@
+import bench_history
+
+
+def result(median_s):
+    return {"dataset": "1k", "bench": "process_pools", "median_s": median_s, "peak_kb": 100.0}
+
+
+def test_failed_runs_do_not_move_the_baseline(monkeypatch, tmp_path):
+    monkeypatch.setattr(bench_history, "HISTORY_DIR", tmp_path)
+    for _ in range(3):
+        assert bench_history.record("t", [result(1.0)], passed=True)
+
+    slow = [result(2.0)]
+    for _ in range(10):
+        regs = bench_history.regressions("t", slow)
+        assert regs
+        assert not bench_history.record("t", slow, passed=not regs)
+    assert len(bench_history.load("t")) == 3
+
+    assert bench_history.record("t", slow, passed=False, update_baseline=True)
+    assert [r["median_s"] for r in bench_history.load("t")] == [1.0, 1.0, 1.0, 2.0]
@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import incentives
+
+DAY_MS = incentives.DAY_MS
+NOW = 1_700_000_000_000
+
+
+def raw_reward(symbol, end_ts, daily="10", price="2", apr="0.5"):
+    return {"token": {"price": price, "mintInfo": {"symbol": symbol, "address": symbol + "Mint111"}},
+            "apr": apr, "endTimestamp": end_ts, "dailyAmountDisplay": daily}
+
+
+def row(addr, symbol, end_ts, daily_usd=10.0):
+    return {"addr": addr, "name": addr.upper(), "symbol": symbol, "mint": symbol + "Mint111",
+            "endTs": end_ts, "dailyAmount": daily_usd / 2, "price": 2.0, "dailyUsd": daily_usd}
+
+
+def test_parse_rewards():
+    out = incentives.parse_rewards([raw_reward("BYR", NOW), {"dailyMaxAmount": "bad"}])
+    assert out[0] == {"symbol": "BYR", "mint": "BYRMint111", "apr": 0.5, "endTs": NOW,
+                      "dailyAmount": 10.0, "price": 2.0, "dailyUsd": 20.0}
+    assert out[1]["endTs"] == 0 and out[1]["dailyUsd"] == 0.0
+    assert incentives.parse_rewards(None) == []
+
+
+def test_flatten_falls_back_to_single_reward():
+    pools = [
+        {"addr": "a", "name": "A", "rewards": [{"symbol": "BYR", "endTs": NOW}, {"symbol": "X", "endTs": 0}]},
+        {"addr": "b", "name": "B", "reward": {"symbol": "SOL", "endTs": NOW + 1}},
+        {"addr": "c", "name": "C", "rewards": [], "reward": {"symbol": "OLD", "endTs": NOW}},
+    ]
+    rows = incentives.flatten(pools)
+    assert [(r["addr"], r["symbol"]) for r in rows] == [("a", "BYR"), ("b", "SOL")]
+    assert rows[1]["dailyUsd"] == 0.0 and rows[1]["dailyAmount"] == 0.0
+
+
+def test_active_and_expiring_boundaries():
+    index = incentives.IncentiveIndex([
+        row("a", "BYR", NOW),                   # 恰好此刻到期：已失效
+        row("b", "BYR", NOW + 1),
+        row("c", "SOL", NOW + 7 * DAY_MS),      # 恰好在窗口末端：算即将到期
+        row("d", "SOL", NOW + 7 * DAY_MS + 1),
+    ])
+    assert [r["addr"] for r in index.active(NOW)] == ["b", "c", "d"]
+    assert [r["addr"] for r in index.expiring(NOW, 7)] == ["b", "c"]
+    assert index.between(NOW + 1, NOW + 7 * DAY_MS) == index.rows[2:3]
+
+
+def test_spend_by_token():
+    index = incentives.IncentiveIndex([
+        row("a", "BYR", NOW - 1, daily_usd=999),
+        row("b", "BYR", NOW + 5 * DAY_MS, daily_usd=10),
+        row("c", "BYR", NOW + 2 * DAY_MS, daily_usd=5),
+        row("d", "SOL", NOW + DAY_MS, daily_usd=40),
+        row("e", "", NOW + DAY_MS, daily_usd=1),
+    ])
+    spend = index.spend_by_token(NOW)
+    assert [(t["symbol"], t["pools"], t["dailyUsd"]) for t in spend] == [("SOL", 1, 40), ("BYR", 2, 15), ("Mint11", 1, 1)]
+    assert spend[1]["nextEndTs"] == NOW + 2 * DAY_MS
+
+
+def test_calendar_and_summary():
+    index = incentives.build([
+        {"addr": "a", "name": "A", "rewards": [row("a", "BYR", NOW + DAY_MS, 10)]},
+        {"addr": "a", "name": "A", "rewards": [row("a", "SOL", NOW + DAY_MS, 5)]},
+        {"addr": "b", "name": "B", "rewards": [row("b", "BYR", NOW + 40 * DAY_MS, 1)]},
+    ])
+    cal = index.calendar(NOW)
+    assert len(cal) == 1
+    assert cal[0]["date"] == datetime.fromtimestamp((NOW + DAY_MS) / 1000).strftime("%Y-%m-%d")
+    assert cal[0]["dailyUsd"] == 15 and [i["symbol"] for i in cal[0]["items"]] == ["BYR", "SOL"]
+    s = index.summary(NOW)
+    assert (s["active"], s["pools"], s["dailyUsd"]) == (3, 2, 16)
+    assert s["calendar"] == cal
+
+
+def test_process_pools_keeps_legacy_reward_types():
+    import collect
+    record = {"poolAddress": "a", "tvl": "1", "rewards": [raw_reward("BYR", NOW, daily="12.5"), raw_reward("SOL", NOW + 1)]}
+    raw = {"result": {"data": {"records": [record], "total": 1}}}
+    pool = collect.process_pools(raw)["pools"][0]
+    assert pool["reward"] == {"symbol": "BYR", "apr": 0.5, "endTs": NOW, "dailyAmount": "12.5"}
+    assert [r["dailyAmount"] for r in pool["rewards"]] == [12.5, 10.0]
+    rows = incentives.flatten([{**pool, "rewards": None, "reward": {**pool["reward"], "endTs": str(NOW)}}])
+    assert rows[0]["endTs"] == NOW and rows[0]["dailyAmount"] == 12.5
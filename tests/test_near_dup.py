@@ -0,0 +1,100 @@
+import itertools
+import random
+import string
+
+import near_dup
+
+BASE = "Byreal launches a new SOL USDC pool with boosted rewards for liquidity providers this week"
+
+
+def tweet(i, content, likes=0):
+    return {"id": str(i), "content": content, "likes": likes}
+
+
+def test_features_ignore_urls_case_and_punctuation():
+    assert near_dup.features("GM, Byreal! https://t.co/abc") == near_dup.features("gm byreal")
+    assert near_dup.features("激励上线") == ["激励", "励上", "上线"]
+
+
+def test_short_text_has_no_hash():
+    assert near_dup.simhash("gm") is None
+    assert near_dup.clusters([None, None]) == [0, 1]
+
+
+def test_short_single_word_edit_is_merged():
+    edited = BASE.replace("boosted", "extra")
+    a, b = near_dup.features(BASE), near_dup.features(edited)
+    # 短推文改一个词：SimHash 距离通常超过 MAX_DISTANCE，靠特征集合复核合并
+    assert near_dup.same_text(set(a), set(b))
+    out = near_dup.annotate([tweet(1, BASE, likes=5), tweet(2, edited + " https://t.co/x", likes=50)])
+    assert out[0]["dup_of"] == "2" and out[1]["dup_count"] == 1
+
+
+def test_unrelated_short_tweets_stay_apart():
+    tweets = [tweet(1, BASE), tweet(2, "the market is down today and it is time to buy the dip again"),
+              tweet(3, "new listing on byreal is live now check the pool page for the details")]
+    assert [t["id"] for t in near_dup.collapse(tweets)] == ["1", "2", "3"]
+
+
+def test_exact_copies_keep_most_engaged():
+    tweets = [tweet(1, BASE, likes=1), tweet(2, "RT " + BASE, likes=3), tweet(3, BASE.upper(), likes=2)]
+    kept = near_dup.collapse(tweets)
+    assert [t["id"] for t in kept] == ["2"] and kept[0]["dup_count"] == 2
+
+
+STOP = "the a to of and in is for on that this it with you be are at we our from just now more new up out all".split()
+
+
+def corpus(n, seed=1):
+    """随机推文：40% 常用词 + 按 Zipf 分布抽的内容词（词表随推文数增长）"""
+    rng = random.Random(seed)
+    vocab = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(n)]
+    cum = list(itertools.accumulate(1 / (k + 1) for k in range(n)))
+    return [" ".join(rng.choice(STOP) if rng.random() < 0.4 else rng.choices(vocab, cum_weights=cum)[0]
+                     for _ in range(rng.randint(5, 30))) for _ in range(n)]
+
+
+def index(texts):
+    feats = [near_dup.features(t) for t in texts]
+    return [near_dup.simhash(None, f) for f in feats], [set(f) for f in feats]
+
+
+def test_candidate_pairs_grow_roughly_linearly():
+    counts = []
+    for n in (500, 2000):
+        hashes, sets = index(corpus(n))
+        counts.append(sum(1 for _ in near_dup.candidates(hashes, sets)))
+    # 两两比较是 16 倍；近似线性应在 4 倍附近
+    assert counts[1] < 8 * counts[0]
+    assert counts[1] < 2000
+
+
+def test_index_finds_every_pair_brute_force_finds():
+    rng = random.Random(5)
+    texts = corpus(300, seed=2)
+    for t in texts[:150]:
+        words = t.split()
+        words[rng.randrange(len(words))] = "edited"
+        texts.append(" ".join(words))
+    hashes, sets = index(texts)
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for i, j in itertools.combinations(range(len(texts)), 2):
+        if hashes[i] is None or hashes[j] is None:
+            continue
+        d = near_dup.hamming(hashes[i], hashes[j])
+        if d <= near_dup.MAX_DISTANCE or (d <= near_dup.VERIFY_DISTANCE and near_dup.same_text(sets[i], sets[j])):
+            parent[find(i)] = find(j)
+    expected = [find(i) for i in range(len(texts))]
+    roots = near_dup.clusters(hashes, near_dup.MAX_DISTANCE, sets)
+
+    def groups(rs):
+        return sorted(sorted(i for i, r in enumerate(rs) if r == root) for root in set(rs))
+
+    assert groups(roots) == groups(expected)
+    assert len(set(roots)) < len(texts)
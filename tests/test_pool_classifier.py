@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+import pool_classifier as pc
+
+
+def config(**kw):
+    return {"rules": pc.RULES, "default": pc.DEFAULT, "overrides": {}, **kw}
+
+
+def raw_pool(addr, base, quote, cat=1):
+    return {"poolAddress": addr, "category": cat,
+            "baseMint": {"mintInfo": {"symbol": base}}, "quoteMint": {"mintInfo": {"symbol": quote}}}
+
+
+def old_is_xstock(sym):
+    """原 collect.classify_pool 的 xStocks 判断"""
+    return sym.endswith("x") and len(sym) > 2 and sym[:-1].isupper()
+
+
+@pytest.mark.parametrize("sym", ["SPYx", "NVDAx", "Ax", "x", "spyx", "SPY", "ÄÖx", "ΣΣx", "ABéx", "ABx\n",
+                                 "A1x", "12x", "BRK.Bx", "ABxx", "SPYX"])
+def test_suffix_rule_matches_old_heuristic(sym):
+    clf = pc.Classifier(config())
+    assert (clf.lookup(1, sym, "USDC") == "xStocks") == old_is_xstock(sym)
+
+
+def test_rule_order_and_default():
+    clf = pc.Classifier(config())
+    assert clf.lookup(32, "FOO", "BAR") == "xStocks"
+    assert clf.lookup(1, "XAUt", "USDC") == "Gold_RWA"
+    assert clf.lookup(1, "USDC", "USDT") == "Stablecoin"
+    assert clf.lookup(1, "SOL", "USDC") == "Major"
+    assert clf.lookup(1, "BONK", "JUP") == "Other"
+    assert len(clf.table) == 5
+
+
+def test_pattern_rule_is_full_match():
+    clf = pc.Classifier(config(rules=[{"biz": "Meme", "pattern": "BONK|WIF"}]))
+    assert clf.lookup(1, "BONK", "SOL") == "Meme"
+    assert clf.lookup(1, "BONKER", "SOL") == "Other"
+    with pytest.raises(ValueError):
+        pc.Classifier(config(rules=[{"biz": "X", "unknown": 1}]))
+
+
+def test_override_pins_address():
+    clf = pc.Classifier(config(overrides={"pin": "Gold_RWA"}))
+    assert clf.classify_raw(raw_pool("pin", "SOL", "USDC")) == "Gold_RWA"
+    assert clf.classify_raw(raw_pool("other", "SOL", "USDC")) == "Major"
+    assert "pin" not in clf.pools
+
+
+def test_address_cache_and_fingerprint(tmp_path):
+    path = tmp_path / "pool_classes.json"
+    clf = pc.Classifier(config())
+    clf.classify_raw(raw_pool("a", "SOL", "USDC"))
+    clf.save(path)
+    cache = json.loads(path.read_text())
+
+    warm = pc.Classifier(config(), cache)
+    assert warm.classify_raw(raw_pool("a", "SOL", "USDC")) == "Major" and warm.hits == 1
+    # 符号变了不用缓存
+    assert warm.classify_raw(raw_pool("a", "BONK", "USDC")) == "Other" and warm.hits == 1
+
+    # 规则变了（哪怕只改 overrides）指纹就变，缓存作废
+    changed = config(overrides={"b": "Other"})
+    assert pc.fingerprint(changed) != pc.fingerprint(config())
+    assert pc.Classifier(changed, cache).pools == {}
+
+
+def test_load_config_merges_file(tmp_path):
+    path = tmp_path / "pool_rules.json"
+    path.write_text('{"overrides": {"a": "Gold_RWA"}}')
+    cfg = pc.load_config(path)
+    assert cfg["rules"] == pc.RULES and cfg["overrides"] == {"a": "Gold_RWA"}
+    path.write_text("{broken")
+    assert pc.load_config(path)["overrides"] == {}
+
+
+def snapshot():
+    pools = [
+        {"addr": "a", "name": "SPYx/USDC", "cat": 1, "baseSym": "SPYx", "quoteSym": "USDC", "biz": "Other",
+         "tvl": 100, "v24h": 10, "f24h": 1},
+        {"addr": "b", "name": "SOL/USDC", "cat": 1, "baseSym": "SOL", "quoteSym": "USDC", "biz": "Major",
+         "tvl": 50, "v24h": 5, "f24h": 0.5},
+        {"addr": "c", "name": "NVDAx/USDC", "cat": 1, "baseSym": "NVDAx", "quoteSym": "USDC", "biz": "xStocks",
+         "tvl": 300, "v24h": 0, "f24h": 0},
+    ]
+    return {"pools": pools, "rankings": {"tvl": [{"addr": "a", "biz": "Other"}]},
+            "bizLines": {}, "xStocks": []}
+
+
+def test_apply_rewrites_biz_lines_and_xstocks():
+    s = snapshot()
+    assert pc.apply(s, pc.Classifier(config())) == 1
+    assert s["rankings"]["tvl"][0]["biz"] == "xStocks"
+    assert [p["addr"] for p in s["xStocks"]] == ["c", "a"]
+    assert s["bizLines"]["xStocks"] == {"tvl": 400, "vol24h": 10, "fee24h": 1, "count": 2}
+    # 再跑一次没有改动
+    assert pc.apply(s, pc.Classifier(config())) == 0
+
+
+def test_reclassify_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(pc, "DATA_DIR", tmp_path)
+    for name in ("2026-01-01", "2026-01-02", "notes"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "summary.json").write_text(json.dumps(snapshot()))
+    clf = pc.Classifier(config())
+    assert pc.reclassify_history(clf, dry_run=True) == [("2026-01-01", 1), ("2026-01-02", 1)]
+    assert json.loads((tmp_path / "2026-01-01" / "summary.json").read_text()) == snapshot()
+    pc.reclassify_history(clf)
+    assert pc.reclassify_history(clf) == [("2026-01-01", 0), ("2026-01-02", 0)]
@@ -0,0 +1,42 @@
+import social_search
+
+T0 = 1_700_000_000
+
+
+def doc(i, text, created_at, source="x"):
+    return {"source": source, "ext_id": str(i), "author": "a", "text": text, "created_at": created_at}
+
+
+def db(tmp_path, docs):
+    conn = social_search.connect(tmp_path / "social.db")
+    social_search.index_docs(conn, docs)
+    return conn
+
+
+def test_rank_covers_old_matches(tmp_path):
+    # 最相关的一条最早写入，之后 6000 条弱相关的新文档
+    docs = [doc(0, "xstocks xstocks xstocks", T0)]
+    docs += [doc(i, f"filler text {i} about the market and xstocks among many other words", T0 + i)
+             for i in range(1, 6001)]
+    conn = db(tmp_path, docs)
+    rows = social_search.search(conn, "xstocks", limit=3)
+    assert rows[0]["ext_id"] == "0"
+
+
+def test_since_is_applied_before_limit(tmp_path):
+    # 近期的 10 条先写入，之后回填了 6000 条三个月前的旧帖（写入顺序和发布时间不一致）
+    docs = [doc(i, "byreal pool", T0 + i) for i in range(10)]
+    docs += [doc(10_000 + i, "byreal pool", T0 - 86400 * 90 + i) for i in range(6000)]
+    conn = db(tmp_path, docs)
+    rows = social_search.search(conn, "byreal", since=T0, limit=50)
+    assert sorted(int(r["ext_id"]) for r in rows) == list(range(10))
+    rows = social_search.search(conn, "byreal", source="reddit")
+    assert rows == []
+
+
+def test_cjk_bigrams_and_orders(tmp_path):
+    conn = db(tmp_path, [doc(1, "流动性 激励上线", T0), doc(2, "新的流动性池", T0 + 1, source="reddit")])
+    assert {r["ext_id"] for r in social_search.search(conn, "流动性")} == {"1", "2"}
+    assert [r["ext_id"] for r in social_search.search(conn, "流动性", order="recent")] == ["2", "1"]
+    assert social_search.search(conn, "流") != []
+    assert social_search.search(conn, '"unterminated') == []
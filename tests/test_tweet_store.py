@@ -0,0 +1,25 @@
+import time
+
+import tweet_store
+
+
+def tweet(id, tag, hours_ago, now):
+    ts = time.strftime("%a %b %d %H:%M:%S +0000 %Y", time.gmtime(now - hours_ago * 3600))
+    return {"id": id, "handle": "h", "type": "search" if tag else "account", "tag": tag, "timestamp": ts, "likes": 1}
+
+
+def test_window_uses_shorter_window_for_account_timelines(tmp_path):
+    now = int(time.time())
+    conn = tweet_store.connect(tmp_path / "social.db")
+    tweet_store.upsert_tweets(conn, [
+        tweet("acct_new", "", 10, now),
+        tweet("acct_old", "", 60, now),
+        tweet("search_old", "rwa", 60, now),
+        tweet("search_expired", "rwa", 80, now),
+    ], ts=now)
+    ids = lambda rows: sorted(t["id"] for t in rows)
+    assert ids(tweet_store.window(conn, hours=72, now=now)) == ["acct_new", "acct_old", "search_old"]
+    assert ids(tweet_store.window(conn, hours=72, account_hours=48, now=now)) == ["acct_new", "search_old"]
+    # 旧 x_cache.json 导入的推文 tag 可能为 NULL，按账号推文处理
+    conn.execute("UPDATE tweets SET tag = NULL WHERE id = 'acct_old'")
+    assert ids(tweet_store.window(conn, hours=72, account_hours=48, now=now)) == ["acct_new", "search_old"]
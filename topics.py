@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+社媒话题聚类（稀疏 TF-IDF + leader 聚类）
+把当天的推文（xTrends）和 Reddit 帖子（redditHot）聚成若干话题，写入 summary.json 的 topics：
+  - 特征: 英文词（去停用词）+ 中文字二元组 + 实体标签（ticker / 竞品，加权）
+  - 向量: dict 稀疏表示，次线性 TF × 平滑 IDF，L2 归一化；只出现在 1 条或超过半数条目中的词丢弃
+  - 聚类: 按互动分从高到低单遍扫描，通过“词 → 话题”倒排只与共享词的话题算余弦，
+          相似度 >= SIM_THRESHOLD 并入（更新质心），否则自成新话题；近似线性
+  - 输出: 按总互动排序的前 MAX_TOPICS 个话题，每个带关键词、条数、来源分布、代表条目
+
+用法:
+  python3 topics.py                # 对 data/latest/summary.json 的社媒数据聚类并打印
+"""
+
+import json
+import math
+import re
+import sys
+import time
+
+import paths
+import tweet_store
+from social_search import CJK_RUN
+
+DATA_DIR = paths.data_dir()
+
+SIM_THRESHOLD = 0.3
+MAX_TOPICS = 8
+TOP_ITEMS = 3
+LABEL_TERMS = 4
+CENTROID_TERMS = 30     # 质心只保留权重最高的若干词，控制倒排规模
+ENTITY_WEIGHT = 2.0
+
+WORD = re.compile(r"[a-z][a-z0-9$]+|\$[a-z0-9]+")
+URL = re.compile(r"https?://\S+")
+STOPWORDS = set("""
+a an the and or but if then so to of in on at by for with from into over about as is are was were be been
+being it its this that these those there here i you he she we they me my your our their them his her
+not no yes do does did done have has had will would can could should may might just than too very also
+all any some more most much many such only own same other what which who whom when where why how
+up down out off again further once rt amp via new now today get got one two us s t re ve ll d m
+https http co www com
+""".split())
+
+
+def features(text, entities=()):
+    """文本 → 词频 dict"""
+    text = URL.sub(" ", (text or "").lower())
+    tf = {}
+    for m in CJK_RUN.finditer(text):
+        run = m.group()
+        for gram in ([run] if len(run) == 1 else (run[i:i + 2] for i in range(len(run) - 1))):
+            tf[gram] = tf.get(gram, 0) + 1
+    for w in WORD.findall(CJK_RUN.sub(" ", text)):
+        w = w.lstrip("$")
+        if len(w) > 1 and w not in STOPWORDS:
+            tf[w] = tf.get(w, 0) + 1
+    for e in entities:
+        # 实体标签把 "$NVDAx" / "NVDAx" / "英伟达代币" 等不同写法拉到同一个维度
+        tf[e] = tf.get(e, 0) + ENTITY_WEIGHT
+    return tf
+
+
+def tfidf(docs):
+    """[{term: tf}] → [{term: weight}]（L2 归一化）"""
+    n = len(docs)
+    df = {}
+    for d in docs:
+        for term in d:
+            df[term] = df.get(term, 0) + 1
+    max_df = max(2, n // 2)
+    idf = {t: math.log((n + 1) / (c + 1)) + 1 for t, c in df.items() if 1 < c <= max_df}
+    out = []
+    for d in docs:
+        v = {t: (1 + math.log(c)) * idf[t] for t, c in d.items() if t in idf and c > 0}
+        norm = math.sqrt(sum(w * w for w in v.values())) or 1.0
+        out.append({t: w / norm for t, w in v.items()})
+    return out
+
+
+def _top_terms(vec, k):
+    return dict(sorted(vec.items(), key=lambda kv: -kv[1])[:k])
+
+
+def _normalize(vec):
+    norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+    return {t: w / norm for t, w in vec.items()}
+
+
+def leader_cluster(vectors, order, threshold=SIM_THRESHOLD):
+    """单遍 leader 聚类，返回话题列表（members 为条目下标，按 order 顺序）"""
+    clusters = []        # {"sum": {term: w}, "centroid": {term: w}, "members": [i]}
+    index = {}           # term → {cluster id}
+    for i in order:
+        v = vectors[i]
+        best, best_sim = None, threshold
+        candidates = set()
+        for t in v:
+            candidates.update(index.get(t, ()))
+        for c in candidates:
+            cen = clusters[c]["centroid"]
+            sim = sum(w * cen[t] for t, w in v.items() if t in cen)
+            if sim >= best_sim:
+                best, best_sim = c, sim
+        if best is None:
+            best = len(clusters)
+            clusters.append({"sum": {}, "centroid": {}, "members": []})
+        cl = clusters[best]
+        cl["members"].append(i)
+        for t, w in v.items():
+            cl["sum"][t] = cl["sum"].get(t, 0) + w
+        old = cl["centroid"]
+        cl["centroid"] = _normalize(_top_terms(cl["sum"], CENTROID_TERMS))
+        for t in old.keys() - cl["centroid"].keys():
+            index[t].discard(best)
+        for t in cl["centroid"]:
+            index.setdefault(t, set()).add(best)
+    return clusters
+
+
+def _label(term):
+    kind, _, name = term.partition(":")
+    if kind == "ticker":
+        return f"${name}"
+    if kind == "competitor":
+        return name.capitalize()
+    if kind == "keyword":
+        return name
+    return term
+
+
+def _merge_bigrams(terms):
+    """相邻的中文二元组拼回短语：["流动", "动性", "性池"] → ["流动性池"]"""
+    pieces = []
+    for term in terms:
+        if len(term) == 2 and CJK_RUN.fullmatch(term):
+            for k, p in enumerate(pieces):
+                if CJK_RUN.fullmatch(p) and p.endswith(term[0]):
+                    pieces[k] = p + term[1]
+                    break
+                if CJK_RUN.fullmatch(p) and p.startswith(term[1]):
+                    pieces[k] = term[0] + p
+                    break
+            else:
+                pieces.append(term)
+        else:
+            pieces.append(term)
+    return pieces
+
+
+def topic_label(centroid):
+    """质心权重最高的词；ticker 实体和同名单词只保留一个"""
+    labels, seen = [], set()
+    for term in _merge_bigrams(_top_terms(centroid, LABEL_TERMS * 2)):
+        label = _label(term)
+        key = label.lstrip("$").lower()
+        if key not in seen:
+            seen.add(key)
+            labels.append(label)
+    return " · ".join(labels[:LABEL_TERMS])
+
+
+def social_items(x_trends, reddit_hot):
+    """推文 + Reddit 帖子 → 统一条目"""
+    items = []
+    for t in x_trends or []:
+        items.append({
+            "source": "x",
+            "author": t.get("handle", ""),
+            "text": t.get("content", ""),
+            "url": t.get("url", ""),
+            "engagement": tweet_store.engagement(t),
+            "entities": t.get("entities", []),
+        })
+    for p in reddit_hot or []:
+        items.append({
+            "source": "reddit",
+            "author": p.get("author", ""),
+            "text": p.get("title", ""),
+            "url": p.get("url", ""),
+            "engagement": int(p.get("score") or 0) + int(p.get("numComments") or 0) * 2,
+            "entities": p.get("entities", []),
+        })
+    return items
+
+
+def build_topics(x_trends, reddit_hot, max_topics=MAX_TOPICS, threshold=SIM_THRESHOLD):
+    """返回 summary.json 的 topics 列表（至少 2 条的话题，按总互动降序）"""
+    items = social_items(x_trends, reddit_hot)
+    if len(items) < 2:
+        return []
+    vectors = tfidf([features(it["text"], [e for e in it["entities"] if not e.startswith("keyword:")])
+                     for it in items])
+    order = sorted(range(len(items)), key=lambda i: -items[i]["engagement"])
+    clusters = [c for c in leader_cluster(vectors, order, threshold) if len(c["members"]) >= 2]
+
+    topics = []
+    for c in clusters:
+        members = c["members"]      # 已按互动降序
+        sources = {}
+        for i in members:
+            sources[items[i]["source"]] = sources.get(items[i]["source"], 0) + 1
+        topics.append({
+            "label": topic_label(c["centroid"]),
+            "size": len(members),
+            "engagement": sum(items[i]["engagement"] for i in members),
+            "sources": sources,
+            "items": [{
+                "source": items[i]["source"],
+                "author": items[i]["author"],
+                "text": items[i]["text"][:140],
+                "url": items[i]["url"],
+                "engagement": items[i]["engagement"],
+            } for i in members[:TOP_ITEMS]],
+        })
+    topics.sort(key=lambda t: -t["engagement"])
+    return topics[:max_topics]
+
+
+def main():
+    path = DATA_DIR / "latest" / "summary.json"
+    try:
+        with open(path) as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        print(f"✗ 无法读取 {path}")
+        return 1
+    t0 = time.perf_counter()
+    topics = build_topics(summary.get("xTrends", []), summary.get("redditHot", []))
+    ms = (time.perf_counter() - t0) * 1000
+    n = len(summary.get("xTrends", [])) + len(summary.get("redditHot", []))
+    print(f"🧩 {n} 条 → {len(topics)} 个话题 ({ms:.0f} ms)\n")
+    for t in topics:
+        print(f"  [{t['size']:>3} 条 / 互动 {t['engagement']:>8,}] {t['label']}")
+        for it in t["items"]:
+            print(f"      {it['source']:<6} {it['author'][:14]:<14} {it['text'][:70]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+社媒内容中文翻译 / 摘要（按内容哈希缓存 + 批量调用 LLM）
+  Reddit 帖子 → title_cn（标题翻译）+ summary_cn（标题 + 正文一句话摘要，无正文时为空）
+  推文       → content_cn（正文翻译）
+  - 缓存键 = sha1(类型 + 模型 + 原文)，帖子被编辑后哈希变化才会重新翻译；缓存在 data/translate_cache.json
+  - 已是中文的内容不调用 LLM；旧版 reddit_cache.json 里已有 title_cn / summary_cn 的帖子直接沿用
+  - 未命中的条目每 BATCH_SIZE 条合成一个请求（JSON 数组进出），最多 TRANSLATE_CONCURRENCY 个请求并发
+  - LLM_BACKEND=stub 时由 stub_call 生成确定性 "翻译"（见 llm.py），供测试 / 压测
+
+用法:
+  python3 translate.py          # 对 data/latest/summary.json 的社媒内容试跑（不写回）
+  python3 translate.py --stub   # 同上，使用本地替身
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import collect_reddit
+import llm
+import paths
+import telemetry
+from social_search import CJK_RUN
+
+DATA_DIR = paths.data_dir()
+CACHE_PATH = DATA_DIR / "translate_cache.json"
+
+BATCH_SIZE = 25
+TRANSLATE_CONCURRENCY = int(os.environ.get("TRANSLATE_CONCURRENCY", "4"))
+MAX_TOKENS = 4000
+BODY_CHARS = 1500       # 送给 LLM 的正文上限
+CACHE_DAYS = 14         # 超过这么多天没用到的翻译丢弃
+CJK_RATIO = 0.3
+
+PROMPT = """把下面 JSON 数组里的加密货币社媒内容翻译成简体中文。逐条返回一个 JSON 数组，不要输出其它文字：
+- kind=reddit：{{"i": 序号, "title_cn": 标题翻译, "summary_cn": 结合标题和正文的一句话中文摘要（body 为空时返回空字符串）}}
+- kind=x：{{"i": 序号, "content_cn": 推文翻译}}
+专有名词、代币符号、项目名保留原文。
+
+<items>
+{items}
+</items>"""
+
+
+# ==================== 缓存 ====================
+
+def load_cache():
+    try:
+        with open(CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, now):
+    cutoff = now - CACHE_DAYS * 86400
+    cache = {k: v for k, v in cache.items() if v.get("ts", now) >= cutoff}
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_PATH, "w") as f:
+        json.dump(cache, f, ensure_ascii=False, sort_keys=True)
+
+
+def content_key(kind, *parts):
+    # 带上模型名：替身 / 回放的结果不会混进真实翻译
+    return hashlib.sha1("\0".join((kind, llm.model(), *parts)).encode("utf-8")).hexdigest()[:20]
+
+
+def is_chinese(text):
+    chars = len(re.sub(r"\s", "", text or ""))
+    return chars > 0 and sum(len(m) for m in CJK_RUN.findall(text)) / chars >= CJK_RATIO
+
+
+# ==================== 条目 ====================
+
+def reddit_jobs(posts):
+    """Reddit 帖子 → [(post, key, 请求条目 | 现成结果)]；正文取自 Reddit 帖子缓存
+    旧版 reddit_cache.json 里已有的翻译（legacyCn，按标题）作为现成结果，只在哈希缓存未命中时使用"""
+    reddit_cache = collect_reddit.load_cache()
+    cached, legacy = reddit_cache["posts"], reddit_cache.get("legacyCn") or {}
+    jobs = []
+    for p in posts:
+        title = p.get("title", "")
+        body = (cached.get(p.get("id"), {}).get("selftext") or "")[:BODY_CHARS]
+        key = content_key("reddit", title, body)
+        if is_chinese(title + body):
+            jobs.append((p, key, {"title_cn": title, "summary_cn": ""}))
+        elif title in legacy:
+            jobs.append((p, key, dict(legacy[title])))
+        else:
+            jobs.append((p, key, {"kind": "reddit", "title": title, "body": body}))
+    return jobs
+
+
+def tweet_jobs(tweets):
+    jobs = []
+    for t in tweets:
+        text = t.get("content", "")
+        if text and not is_chinese(text):
+            jobs.append((t, content_key("x", text), {"kind": "x", "text": text[:BODY_CHARS]}))
+    return jobs
+
+
+FIELDS = {"reddit": ("title_cn", "summary_cn"), "x": ("content_cn",)}
+
+
+# ==================== LLM ====================
+
+def parse_response(text, n):
+    """LLM 输出 → {序号: 结果}；容忍前后多余文字 / 代码块"""
+    start, end = (text or "").find("["), (text or "").rfind("]")
+    if start < 0 or end <= start:
+        return {}
+    try:
+        rows = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+    out = {}
+    for r in rows if isinstance(rows, list) else []:
+        if isinstance(r, dict) and isinstance(r.get("i"), int) and 0 <= r["i"] < n:
+            out[r["i"]] = r
+    return out
+
+
+def translate_batch(call, items):
+    """一个请求翻译一批条目，返回 {批内序号: 结果}"""
+    payload = json.dumps([{"i": i, **it} for i, it in enumerate(items)], ensure_ascii=False)
+    return parse_response(call(PROMPT.format(items=payload), max_tokens=MAX_TOKENS), len(items))
+
+
+def stub_call(prompt):
+    """llm 替身后端的响应：按请求里的条目生成确定性 "翻译"，输出格式与真实 LLM 相同"""
+    m = re.search(r"<items>\n(.*)\n</items>", prompt, re.S)
+    items = json.loads(m.group(1)) if m else []
+    out = []
+    for it in items:
+        if it.get("kind") == "reddit":
+            body = it.get("body", "")
+            out.append({"i": it["i"], "title_cn": f"〔译〕{it.get('title', '')}",
+                        "summary_cn": f"〔摘要〕{body[:60]}" if body else ""})
+        else:
+            out.append({"i": it["i"], "content_cn": f"〔译〕{it.get('text', '')}"})
+    return json.dumps(out, ensure_ascii=False)
+
+
+llm.register_stub("<items>", stub_call)
+
+
+# ==================== 主流程 ====================
+
+def annotate(reddit_posts, tweets, call=None, now=None):
+    """原地给帖子 / 推文加中文字段，返回统计 {items, cached, translated, calls}
+    call(prompt, max_tokens) → 文本；为 None 时只使用缓存"""
+    now = int(now or time.time())
+    cache = load_cache()
+    jobs = reddit_jobs(reddit_posts or []) + tweet_jobs(tweets or [])
+
+    misses, seen = [], set()
+    for item, key, req in jobs:
+        if "kind" not in req:
+            cache.setdefault(key, {**req, "ts": now})
+        elif key not in cache and key not in seen:
+            misses.append((key, req))
+            seen.add(key)
+    hits = len(jobs) - len(misses)
+
+    calls = 0
+    if call and misses:
+        batches = [misses[i:i + BATCH_SIZE] for i in range(0, len(misses), BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=TRANSLATE_CONCURRENCY) as pool:
+            futures = {pool.submit(translate_batch, call, [req for _, req in b]): b for b in batches}
+            for fut in as_completed(futures):
+                batch = futures[fut]
+                calls += 1
+                try:
+                    results = fut.result()
+                except Exception as e:
+                    print(f"  [WARN] 翻译请求失败: {e}")
+                    continue
+                # 缺失的条目不写缓存，下次重试
+                for i, (key, req) in enumerate(batch):
+                    r = results.get(i)
+                    if r:
+                        cache[key] = {f: str(r.get(f) or "") for f in FIELDS[req["kind"]]}
+
+    for item, key, _ in jobs:
+        entry = cache.get(key)
+        if entry:
+            entry["ts"] = now
+            item.update({k: v for k, v in entry.items() if k != "ts"})
+
+    translated = sum(1 for key, _ in misses if key in cache)
+    if misses or hits:
+        save_cache(cache, now)
+    telemetry.count("translate_llm_calls", calls)
+    telemetry.gauge("translate_cache_hits", hits)
+    return {"items": len(jobs), "cached": hits, "translated": translated, "calls": calls}
+
+
+def main():
+    if "--stub" in sys.argv:
+        llm.use("stub")
+    try:
+        with open(DATA_DIR / "latest" / "summary.json") as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        print("✗ 无法读取 data/latest/summary.json")
+        return 1
+    call = llm.complete if llm.available() else None
+    posts, tweets = summary.get("redditHot", []), summary.get("xTrends", [])
+    t0 = time.perf_counter()
+    s = annotate(posts, tweets, call)
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"🈯 {s['items']} 条: 缓存命中 {s['cached']} / 新翻译 {s['translated']} / LLM 请求 {s['calls']} ({ms:.0f} ms)")
+    for p in posts[:5]:
+        print(f"  r/{p.get('subreddit', '')}: {p.get('title_cn') or p.get('title', '')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
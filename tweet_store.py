@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+X/Twitter 推文本地存储（SQLite）
+每条推文一行（按 tweet id 去重，保留最新互动数），另存带时间戳的互动快照，
+超出 48/72h 采集窗口的推文也不会丢失。
+
+表:
+  tweets     id 主键；handle / type+tag / created_at 均有索引，按窗口读取不需要全量加载
+             dup_of / dup_count 为 near_dup 近似去重标记（dup_of 非空 = 被合并到另一条推文）
+  tweet_entities  relevance 实体标签倒排（entity → tweet_id），按竞品 / ticker 过滤走索引
+  snapshots  (tweet_id, ts) → likes / retweets / replies / views / quotes，仅在互动数变化时追加
+
+用法:
+  python3 tweet_store.py                      # 库概况
+  python3 tweet_store.py --import x_cache.json  # 导入旧的 x_cache.json
+数据: data/social.db
+"""
+
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import paths
+
+DATA_DIR = paths.data_dir()
+DB_PATH = DATA_DIR / "social.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tweets (
+    id              TEXT PRIMARY KEY,
+    handle          TEXT NOT NULL,
+    name            TEXT,
+    type            TEXT,
+    tag             TEXT,
+    content         TEXT,
+    url             TEXT,
+    created_at      INTEGER NOT NULL,
+    timestamp       TEXT,
+    followers       INTEGER DEFAULT 0,
+    verified        INTEGER DEFAULT 0,
+    is_quote        INTEGER DEFAULT 0,
+    is_reply        INTEGER DEFAULT 0,
+    conversation_id TEXT,
+    likes           INTEGER DEFAULT 0,
+    retweets        INTEGER DEFAULT 0,
+    replies         INTEGER DEFAULT 0,
+    views           INTEGER DEFAULT 0,
+    quotes          INTEGER DEFAULT 0,
+    engagement      INTEGER DEFAULT 0,
+    dup_of          TEXT,
+    dup_count       INTEGER DEFAULT 0,
+    entities        TEXT DEFAULT '',
+    first_seen      INTEGER NOT NULL,
+    last_seen       INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tweets_handle ON tweets(handle, created_at);
+CREATE INDEX IF NOT EXISTS idx_tweets_type_tag ON tweets(type, tag, created_at);
+CREATE INDEX IF NOT EXISTS idx_tweets_created ON tweets(created_at);
+
+CREATE TABLE IF NOT EXISTS tweet_entities (
+    entity    TEXT NOT NULL,
+    tweet_id  TEXT NOT NULL,
+    PRIMARY KEY (entity, tweet_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    tweet_id  TEXT NOT NULL,
+    ts        INTEGER NOT NULL,
+    likes     INTEGER,
+    retweets  INTEGER,
+    replies   INTEGER,
+    views     INTEGER,
+    quotes    INTEGER,
+    PRIMARY KEY (tweet_id, ts)
+) WITHOUT ROWID;
+"""
+
+METRICS = ("likes", "retweets", "replies", "views", "quotes")
+COLUMNS = ("id", "handle", "name", "type", "tag", "content", "url", "timestamp", "followers",
+           "verified", "is_quote", "is_reply", "conversation_id", "dup_of", "dup_count", "entities") + METRICS
+# 旧库缺少的列（CREATE TABLE IF NOT EXISTS 不会补列）
+MIGRATIONS = {"dup_of": "TEXT", "dup_count": "INTEGER DEFAULT 0", "entities": "TEXT DEFAULT ''"}
+
+
+def connect(path=None):
+    path = Path(path or DB_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    have = {r["name"] for r in conn.execute("PRAGMA table_info(tweets)")}
+    for col, decl in MIGRATIONS.items():
+        if col not in have:
+            conn.execute(f"ALTER TABLE tweets ADD COLUMN {col} {decl}")
+    return conn
+
+
+def engagement(t):
+    return (t.get("likes") or 0) + (t.get("retweets") or 0) * 3 + (t.get("quotes") or 0) * 2
+
+
+def parse_created(created_at_str, default):
+    """6551 createdAt（'Mon Oct 19 01:37:57 +0000 2026'）→ epoch 秒"""
+    try:
+        return int(datetime.strptime(created_at_str, "%a %b %d %H:%M:%S %z %Y").timestamp())
+    except (ValueError, TypeError):
+        return default
+
+
+# ==================== 写入 ====================
+
+def upsert_tweets(conn, tweets, ts=None):
+    """写入一批 parse_tweet 格式的推文，返回 (新增条数, 新快照条数)"""
+    ts = int(ts or time.time())
+    ids = [t["id"] for t in tweets if t.get("id")]
+    prev = {}
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        rows = conn.execute(
+            f"SELECT id, {', '.join(METRICS)} FROM tweets WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+        prev.update({r["id"]: tuple(r[m] for m in METRICS) for r in rows})
+
+    rows, snaps = [], []
+    for t in tweets:
+        if not t.get("id"):
+            continue
+        values = tuple(int(t.get(m) or 0) for m in METRICS)
+        row = {c: t.get(c) for c in COLUMNS}
+        row.update(zip(METRICS, values))
+        for c in ("verified", "is_quote", "is_reply"):
+            row[c] = int(bool(row[c]))
+        row["dup_count"] = int(row["dup_count"] or 0)
+        row["entities"] = " ".join(t.get("entities") or [])
+        row["created_at"] = parse_created(t.get("timestamp"), ts)
+        row["engagement"] = engagement(row)
+        row["seen"] = ts
+        rows.append(row)
+        if prev.get(t["id"]) != values:
+            snaps.append((t["id"], ts, *values))
+
+    cols = COLUMNS + ("created_at", "engagement")
+    updates = ", ".join(f"{c}=excluded.{c}" for c in cols if c not in ("id", "type", "tag"))
+    with conn:
+        # type/tag 保留首次写入的值（合并优先级最高的模块）
+        conn.executemany(
+            f"INSERT INTO tweets ({', '.join(cols)}, first_seen, last_seen) "
+            f"VALUES ({', '.join(':' + c for c in cols)}, :seen, :seen) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates}, last_seen=excluded.last_seen", rows)
+        # 实体标签以本次为准（带 entities 字段的推文才更新）
+        tagged = [t for t in tweets if t.get("id") and "entities" in t]
+        conn.executemany("DELETE FROM tweet_entities WHERE tweet_id = ?", [(t["id"],) for t in tagged])
+        conn.executemany("INSERT OR IGNORE INTO tweet_entities (entity, tweet_id) VALUES (?, ?)",
+                         [(e, t["id"]) for t in tagged for e in t["entities"]])
+        conn.executemany(
+            f"INSERT OR REPLACE INTO snapshots (tweet_id, ts, {', '.join(METRICS)}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            snaps)
+    return sum(1 for r in rows if r["id"] not in prev), len(snaps)
+
+
+# ==================== 读取 ====================
+
+def window(conn, hours=72, handle=None, type=None, tag=None, entity=None, limit=None, now=None, collapse=True,
+           account_hours=None):
+    """读取最近 hours 小时内的推文（parse_tweet 格式），按互动分降序
+    entity: relevance 实体（如 "competitor:raydium"），多个时命中任一即可
+    collapse=True 时跳过被近似去重合并掉的推文
+    account_hours: 没有 tag 的账号时间线推文使用的更短窗口（采集窗口：账号 48h，搜索 72h）"""
+    now = now or time.time()
+    where, args = ["created_at >= ?"], [int(now - hours * 3600)]
+    if account_hours is not None:
+        where.append("(COALESCE(tag, '') != '' OR created_at >= ?)")
+        args.append(int(now - account_hours * 3600))
+    if collapse:
+        where.append("dup_of IS NULL")
+    if entity:
+        ents = [entity] if isinstance(entity, str) else list(entity)
+        where.append(f"id IN (SELECT tweet_id FROM tweet_entities WHERE entity IN ({','.join('?' * len(ents))}))")
+        args.extend(ents)
+    for col, val in (("handle", handle), ("type", type), ("tag", tag)):
+        if val is None:
+            continue
+        if isinstance(val, (list, tuple, set)):
+            where.append(f"{col} IN ({','.join('?' * len(val))})")
+            args.extend(val)
+        else:
+            where.append(f"{col} = ?")
+            args.append(val)
+    sql = f"SELECT {', '.join(COLUMNS)} FROM tweets WHERE {' AND '.join(where)} ORDER BY engagement DESC, created_at DESC"
+    if limit:
+        sql += " LIMIT ?"
+        args.append(int(limit))
+    out = []
+    for r in conn.execute(sql, args):
+        t = dict(r)
+        for c in ("verified", "is_quote", "is_reply"):
+            t[c] = bool(t[c])
+        t["entities"] = (t["entities"] or "").split()
+        out.append(t)
+    return out
+
+
+def snapshots(conn, tweet_id):
+    """单条推文的互动变化 [{ts, likes, ...}]"""
+    rows = conn.execute(
+        f"SELECT ts, {', '.join(METRICS)} FROM snapshots WHERE tweet_id = ? ORDER BY ts", (tweet_id,))
+    return [dict(r) for r in rows]
+
+
+def stats(conn):
+    r = conn.execute("SELECT COUNT(*) n, MIN(created_at) lo, MAX(created_at) hi FROM tweets").fetchone()
+    return {
+        "tweets": r["n"],
+        "snapshots": conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0],
+        "handles": conn.execute("SELECT COUNT(DISTINCT handle) FROM tweets").fetchone()[0],
+        "oldest": r["lo"],
+        "newest": r["hi"],
+    }
+
+
+def import_cache(conn, path):
+    """导入 x_cache.json（dict{tweets} 或旧版 list）"""
+    with open(path) as f:
+        data = json.load(f)
+    tweets = data.get("tweets", []) if isinstance(data, dict) else data
+    return upsert_tweets(conn, [t for t in tweets if isinstance(t, dict)])
+
+
+def main():
+    args = sys.argv[1:]
+    conn = connect()
+    if "--import" in args:
+        i = args.index("--import")
+        path = Path(args[i + 1]) if i + 1 < len(args) else DATA_DIR / "x_cache.json"
+        added, snaps = import_cache(conn, path)
+        print(f"✓ 导入 {path}: 新增 {added} 条推文, {snaps} 条快照")
+    s = stats(conn)
+    fmt = lambda ts: datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M") if ts else "-"
+    print(f"📦 {DB_PATH}: {s['tweets']} 条推文 / {s['handles']} 个账号 / {s['snapshots']} 条互动快照")
+    print(f"   时间范围 {fmt(s['oldest'])} → {fmt(s['newest'])}")
+
+
+if __name__ == "__main__":
+    main()
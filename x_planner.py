@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+X 采集 credit 预算规划器
+按每个 job（账号 / 查询）的历史产出分配每日 credit 上限：
+  - 产出 = 每 credit 带来的独有新推文 + 互动分（指数加权平均）
+  - 高产出 → 轮询间隔缩短、maxResults 放大；低产出 → 间隔拉长、maxResults 收缩
+  - 搜索查询结果总是塞满时提高 minLikes，长期为空时降低 minLikes
+  - 当天已花费 + 预估 cost 超过 X_DAILY_CREDITS 的 job 本轮跳过
+状态: data/x_planner.json
+
+用法:
+  python3 x_planner.py          # 查看各 job 产出 / 轮询间隔 / 今日花费
+"""
+
+import json
+import math
+import os
+import statistics
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import paths
+
+DATA_DIR = paths.data_dir()
+PLANNER_PATH = DATA_DIR / "x_planner.json"
+
+DAILY_CREDITS = int(os.environ.get("X_DAILY_CREDITS", "300"))
+BASE_INTERVAL_H = float(os.environ.get("X_BASE_INTERVAL_H", "6"))   # 中位产出的 job 的轮询间隔
+MIN_INTERVAL_H = 1
+MAX_INTERVAL_H = 48
+EW_ALPHA = 0.3              # 新一轮观测的权重
+ENGAGEMENT_UNIT = 200       # 每 200 互动分折算为 1 条推文
+MIN_RESULTS, MAX_RESULTS = 3, 20
+MIN_LIKES_CAP = 500
+SPENT_KEEP_DAYS = 14
+
+
+def _ew(old, new):
+    return new if old is None else old + EW_ALPHA * (new - old)
+
+
+class Planner:
+    def __init__(self, path=PLANNER_PATH, daily_credits=DAILY_CREDITS):
+        self.path = Path(path)
+        self.daily_credits = daily_credits
+        self.state = {"spent": {}, "jobs": {}}
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    self.state.update(json.load(f))
+            except (OSError, ValueError):
+                pass
+
+    # ==================== 查询 ====================
+
+    def spent_today(self, now=None):
+        return self.state["spent"].get((now or datetime.now()).strftime("%Y-%m-%d"), 0)
+
+    def median_yield(self):
+        ys = [q["yield"] for q in self.state["jobs"].values() if q.get("yield")]
+        return statistics.median(ys) if ys else 0
+
+    def interval_h(self, key, median=None):
+        """产出越高间隔越短；从未产出的 job 用最长间隔"""
+        q = self.state["jobs"].get(key)
+        if not q or q.get("yield") is None:
+            return 0
+        median = self.median_yield() if median is None else median
+        if q["yield"] <= 0 or median <= 0:
+            return MAX_INTERVAL_H
+        return min(MAX_INTERVAL_H, max(MIN_INTERVAL_H, BASE_INTERVAL_H * median / q["yield"]))
+
+    # ==================== 规划 ====================
+
+    def tune(self, job):
+        """按历史调整后的 job 副本（maxResults / minLikes）"""
+        q = self.state["jobs"].get(job["key"])
+        if not q:
+            return job
+        payload = dict(job["payload"])
+        if q.get("maxResults"):
+            payload["maxResults"] = q["maxResults"]
+        if "minLikes" in payload and q.get("minLikes") is not None:
+            payload["minLikes"] = q["minLikes"]
+        return {**job, "payload": payload}
+
+    def plan(self, jobs, now=None):
+        """返回 (本轮执行的 job, 跳过的 [(job, 原因)])；从未运行过的 job 优先探索"""
+        now = now or datetime.now()
+        median = self.median_yield()
+        budget = self.daily_credits - self.spent_today(now)
+
+        due, skipped = [], []
+        for job in jobs:
+            q = self.state["jobs"].get(job["key"])
+            if q and q.get("lastRun"):
+                age_h = (now - datetime.fromisoformat(q["lastRun"])).total_seconds() / 3600
+                interval = self.interval_h(job["key"], median)
+                if age_h < interval:
+                    skipped.append((job, f"间隔 {interval:.1f}h 未到"))
+                    continue
+            due.append(job)
+
+        def score(job):
+            q = self.state["jobs"].get(job["key"])
+            return math.inf if not q or q.get("yield") is None else q["yield"]
+
+        selected = []
+        for job in sorted(due, key=score, reverse=True):
+            q = self.state["jobs"].get(job["key"]) or {}
+            est = max(1, round(q.get("cost") or 1))
+            if est > budget:
+                skipped.append((job, "今日 credit 用尽"))
+                continue
+            budget -= est
+            selected.append(self.tune(job))
+        # 保持原有 job 顺序（合并优先级依赖顺序）
+        order = {job["key"]: i for i, job in enumerate(jobs)}
+        selected.sort(key=lambda j: order[j["key"]])
+        return selected, skipped
+
+    # ==================== 记录 ====================
+
+    def record(self, job, cost, fresh, unique, engagement, now=None):
+        """记录一次执行：fresh = 比游标新的条数，unique = 其中其它 job 没拿到的条数"""
+        now = now or datetime.now()
+        q = self.state["jobs"].setdefault(job["key"], {})
+        y = (unique + engagement / ENGAGEMENT_UNIT) / max(cost, 1)
+        q["yield"] = round(_ew(q.get("yield"), y), 4)
+        q["cost"] = round(_ew(q.get("cost"), cost), 3)
+        q["fresh"] = round(_ew(q.get("fresh"), fresh), 3)
+        q["runs"] = q.get("runs", 0) + 1
+        q["credits"] = q.get("credits", 0) + cost
+        q["unique"] = q.get("unique", 0) + unique
+        q["lastRun"] = now.isoformat(timespec="seconds")
+
+        # maxResults: 本轮塞满 → 放大；平均新增不到一半 → 收缩到 2 倍平均新增
+        size = job["payload"].get("maxResults", MIN_RESULTS)
+        if fresh >= size:
+            size = min(MAX_RESULTS, math.ceil(size * 1.5))
+        elif q["fresh"] < size / 2:
+            size = max(MIN_RESULTS, math.ceil(q["fresh"] * 2))
+        q["maxResults"] = size
+
+        # minLikes: 已放到最大仍塞满 → 提高门槛；连续为空 → 降低门槛
+        if "minLikes" in job["payload"]:
+            likes = job["payload"]["minLikes"]
+            if fresh >= job["payload"].get("maxResults", 0) and size >= MAX_RESULTS:
+                likes = min(MIN_LIKES_CAP, max(likes + 5, math.ceil(likes * 1.5)))
+            elif q["fresh"] < 0.5:
+                likes = likes // 2
+            q["minLikes"] = likes
+
+        day = now.strftime("%Y-%m-%d")
+        self.state["spent"][day] = self.state["spent"].get(day, 0) + cost
+
+    def save(self):
+        keep = sorted(self.state["spent"])[-SPENT_KEEP_DAYS:]
+        self.state["spent"] = {d: self.state["spent"][d] for d in keep}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2, sort_keys=True)
+        tmp.replace(self.path)
+
+
+def main():
+    planner = Planner()
+    jobs = planner.state["jobs"]
+    if not jobs:
+        print(f"📊 暂无规划数据 ({planner.path})")
+        return
+    median = planner.median_yield()
+    print(f"💰 今日已用 {planner.spent_today()}/{planner.daily_credits} credits，中位产出 {median:.2f}/credit\n")
+    print(f"  {'job':<48} {'产出':>7} {'间隔h':>6} {'max':>4} {'likes':>5} {'runs':>5} {'独有':>5}")
+    for key, q in sorted(jobs.items(), key=lambda kv: -(kv[1].get("yield") or 0)):
+        print(f"  {key[:48]:<48} {q.get('yield', 0):>7.2f} {planner.interval_h(key, median):>6.1f} "
+              f"{q.get('maxResults', '-'):>4} {q.get('minLikes', '-'):>5} {q.get('runs', 0):>5} {q.get('unique', 0):>5}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())